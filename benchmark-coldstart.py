@@ -0,0 +1,118 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from local_harness import LAYER_DIR, REPO_ROOT
+
+# (function, handler file, environment its module-level code reads) - one entry per function in the templates
+FUNCTIONS = [
+    ('SkillsAssessmentFunction', 'src/skills-api/app.py', {'TABLE_NAME': 'skills', 'AGGREGATES_TABLE': 'aggregates'}),
+    ('SkillAggregatorFunction', 'src/skill-aggregator/aggregator.py', {'TABLE_NAME': 'skills', 'AGGREGATES_TABLE': 'aggregates'}),
+    ('LearningPathFunction', 'v1-lp/src/learning-paths/app.py', {'TABLE_NAME': 'learning-paths', 'TABLE_VERSIONS_TABLE': 'versions'}),
+    ('RecommendationFunction', 'v1-lp/src/recommendations/recommendation-app.py', {}),
+    ('BedrockRecommendationFunction', 'v1-lp/src/bedrock-recommendations/bedrock-recommendation-app.py',
+     {'RECOMMENDATIONS_TABLE': 'recommendations', 'RECOMMENDATION_CACHE_TABLE': 'cache',
+      'LEARNING_PATH_INDEX_TABLE': 'index', 'TABLE_VERSIONS_TABLE': 'versions'}),
+    ('GetRecommendationsFunction', 'v1-lp/src/get-recommendations/get-recommendations-app.py', {'RECOMMENDATIONS_TABLE': 'recommendations'}),
+]
+
+# Init budget per function in ms, checked with --check. Each one is the highest median measured with
+# real boto3 installed (importing boto3 alone takes 490-600 ms) plus about 15%. A handler that goes over
+# has usually gained an eager import or a client it only needs on one branch.
+INIT_BUDGETS_MS = {
+    'SkillsAssessmentFunction': 970,
+    'SkillAggregatorFunction': 930,
+    'LearningPathFunction': 960,
+    'RecommendationFunction': 15,
+    'BedrockRecommendationFunction': 860,
+    'GetRecommendationsFunction': 780,
+}
+
+# Runs in a fresh interpreter: import the handler as Lambda would (layer and function directory on
+# sys.path) and print how long the module took to execute. json is already loaded by then, as it is
+# in the Lambda runtime.
+INIT_SCRIPT = '''
+import importlib.util, json, sys, time
+path, layer_dir = sys.argv[1], sys.argv[2]
+sys.path[:0] = [layer_dir, path.rsplit('/', 1)[0]]
+# Everything after this marker in the -X importtime output was imported by the handler
+sys.stderr.write('handler init\\n')
+sys.stderr.flush()
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location('handler', path)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+print(json.dumps({'init_ms': (time.perf_counter() - start) * 1000}))
+'''
+
+def parse_importtime(stderr):
+    """{module: (self_us, cumulative_us)} for the top-level imports in -X importtime output"""
+    imports = {}
+    lines = stderr.splitlines()
+    if 'handler init' in lines:
+        lines = lines[lines.index('handler init') + 1:]
+    for line in lines:
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Nested imports are indented under the module that pulled them in
+        if not name.startswith(' ') or name[1:2] == ' ':
+            continue
+        imports[name.strip()] = (int(self_us), int(cumulative_us))
+    return imports
+
+def measure_init(relative_path, env, runs, lazy=True):
+    """Median init ms over `runs` fresh interpreters, plus the top-level imports of the last run"""
+    path = os.path.join(REPO_ROOT, relative_path)
+    process_env = dict(os.environ, AWS_DEFAULT_REGION=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'),
+                       LAZY_IMPORTS='true' if lazy else 'false', **env)
+    durations = []
+    imports = {}
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', INIT_SCRIPT, path, LAYER_DIR],
+                                env=process_env, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f'{relative_path} failed to import:\n{result.stderr[-2000:]}')
+        durations.append(json.loads(result.stdout.strip().splitlines()[-1])['init_ms'])
+        imports = parse_importtime(result.stderr)
+    return statistics.median(durations), imports
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure each handler module\'s cold-start init time and its slowest imports')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per handler; the median is reported')
+    parser.add_argument('--top', type=int, default=5, help='Slowest top-level imports to list per handler')
+    parser.add_argument('--eager', action='store_true', help='Also measure with LAZY_IMPORTS=false')
+    parser.add_argument('--check', action='store_true', help='Exit non-zero when a handler exceeds its INIT_BUDGETS_MS entry')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON lines')
+    args = parser.parse_args()
+
+    over_budget = []
+    for function, relative_path, env in FUNCTIONS:
+        init_ms, imports = measure_init(relative_path, env, args.runs)
+        budget = INIT_BUDGETS_MS[function]
+        result = {'function': function, 'init_ms': round(init_ms, 1), 'budget_ms': budget,
+                  'slowest_imports': [{'module': name, 'cumulative_ms': round(cumulative / 1000, 1)}
+                                      for name, (_, cumulative) in sorted(imports.items(), key=lambda i: -i[1][1])[:args.top]]}
+        if args.eager:
+            result['eager_init_ms'] = round(measure_init(relative_path, env, args.runs, lazy=False)[0], 1)
+        if init_ms > budget:
+            over_budget.append(function)
+
+        if args.json:
+            print(json.dumps(result))
+            continue
+        eager = f"  (eager {result['eager_init_ms']} ms)" if args.eager else ''
+        status = 'OVER' if init_ms > budget else 'ok'
+        print(f"{status:4} {function:32} init {result['init_ms']:>7} ms / budget {budget} ms{eager}")
+        for entry in result['slowest_imports']:
+            print(f"       {entry['module']:40} {entry['cumulative_ms']:>7} ms")
+
+    if args.check and over_budget:
+        print(f"Over init budget: {', '.join(over_budget)}")
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import time
+import uuid
+
+from local_harness import (LAYER_DIR, InMemoryDynamoDB, LambdaContext, LocalBedrock, create_learning_path_tables,
+                           create_skills_tables, load_handler)
+
+SKILLS = ['Python', 'Java', 'AWS', 'Azure', 'AI', '.NET', 'Data']
+LEVELS = ['Beginner', 'Basic', 'Intermediate', 'Advanced']
+
+def seed_assessments(table, count):
+    for i in range(count):
+        table._store({
+            'SkillAssessmentId': f'sa-{i:08d}',
+            'Employee': f'Employee {i // 5:06d}',
+            'Skill': SKILLS[i % len(SKILLS)],
+            'Current': LEVELS[i % 3],
+            'Target': LEVELS[i % 3 + 1]
+        })
+
+def seed_learning_paths(table, count):
+    for i in range(count):
+        table._store({
+            'LearningPathId': f'lp-{i:08d}',
+            'Employee': f'Employee {i // 5:06d}',
+            'Skill': SKILLS[i % len(SKILLS)],
+            'Level': LEVELS[i % 3 + 1],
+            'Name': 'Python for Everybody',
+            'Source': 'Coursera',
+            'Duration': '8 months',
+            'Url': 'https://www.coursera.org/specializations/python',
+            'Completed': False,
+            'StateDate': '01-01-2026',
+            'EndDate': '01-09-2026'
+        })
+
+def seed_recommendations(bedrock_app, count):
+    """Save through the handler so LearningPathIds and the index are populated"""
+    recommendations = json.loads(LocalBedrock.DEFAULT_OUTPUT)
+    for i in range(count):
+        bedrock_app.save_recommendations_to_db(f'Employee {i:06d}', SKILLS[i % len(SKILLS)], 'Beginner', 'Basic', recommendations)
+
+def measure(name, handler, make_event, repeat, tables, results):
+    """Time `repeat` invocations with handler logging captured, and record table reads"""
+    before = {table.name: dict(table.stats) for table in tables}
+    durations = []
+    status = None
+    response_bytes = 0
+    for _ in range(repeat):
+        event = make_event()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            response = handler.lambda_handler(event, LambdaContext())
+            durations.append((time.perf_counter() - start) * 1000)
+        status = response['statusCode']
+        response_bytes = len(response.get('body') or '')
+    pages = sum(table.stats['pages'] - before[table.name]['pages'] for table in tables) / repeat
+    read_mb = sum(table.stats['read_bytes'] - before[table.name]['read_bytes'] for table in tables) / repeat / 1e6
+    results.append({
+        'scenario': name,
+        'status': status,
+        'p50_ms': round(statistics.median(durations), 2),
+        'max_ms': round(max(durations), 2),
+        'pages': round(pages, 1),
+        'read_mb': round(read_mb, 2),
+        'response_kb': round(response_bytes / 1024, 1)
+    })
+
+def run(items, repeat, bedrock_latency):
+    dynamodb = InMemoryDynamoDB()
+    skills_env = create_skills_tables(dynamodb)
+    learning_env = create_learning_path_tables(dynamodb)
+    skills_table = dynamodb.Table(skills_env['TABLE_NAME'])
+    learning_table = dynamodb.Table(learning_env['TABLE_NAME'])
+    recommendations_table = dynamodb.Table(learning_env['RECOMMENDATIONS_TABLE'])
+    aggregates_table = dynamodb.Table(skills_env['AGGREGATES_TABLE'])
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        skills = load_handler('src/skills-api/app.py', skills_env, dynamodb)
+        aggregator = load_handler('src/skill-aggregator/aggregator.py', skills_env, dynamodb)
+        learning_paths = load_handler('v1-lp/src/learning-paths/app.py', learning_env, dynamodb)
+        bedrock_app = load_handler('v1-lp/src/bedrock-recommendations/bedrock-recommendation-app.py', learning_env, dynamodb, LocalBedrock(latency=bedrock_latency))
+
+    seed_start = time.perf_counter()
+    seed_assessments(skills_table, items)
+    seed_learning_paths(learning_table, items)
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed_recommendations(bedrock_app, items // 2)
+    print(f"Seeded {items} assessments, {items} learning paths, {items // 2} recommendation records in {time.perf_counter() - seed_start:.1f}s")
+    aggregate_start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for batch in skills_table.drain_stream():
+            aggregator.lambda_handler(batch, LambdaContext())
+    print(f"Aggregated {items} stream records in {time.perf_counter() - aggregate_start:.1f}s")
+
+    results = []
+    measure('skills list (all)', skills, lambda: {'operation': 'list'}, repeat, [skills_table], results)
+    measure('skills list (all, gzip)', skills, lambda: {'httpMethod': 'POST', 'headers': {'Accept-Encoding': 'gzip'},
+                                                        'body': json.dumps({'operation': 'list'})}, repeat, [skills_table], results)
+    measure('skills list (all, fields=Employee)', skills, lambda: {'operation': 'list', 'fields': ['Employee']}, repeat, [skills_table], results)
+    measure('skills list (page of 100)', skills, lambda: {'operation': 'list', 'limit': 100}, repeat, [skills_table], results)
+    measure('skills list Employee filter', skills, lambda: {'operation': 'list', 'Employee': 'Employee 000042'}, repeat, [skills_table], results)
+    measure('skills list Skill+Current filter', skills, lambda: {'operation': 'list', 'Skill': 'Python', 'Current': 'Beginner', 'limit': 100}, repeat, [skills_table], results)
+    measure('skills stats (aggregates)', skills, lambda: {'operation': 'stats'}, repeat, [skills_table, aggregates_table], results)
+    measure('skills batch_create x100', skills, lambda: {'operation': 'batch_create', 'items': [
+        {'Employee': 'Bench', 'Skill': 'Python', 'Current': 'Beginner', 'Target': 'Basic', 'SkillAssessmentId': str(uuid.uuid4())}
+        for _ in range(100)]}, repeat, [skills_table], results)
+    measure('learning paths list (all)', learning_paths, lambda: {'operation': 'list'}, repeat, [learning_table], results)
+    with contextlib.redirect_stdout(io.StringIO()):
+        etag = learning_paths.lambda_handler({'httpMethod': 'GET', 'headers': {}}, LambdaContext())['headers'].get('ETag')
+    measure('learning paths GET (If-None-Match)', learning_paths, lambda: {'httpMethod': 'GET', 'headers': {'If-None-Match': etag}},
+            repeat, [learning_table], results)
+    measure('learning paths from assessment', learning_paths, lambda: {'SkillAssessmentId': 'bench', 'Employee': 'Bench', 'Skill': 'AWS',
+                                                                       'Current': 'Beginner', 'Target': 'Basic'}, repeat, [learning_table], results)
+    measure('recommendations list (all)', bedrock_app, lambda: {'operation': 'list'}, repeat, [recommendations_table], results)
+    measure('recommendations generate (cached gap)', bedrock_app, lambda: {'Employee': 'Bench', 'Skill': 'Python', 'Current': 'Beginner',
+                                                                           'Target': 'Basic'}, repeat, [recommendations_table], results)
+    with contextlib.redirect_stdout(io.StringIO()):
+        listed = json.loads(bedrock_app.lambda_handler({'operation': 'list'}, LambdaContext())['body'])['Learning-Paths']
+    # One path per employee: deleting a path removes its whole recommendation record
+    targets = iter({path['Employee']: path['LearningPathId'] for path in listed}.values())
+    measure('recommendations delete by LearningPathId', bedrock_app, lambda: {'operation': 'delete', 'LearningPathId': next(targets)},
+            repeat, [recommendations_table], results)
+    return results
+
+def run_bulk(assessments, concurrency_levels, bedrock_latency):
+    """Time bulk-recommendations.py over `assessments` distinct skill gaps at each pool size"""
+    results = []
+    for concurrency in concurrency_levels:
+        dynamodb = InMemoryDynamoDB()
+        skills_env = create_skills_tables(dynamodb)
+        learning_env = create_learning_path_tables(dynamodb)
+        with contextlib.redirect_stdout(io.StringIO()):
+            bedrock_app = load_handler('v1-lp/src/bedrock-recommendations/bedrock-recommendation-app.py', learning_env, dynamodb, LocalBedrock(latency=bedrock_latency))
+            bulk = load_handler('bulk-recommendations.py')
+        items = [{'SkillAssessmentId': f'sa-{i:06d}', 'Employee': f'Employee {i:06d}', 'Skill': f'Skill {i:06d}',
+                  'Current': 'Beginner', 'Target': 'Advanced'} for i in range(assessments)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = bulk.run_bulk(bedrock_app, items, concurrency=concurrency, rate=1000)
+            seconds = time.perf_counter() - start
+        results.append({'scenario': f'bulk generate x{assessments} (concurrency {concurrency})', 'saved': result.get('saved', 0),
+                        'seconds': round(seconds, 2), 'per_second': round(assessments / seconds, 1)})
+    return results
+
+def run_clients(invocations, table_name=None):
+    """Warm-path client cost: boto3 clients built in every invocation versus aws_clients' shared ones.
+
+    Needs boto3 and a region. Offline this times client construction only; with
+    `table_name` each invocation also calls DescribeTable, so the fresh-client
+    figure includes a new TLS connection and the shared one reuses its pool.
+    """
+    import boto3
+    if LAYER_DIR not in sys.path:
+        sys.path.insert(0, LAYER_DIR)
+    import aws_clients
+
+    def per_invocation():
+        return boto3.resource('dynamodb'), boto3.client('bedrock-runtime', region_name='us-east-1')
+
+    def shared():
+        return aws_clients.resource('dynamodb'), aws_clients.client('bedrock-runtime', 'us-east-1')
+
+    results = []
+    for name, get_clients in (('clients built per invocation', per_invocation), ('shared clients (aws_clients)', shared)):
+        durations = []
+        for _ in range(invocations):
+            start = time.perf_counter()
+            dynamodb, _ = get_clients()
+            if table_name:
+                dynamodb.meta.client.describe_table(TableName=table_name)
+            durations.append((time.perf_counter() - start) * 1000)
+        # The first shared call builds the clients - that is the cold start, not the warm path
+        warm = durations[1:] or durations
+        results.append({'scenario': name, 'first_ms': round(durations[0], 2), 'p50_ms': round(statistics.median(warm), 2),
+                        'max_ms': round(max(warm), 2)})
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark handler hot paths offline against in-memory DynamoDB')
+    parser.add_argument('--items', type=int, nargs='+', default=[10000], help='Table sizes to benchmark, e.g. 10000 100000 1000000')
+    parser.add_argument('--repeat', type=int, default=3, help='Invocations per scenario')
+    parser.add_argument('--bedrock-latency', type=float, default=0.0, help='Seconds the local Bedrock stand-in sleeps per call')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON lines')
+    parser.add_argument('--bulk', type=int, metavar='ASSESSMENTS',
+                        help='Instead, time bulk-recommendations.py over this many distinct skill gaps at several pool sizes')
+    parser.add_argument('--bulk-concurrency', type=int, nargs='+', default=[1, 4, 16], help='Pool sizes for --bulk')
+    parser.add_argument('--clients', type=int, metavar='INVOCATIONS',
+                        help='Instead, time per-invocation boto3 clients against the shared ones (needs boto3)')
+    parser.add_argument('--clients-table', help='With --clients, also call DescribeTable on this table in each invocation')
+    args = parser.parse_args()
+
+    if args.clients:
+        for r in run_clients(args.clients, args.clients_table):
+            print(json.dumps(r) if args.json else f"{r['scenario']:42} first {r['first_ms']:>8} ms  p50 {r['p50_ms']:>8} ms  max {r['max_ms']:>8} ms")
+        return
+
+    if args.bulk:
+        for r in run_bulk(args.bulk, args.bulk_concurrency, args.bedrock_latency):
+            print(json.dumps(r) if args.json else f"{r['scenario']:42} {r['saved']:>6} saved {r['seconds']:>8}s {r['per_second']:>8}/s")
+        return
+
+    for items in args.items:
+        results = run(items, args.repeat, args.bedrock_latency)
+        if args.json:
+            for result in results:
+                print(json.dumps(dict(result, items=items)))
+            continue
+        print(f"\n{'scenario':42} {'status':>6} {'p50 ms':>10} {'max ms':>10} {'pages':>7} {'read MB':>8} {'resp KB':>9}")
+        for r in results:
+            print(f"{r['scenario']:42} {r['status']:>6} {r['p50_ms']:>10} {r['max_ms']:>10} {r['pages']:>7} {r['read_mb']:>8} {r['response_kb']:>9}")
+
+if __name__ == '__main__':
+    main()
@@ -31,8 +31,32 @@ class SkillsAPI {
         }
     }
 
-    async list() {
-        return this.request('list');
+    async list(options = {}) {
+        const params = {};
+        if (options.limit !== undefined) params.limit = options.limit;
+        if (options.cursor) params.cursor = options.cursor;
+        if (options.fields) params.fields = options.fields;
+        ['Employee', 'Skill', 'Current'].forEach(field => {
+            if (options[field]) params[field] = options[field];
+        });
+        return this.request('list', params);
+    }
+
+    async listByEmployee(employee, options = {}) {
+        return this.list({ ...options, Employee: employee });
+    }
+
+    async listBySkill(skill, options = {}) {
+        return this.list({ ...options, Skill: skill });
+    }
+
+    async *listPages(limit = 100, filters = {}) {
+        let cursor = null;
+        do {
+            const page = await this.list({ ...filters, limit, cursor });
+            yield page['Skill-Assessments'] || [];
+            cursor = page.nextCursor;
+        } while (cursor);
     }
 
     async read(id) {
@@ -50,6 +74,22 @@ class SkillsAPI {
     async delete(id) {
         return this.request('delete', { SkillAssessmentId: id });
     }
+
+    async batchCreate(assessments) {
+        return this.request('batch_create', { items: assessments });
+    }
+
+    async batchUpdate(assessments) {
+        return this.request('batch_update', { items: assessments });
+    }
+
+    async batchDelete(ids) {
+        return this.request('batch_delete', { items: ids });
+    }
+
+    async stats() {
+        return this.request('stats');
+    }
 }
 
 // Initialize API instance
@@ -0,0 +1,249 @@
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+BEDROCK_APP = os.path.join(REPO_ROOT, 'v1-lp', 'src', 'bedrock-recommendations', 'bedrock-recommendation-app.py')
+LAYER_DIR = os.path.join(REPO_ROOT, 'layers', 'common', 'python')
+
+EMPLOYEE_SKILL_INDEX = 'EmployeeSkillIndex'
+SKILL_CURRENT_INDEX = 'SkillCurrentIndex'
+
+# Error codes worth waiting out; anything else fails the gap straight away
+THROTTLING_CODES = {'ThrottlingException', 'TooManyRequestsException', 'ServiceUnavailableException',
+                    'ModelNotReadyException', 'ProvisionedThroughputExceededException'}
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens a second, bursting to at most `capacity`"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available"""
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+
+class BulkStats:
+    """Counters shared by the workers"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    def add(self, name, count=1):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + count
+
+def is_throttle(error):
+    return isinstance(error, ClientError) and error.response.get('Error', {}).get('Code') in THROTTLING_CODES
+
+def call_with_backoff(call, bucket, attempts, base_delay, max_delay, stats, sleep=time.sleep):
+    """Run `call` at the bucket's rate, retrying throttling errors with full-jitter exponential backoff"""
+    for attempt in range(attempts):
+        bucket.acquire()
+        try:
+            return call()
+        except ClientError as e:
+            if not is_throttle(e) or attempt == attempts - 1:
+                raise
+            stats.add('throttled')
+            sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+
+def load_bedrock_app():
+    """Import the recommendation handler so bulk runs share its prompt, cache and storage code"""
+    for directory in (LAYER_DIR, os.path.dirname(BEDROCK_APP)):
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location('bedrock_recommendation_app', BEDROCK_APP)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def find_skills_table(region):
+    """Return the first table whose name contains SkillsAssessment, or None"""
+    dynamodb = boto3.client('dynamodb', region_name=region)
+    for page in dynamodb.get_paginator('list_tables').paginate():
+        for table_name in page['TableNames']:
+            if 'SkillsAssessment' in table_name:
+                return table_name
+    return None
+
+def read_assessments(table, employee=None, skill=None):
+    """Assessments to generate for: one employee or one skill through their GSI, otherwise the whole table"""
+    if employee:
+        condition = Key('Employee').eq(employee)
+        if skill:
+            condition = condition & Key('Skill').eq(skill)
+        read_kwargs = {'IndexName': EMPLOYEE_SKILL_INDEX, 'KeyConditionExpression': condition}
+        read = table.query
+    elif skill:
+        read_kwargs = {'IndexName': SKILL_CURRENT_INDEX, 'KeyConditionExpression': Key('Skill').eq(skill)}
+        read = table.query
+    else:
+        read_kwargs = {}
+        read = table.scan
+
+    items = []
+    while True:
+        response = read(**read_kwargs)
+        items.extend(response['Items'])
+        if 'LastEvaluatedKey' not in response:
+            return items
+        read_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def bulk_recommendation_id(skill_assessment_id):
+    """Stable RecommendationId per assessment, so a rerun replaces its earlier record instead of adding one"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f'bulk-recommendations/{skill_assessment_id}'))
+
+def group_by_gap(app, assessments):
+    """{cache key: assessments} - each distinct skill gap is generated once however many people share it"""
+    groups = {}
+    for item in assessments:
+        if not item.get('Skill') or not item.get('Current') or not item.get('Target'):
+            continue
+        groups.setdefault(app.recommendation_cache_key(item['Skill'], item['Current'], item['Target']), []).append(item)
+    return groups
+
+def generate_gap(app, cache_key, assessments, bucket, stats, refresh=False, attempts=6, base_delay=1.0, max_delay=30.0):
+    """Recommendations for one skill gap (from the cache unless `refresh`), saved for every assessment sharing it"""
+    first = assessments[0]
+    recommendations = None if refresh else app.read_recommendation_cache(cache_key)
+    if recommendations is not None:
+        cache_status = 'hit'
+    else:
+        recommendations = call_with_backoff(
+            lambda: app.invoke_bedrock(first['Skill'], first['Current'], first['Target'], first.get('Employee', '')),
+            bucket, attempts, base_delay, max_delay, stats)
+        if not isinstance(recommendations, app.PartialRecommendations):
+            app.write_recommendation_cache(cache_key, recommendations)
+        cache_status = 'miss'
+    stats.add(cache_status)
+
+    for item in assessments:
+        app.store_recommendations(item.get('Employee', ''), item['Skill'], item['Current'], item['Target'], recommendations,
+                                  item.get('SkillAssessmentId'), bulk_recommendation_id(item['SkillAssessmentId']),
+                                  bump=False, Cache=cache_status)
+    stats.add('saved', len(assessments))
+    return len(assessments)
+
+def run_bulk(app, assessments, concurrency=8, rate=2.0, burst=None, refresh=False, attempts=6, base_delay=1.0, max_delay=30.0,
+             progress=None):
+    """Generate and save recommendations for `assessments` on a pool of `concurrency` workers.
+
+    Model calls share one token bucket (`rate` a second, bursts of `burst`), so the
+    pool can be sized for DynamoDB and network latency without exceeding the Bedrock
+    quota. Throttled calls back off exponentially and count against the bucket again.
+    The recommendations table version (list ETags) is bumped once at the end, not per save.
+    Returns the stats counters plus the SkillAssessmentIds that failed.
+    """
+    groups = group_by_gap(app, assessments)
+    bucket = TokenBucket(rate, burst or concurrency)
+    stats = BulkStats()
+    failed = []
+    done = 0
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {
+                executor.submit(generate_gap, app, cache_key, items, bucket, stats, refresh, attempts, base_delay, max_delay): items
+                for cache_key, items in groups.items()
+            }
+            for future in as_completed(futures):
+                items = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    stats.add('failed', len(items))
+                    failed.extend(item.get('SkillAssessmentId') for item in items)
+                    print(f"Failed {items[0]['Skill']} {items[0]['Current']} -> {items[0]['Target']} ({len(items)} assessments): {e}")
+                done += 1
+                if progress and done % progress == 0:
+                    print(f"{done}/{len(groups)} skill gaps done")
+    finally:
+        # Even a failed or interrupted run may have saved records the list ETags must not hide
+        if groups:
+            dynamodb = app.get_dynamodb()
+            app.bump_version(dynamodb, dynamodb.Table(os.environ['RECOMMENDATIONS_TABLE']).name)
+    return dict(stats.counts, gaps=len(groups), assessments=sum(len(items) for items in groups.values()), failed_ids=failed)
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate Bedrock recommendations for every assessment, or a filtered subset')
+    parser.add_argument('--table', help='Skills assessment table (default: first table containing "SkillsAssessment")')
+    parser.add_argument('--environment', default='dev', help='Environment prefix of the learning path stack tables')
+    parser.add_argument('--region', default='us-east-1')
+    parser.add_argument('--employee', help='Only this employee (EmployeeSkillIndex query)')
+    parser.add_argument('--skill', help='Only this skill (SkillCurrentIndex query, or with --employee)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Worker threads')
+    parser.add_argument('--rate', type=float, default=2.0, help='Bedrock calls per second across all workers')
+    parser.add_argument('--burst', type=int, help='Calls allowed back to back before --rate applies (default: --concurrency)')
+    parser.add_argument('--attempts', type=int, default=6, help='Tries per skill gap when Bedrock throttles')
+    parser.add_argument('--refresh', action='store_true', help='Ask the model again even for cached skill gaps')
+    parser.add_argument('--dry-run', action='store_true', help='Only count the assessments and distinct skill gaps')
+    args = parser.parse_args()
+
+    if args.concurrency < 1 or args.rate <= 0:
+        parser.error('--concurrency must be at least 1 and --rate positive')
+
+    skills_table = args.table or find_skills_table(args.region)
+    if not skills_table:
+        print("No SkillsAssessment table found")
+        raise SystemExit(1)
+
+    prefix = args.environment
+    os.environ.setdefault('AWS_DEFAULT_REGION', args.region)
+    os.environ.setdefault('RECOMMENDATIONS_TABLE', f'{prefix}-recommendations')
+    os.environ.setdefault('RECOMMENDATION_CACHE_TABLE', f'{prefix}-recommendation-cache')
+    os.environ.setdefault('LEARNING_PATH_INDEX_TABLE', f'{prefix}-learning-path-index')
+    os.environ.setdefault('TABLE_VERSIONS_TABLE', f'{prefix}-table-versions')
+    # The handler logs every model call at INFO; a bulk run only needs problems
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    app = load_bedrock_app()
+    # The handler's client settings, with one pooled connection per worker; Bedrock throttling is retried here, not inside botocore
+    client_config = app.aws_clients.client_config
+    dynamodb = boto3.resource('dynamodb', region_name=args.region,
+                              config=client_config('dynamodb', max_pool_connections=args.concurrency))
+    app.use_dynamodb(dynamodb)
+    app.use_bedrock(boto3.client('bedrock-runtime', region_name='us-east-1',
+                                 config=client_config('bedrock-runtime', max_pool_connections=args.concurrency,
+                                                      retries={'mode': 'standard', 'max_attempts': 1})))
+
+    assessments = read_assessments(dynamodb.Table(skills_table), args.employee, args.skill)
+    gaps = group_by_gap(app, assessments)
+    print(f"Using table: {skills_table} - {len(assessments)} assessments, {len(gaps)} distinct skill gaps")
+    if args.dry_run:
+        return
+
+    start = time.perf_counter()
+    result = run_bulk(app, assessments, args.concurrency, args.rate, args.burst, args.refresh, args.attempts, progress=50)
+    print(f"Saved {result.get('saved', 0)}/{result['assessments']} in {time.perf_counter() - start:.1f}s: "
+          f"{result.get('miss', 0)} model calls, {result.get('hit', 0)} cached gaps, {result.get('throttled', 0)} throttled retries, "
+          f"{result.get('failed', 0)} failed")
+    if result['failed_ids']:
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,39 +1,338 @@
-import boto3
+import argparse
+import base64
 import csv
+import gzip
+import io
 import json
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import boto3
+
+FORMATS = ('csv', 'ndjson', 'columnar')
+FORMAT_EXTENSIONS = {'csv': '.csv', 'ndjson': '.ndjson.gz', 'columnar': '.columnar.json.gz'}
+
+# Low-cardinality columns the columnar format stores as dictionary codes
+DICTIONARY_COLUMNS = ['Employee', 'Skill', 'Current', 'Target']
+
+# Sentinel a segment worker puts on the queue when it has finished its segment
+SEGMENT_DONE = object()
+# How often a worker waiting on a full queue checks whether the writer has given up
+PUT_POLL_SECONDS = 0.5
+
+def json_default(obj):
+    """Serialize the non-JSON types boto3 returns for DynamoDB attributes"""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=str)
+    if hasattr(obj, 'value') and isinstance(obj.value, bytes):
+        return base64.b64encode(obj.value).decode('ascii')
+    raise TypeError(f'Cannot serialize {type(obj).__name__}')
+
+def encode_key(key):
+    """JSON-safe form of a LastEvaluatedKey (keeps Decimal key values exact)"""
+    if key is None:
+        return None
+    return {name: {'N': str(value)} if isinstance(value, Decimal) else value for name, value in key.items()}
+
+def decode_key(key):
+    """Inverse of encode_key"""
+    if key is None:
+        return None
+    return {name: Decimal(value['N']) if isinstance(value, dict) else value for name, value in key.items()}
+
+def find_skills_table(region):
+    """Return the first table whose name contains SkillsAssessment, or None"""
+    dynamodb = boto3.client('dynamodb', region_name=region)
+    tables = []
+    for page in dynamodb.get_paginator('list_tables').paginate():
+        tables.extend(page['TableNames'])
+    print("Available tables:", tables)
+
+    for table_name in tables:
+        if 'SkillsAssessment' in table_name:
+            return table_name
+    return None
+
+class CsvBodyWriter:
+    """CSV rows whose columns are the union of all attributes seen so far.
+
+    Columns are appended in discovery order, so earlier rows are simply shorter;
+    the header is only known at the end and is prepended in finish().
+    """
+
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self.known = set(self.fields)
+
+    def encode_page(self, items):
+        for item in items:
+            for name in item:
+                if name not in self.known:
+                    self.known.add(name)
+                    self.fields.append(name)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for item in items:
+            writer.writerow([self.cell(item.get(name)) for name in self.fields])
+        return buffer.getvalue().encode('utf-8')
+
+    @staticmethod
+    def cell(value):
+        if value is None:
+            return ''
+        if isinstance(value, (dict, list, set, frozenset)):
+            return json.dumps(value, default=json_default)
+        return value
+
+    def finish(self, body_path, output_path):
+        with open(output_path, 'w', newline='') as output:
+            csv.writer(output).writerow(self.fields)
+        with open(body_path, 'rb') as body, open(output_path, 'ab') as output:
+            while True:
+                chunk = body.read(1 << 20)
+                if not chunk:
+                    break
+                output.write(chunk)
+        os.remove(body_path)
+
+class NdjsonGzipWriter:
+    """One JSON object per line; each page is a complete gzip member"""
+
+    def __init__(self, fields):
+        self.fields = list(fields)
+
+    def encode_page(self, items):
+        lines = ''.join(json.dumps(item, default=json_default, separators=(',', ':')) + '\n' for item in items)
+        return gzip.compress(lines.encode('utf-8'))
+
+    def finish(self, body_path, output_path):
+        os.replace(body_path, output_path)
+
+class ColumnarGzipWriter:
+    """Row groups of columns, one JSON line per page, each a complete gzip member.
+
+    DICTIONARY_COLUMNS are stored as {"dictionary": [...], "codes": [...]}, every
+    other attribute as {"values": [...]}; missing attributes are null. The schema
+    is the union of all attributes and is repeated in each row group.
+    """
 
-# List all tables first
-dynamodb = boto3.client('dynamodb', region_name='us-east-1')
-tables = dynamodb.list_tables()['TableNames']
-print("Available tables:", tables)
-
-# Find skills assessment table
-skills_table = None
-for table_name in tables:
-    if 'SkillsAssessment' in table_name:
-        skills_table = table_name
-        break
-
-if not skills_table:
-    print("No SkillsAssessment table found")
-    exit()
-
-print(f"Using table: {skills_table}")
-
-# Export DynamoDB to CSV
-dynamodb_resource = boto3.resource('dynamodb', region_name='us-east-1')
-table = dynamodb_resource.Table(skills_table)
-
-response = table.scan()
-items = response['Items']
-
-# Create CSV file
-with open('skills-data.csv', 'w', newline='') as csvfile:
-    if items:
-        fieldnames = items[0].keys()
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self.known = set(self.fields)
+
+    def encode_page(self, items):
         for item in items:
-            writer.writerow(item)
+            for name in item:
+                if name not in self.known:
+                    self.known.add(name)
+                    self.fields.append(name)
+
+        columns = {}
+        for name in self.fields:
+            values = [item.get(name) for item in items]
+            if name in DICTIONARY_COLUMNS:
+                dictionary = {}
+                codes = [None if value is None else dictionary.setdefault(value, len(dictionary)) for value in values]
+                columns[name] = {'dictionary': list(dictionary), 'codes': codes}
+            else:
+                columns[name] = {'values': values}
+
+        row_group = {'rows': len(items), 'schema': self.fields, 'columns': columns}
+        line = json.dumps(row_group, default=json_default, separators=(',', ':')) + '\n'
+        return gzip.compress(line.encode('utf-8'))
+
+    def finish(self, body_path, output_path):
+        os.replace(body_path, output_path)
+
+WRITERS = {'csv': CsvBodyWriter, 'ndjson': NdjsonGzipWriter, 'columnar': ColumnarGzipWriter}
+
+def read_columnar(path):
+    """Yield items back out of a columnar export"""
+    with gzip.open(path, 'rt') as f:
+        for line in f:
+            row_group = json.loads(line)
+            columns = row_group['columns']
+            for row in range(row_group['rows']):
+                item = {}
+                for name, column in columns.items():
+                    if 'codes' in column:
+                        code = column['codes'][row]
+                        value = None if code is None else column['dictionary'][code]
+                    else:
+                        value = column['values'][row]
+                    if value is not None:
+                        item[name] = value
+                yield item
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_checkpoint(path, checkpoint):
+    """Write the checkpoint atomically so a crash never leaves it half written"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def put_page(pages, entry, stop):
+    """Put `entry` on the bounded queue, waiting for room; False once `stop` is set"""
+    while not stop.is_set():
+        try:
+            pages.put(entry, timeout=PUT_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def scan_segment(table, segment, total_segments, page_size, start_key, pages, stop):
+    """Scan one segment page by page, handing each page and its LastEvaluatedKey to the writer.
+
+    Returns early once `stop` is set, i.e. the writer has failed and nothing reads the queue.
+    """
+    scan_kwargs = {'Segment': segment, 'TotalSegments': total_segments}
+    if page_size:
+        scan_kwargs['Limit'] = page_size
+    if start_key:
+        scan_kwargs['ExclusiveStartKey'] = start_key
+    try:
+        while not stop.is_set():
+            response = table.scan(**scan_kwargs)
+            last_key = response.get('LastEvaluatedKey')
+            if not put_page(pages, (segment, response['Items'], last_key), stop):
+                return
+            if not last_key:
+                break
+            scan_kwargs['ExclusiveStartKey'] = last_key
+    finally:
+        put_page(pages, (segment, SEGMENT_DONE, None), stop)
+
+def export_table(table, output_path, fmt, fields, total_segments, workers, page_size=None, resume=False):
+    """Parallel-scan `table` into `output_path` without holding the table in memory.
+
+    Workers scan their segments concurrently and push pages onto a bounded queue.
+    This thread is the only writer: it appends each encoded page to a body file,
+    then checkpoints the body size and the segment's LastEvaluatedKey. On resume
+    the body is truncated back to the checkpointed size and every unfinished
+    segment restarts from its key, so each item is written exactly once.
+    Returns the number of rows written by this run.
+    """
+    body_path = output_path + '.part'
+    checkpoint_path = output_path + '.checkpoint.json'
+    writer = WRITERS[fmt](fields)
+
+    checkpoint = load_checkpoint(checkpoint_path) if resume else None
+    if checkpoint:
+        expected = {'table': table.name, 'format': fmt, 'total_segments': total_segments}
+        actual = {name: checkpoint[name] for name in expected}
+        if actual != expected:
+            raise SystemExit(f'Checkpoint {checkpoint_path} was written for {actual}, not {expected}')
+        writer.fields = checkpoint['fields']
+        writer.known = set(writer.fields)
+        with open(body_path, 'r+b') as body:
+            body.truncate(checkpoint['offset'])
+        print(f"Resuming from {checkpoint_path}: {checkpoint['rows']} rows already exported")
+    else:
+        checkpoint = {
+            'table': table.name,
+            'format': fmt,
+            'total_segments': total_segments,
+            'offset': 0,
+            'rows': 0,
+            'fields': writer.fields,
+            'segments': {str(segment): {'last_key': None, 'done': False} for segment in range(total_segments)}
+        }
+        open(body_path, 'wb').close()
+        save_checkpoint(checkpoint_path, checkpoint)
+
+    pending = [int(segment) for segment, state in checkpoint['segments'].items() if not state['done']]
+    # A few pages per worker in flight keeps workers busy while bounding memory
+    pages = queue.Queue(maxsize=workers * 4)
+    # Set when the writer fails (disk full, Ctrl-C) so workers stop instead of blocking on a full queue
+    stop = threading.Event()
+    rows = 0
+
+    with open(body_path, 'ab') as body, ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                scan_segment, table, segment, total_segments, page_size,
+                decode_key(checkpoint['segments'][str(segment)]['last_key']), pages, stop
+            )
+            for segment in pending
+        ]
+
+        remaining = len(pending)
+        try:
+            while remaining:
+                segment, items, last_key = pages.get()
+                state = checkpoint['segments'][str(segment)]
+                if items is SEGMENT_DONE:
+                    remaining -= 1
+                    continue
+                if items:
+                    body.write(writer.encode_page(items))
+                    body.flush()
+                    os.fsync(body.fileno())
+                    rows += len(items)
+                state['last_key'] = encode_key(last_key)
+                state['done'] = last_key is None
+                checkpoint.update(offset=body.tell(), rows=checkpoint['rows'] + len(items), fields=writer.fields)
+                save_checkpoint(checkpoint_path, checkpoint)
+        except BaseException:
+            # The checkpoint stays for --resume; segments not yet started are dropped
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+        # Surface any scan error from the workers; the checkpoint stays for --resume
+        for future in futures:
+            future.result()
+
+    writer.finish(body_path, output_path)
+    os.remove(checkpoint_path)
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description='Export a DynamoDB skills assessment table using a parallel scan')
+    parser.add_argument('--table', help='Table name (default: first table containing "SkillsAssessment")')
+    parser.add_argument('--region', default='us-east-1')
+    parser.add_argument('--format', choices=FORMATS, default='csv',
+                        help='csv, gzip-compressed NDJSON, or gzip-compressed dictionary-encoded columnar row groups')
+    parser.add_argument('--output', help='Output path (default: skills-data plus the format extension)')
+    parser.add_argument('--segments', type=int, default=4, help='TotalSegments for the parallel scan')
+    parser.add_argument('--workers', type=int, help='Scan threads (default: one per segment)')
+    parser.add_argument('--page-size', type=int, help='Items per scan request (default: 1 MB pages)')
+    parser.add_argument('--fields', default='SkillAssessmentId,Employee,Skill,Current,Target',
+                        help='Leading columns; any other attributes found are appended after them')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted export from its checkpoint')
+    args = parser.parse_args()
+
+    if args.segments < 1:
+        parser.error('--segments must be at least 1')
+
+    skills_table = args.table or find_skills_table(args.region)
+    if not skills_table:
+        print("No SkillsAssessment table found")
+        raise SystemExit(1)
+
+    print(f"Using table: {skills_table}")
+
+    table = boto3.resource('dynamodb', region_name=args.region).Table(skills_table)
+    output = args.output or 'skills-data' + FORMAT_EXTENSIONS[args.format]
+    workers = args.workers or args.segments
+    fields = [name for name in args.fields.split(',') if name]
+    rows = export_table(table, output, args.format, fields, args.segments, workers, args.page_size, args.resume)
+
+    print(f"Exported {rows} rows to {output} ({args.format}, {args.segments} segments, {workers} workers)")
 
-print("CSV exported: skills-data.csv")
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""boto3 clients and resources created once per container and reused by every warm invocation.
+
+Each one gets an explicit botocore Config: TCP keep-alive so pooled
+connections survive the gaps between invocations, a pool large enough for the
+handlers' worker threads, short connect timeouts, and adaptive retries that
+back off client-side when a service throttles.
+"""
+import functools
+import os
+
+import boto3
+from botocore.config import Config
+
+CONNECT_TIMEOUT = float(os.environ.get('AWS_CONNECT_TIMEOUT', '2'))
+# DynamoDB answers in milliseconds; a Bedrock generation can stream for most of a minute
+READ_TIMEOUTS = {'bedrock-runtime': 60}
+DEFAULT_READ_TIMEOUT = float(os.environ.get('AWS_READ_TIMEOUT', '10'))
+MAX_POOL_CONNECTIONS = int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', '16'))
+MAX_ATTEMPTS = int(os.environ.get('AWS_MAX_ATTEMPTS', '3'))
+
+def client_config(service_name, **overrides):
+    """The Config every shared client of `service_name` is built with; `overrides` replace single options"""
+    options = {
+        'connect_timeout': CONNECT_TIMEOUT,
+        'read_timeout': READ_TIMEOUTS.get(service_name, DEFAULT_READ_TIMEOUT),
+        'max_pool_connections': MAX_POOL_CONNECTIONS,
+        'tcp_keepalive': True,
+        'retries': {'mode': 'adaptive', 'max_attempts': MAX_ATTEMPTS}
+    }
+    options.update(overrides)
+    return Config(**options)
+
+@functools.lru_cache(maxsize=None)
+def client(service_name, region_name=None):
+    """Shared low-level client for `service_name`, created on first use"""
+    return boto3.client(service_name, region_name=region_name, config=client_config(service_name))
+
+@functools.lru_cache(maxsize=None)
+def resource(service_name, region_name=None):
+    """Shared boto3 resource (e.g. dynamodb), created on first use"""
+    return boto3.resource(service_name, region_name=region_name, config=client_config(service_name))
+
+@functools.lru_cache(maxsize=None)
+def bounded_client(service_name, read_timeout, region_name=None):
+    """Shared client for calls that must end within `read_timeout` seconds: reads time out then and are not retried"""
+    return boto3.client(service_name, region_name=region_name,
+                        config=client_config(service_name, read_timeout=read_timeout, retries={'mode': 'standard', 'max_attempts': 1}))
@@ -0,0 +1,66 @@
+import json
+import os
+import re
+
+CATALOG_PATH = os.environ.get('COURSE_CATALOG_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'course-catalog.json'))
+
+_SEPARATORS = re.compile(r'[\s\-_]+')
+
+def _strip_skill(skill):
+    """Lower-case a skill name and drop spaces, dashes and underscores"""
+    return _SEPARATORS.sub('', (skill or '').lower())
+
+def _load_catalog(path):
+    """Load the compact catalog file and build the lookup indexes once per container"""
+    with open(path) as f:
+        data = json.load(f)
+
+    courses = [
+        {'name': name, 'source': source, 'duration': duration, 'url': url}
+        for name, source, duration, url in data['courses']
+    ]
+
+    aliases = {}
+    paths = {}
+    for skill, levels in data['paths'].items():
+        aliases[_strip_skill(skill)] = skill
+        for level_pair, course_ids in levels.items():
+            current_level, target_level = level_pair.split('>')
+            paths[(skill, current_level, target_level)] = [courses[i] for i in course_ids]
+    for alias, skill in data.get('aliases', {}).items():
+        aliases[_strip_skill(alias)] = skill
+
+    skill_fallbacks = {skill: [courses[i] for i in course_ids] for skill, course_ids in data.get('skill_fallbacks', {}).items()}
+    default_path = [courses[i] for i in data['default_path']]
+    return aliases, paths, skill_fallbacks, default_path
+
+ALIASES, PATHS, SKILL_FALLBACKS, DEFAULT_PATH = _load_catalog(CATALOG_PATH)
+
+def canonical_skill(skill):
+    """Map a free-text skill name ('Cloud - AWS', 'azure', '.NET') to its catalog key"""
+    stripped = _strip_skill(skill)
+    return ALIASES.get(stripped, stripped)
+
+def lookup(skill, current_level, target_level):
+    """Return the catalog courses for a skill gap, or None when the catalog has no path.
+
+    The returned list is shared between calls and must not be mutated.
+    """
+    return PATHS.get((canonical_skill(skill), (current_level or '').strip().lower(), (target_level or '').strip().lower()))
+
+def get_recommendations(skill, current_level, target_level):
+    """Catalog courses for a skill gap, falling back to the general programming path"""
+    return lookup(skill, current_level, target_level) or DEFAULT_PATH
+
+def get_skill_fallback(skill):
+    """Courses for a skill regardless of level, or None when the skill is not in the catalog.
+
+    Multi-word skills such as 'AWS Lambda' match on any word that names a catalog skill.
+    """
+    courses = SKILL_FALLBACKS.get(canonical_skill(skill))
+    if courses is None:
+        for word in (skill or '').split():
+            courses = SKILL_FALLBACKS.get(canonical_skill(word))
+            if courses is not None:
+                break
+    return courses
@@ -0,0 +1,27 @@
+# Largest `fields` list accepted; keeps ProjectionExpression well inside DynamoDB's limits
+MAX_FIELDS = 20
+
+def parse_fields(fields, default=None):
+    """Validate a `fields` list (or comma-separated string) of top-level attribute names"""
+    if fields is None:
+        return default
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    if not isinstance(fields, list) or not all(isinstance(name, str) for name in fields):
+        raise ValueError('fields must be a list of attribute names')
+    names = list(dict.fromkeys(name.strip() for name in fields if name.strip()))
+    if not names:
+        raise ValueError('fields must name at least one attribute')
+    if len(names) > MAX_FIELDS:
+        raise ValueError(f'fields may name at most {MAX_FIELDS} attributes')
+    for name in names:
+        if not name.replace('_', '').replace('-', '').isalnum():
+            raise ValueError(f'Invalid field name: {name}')
+    return tuple(names)
+
+def projection(fields):
+    """ProjectionExpression kwargs for `fields`; names are aliased since many (Current, Level, Name) are reserved words"""
+    if not fields:
+        return {}
+    aliases = {f'#f{index}': name for index, name in enumerate(fields)}
+    return {'ProjectionExpression': ', '.join(aliases), 'ExpressionAttributeNames': aliases}
@@ -0,0 +1,70 @@
+import base64
+import gzip
+import json
+import os
+
+try:
+    import brotli
+except ImportError:
+    # Not in the Lambda runtime; add it to the function's dependencies to enable br
+    brotli = None
+
+# Bodies smaller than this are sent as-is; compressing them costs more than it saves
+MIN_COMPRESS_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', '1024'))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+def request_body(event):
+    """Text of an API Gateway body; binary media types arrive base64-encoded"""
+    body = event.get('body')
+    if isinstance(body, str) and event.get('isBase64Encoded'):
+        return base64.b64decode(body).decode('utf-8')
+    return body
+
+def accepted_encodings(event):
+    """Map of content-coding to q-value from the Accept-Encoding header"""
+    headers = event.get('headers') or {}
+    value = next((v for k, v in headers.items() if k.lower() == 'accept-encoding'), None) or ''
+    encodings = {}
+    for part in value.split(','):
+        coding, _, params = part.strip().partition(';')
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[coding.strip().lower()] = quality
+    return encodings
+
+def choose_encoding(event):
+    """Best coding we can produce that the client accepts, or None"""
+    accepted = accepted_encodings(event)
+    candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+    best = None
+    for coding in candidates:
+        quality = accepted.get(coding, accepted.get('*', 0.0))
+        if quality > 0 and (best is None or quality > best[1]):
+            best = (coding, quality)
+    return best[0] if best else None
+
+def compress(data, coding):
+    if coding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+def json_response(event, status_code, headers, payload, default=None):
+    """API Gateway response with the payload compressed when the client accepts it and it is big enough"""
+    body = json.dumps(payload, default=default)
+    response = {'statusCode': status_code, 'headers': headers, 'body': body}
+    coding = choose_encoding(event)
+    data = body.encode('utf-8')
+    if coding is None or len(data) < MIN_COMPRESS_BYTES:
+        return response
+    response['headers'] = dict(headers, **{'Content-Type': 'application/json', 'Content-Encoding': coding, 'Vary': 'Accept-Encoding'})
+    response['body'] = base64.b64encode(compress(data, coding)).decode('ascii')
+    response['isBase64Encoded'] = True
+    return response
@@ -0,0 +1,44 @@
+import json
+from decimal import Decimal
+
+from http_compression import request_body
+
+# Headers every API accepts from the browser; handlers add e.g. If-None-Match
+ALLOW_HEADERS = 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,Accept,Origin,Referer'
+
+def make_cors_headers(methods='GET,POST,PUT,DELETE,OPTIONS', allow_headers=ALLOW_HEADERS, expose_headers=None, **extra):
+    """CORS headers for an API's responses; `extra` adds headers such as Cache-Control"""
+    headers = {
+        'Access-Control-Allow-Origin': '*',
+        'Access-Control-Allow-Methods': methods,
+        'Access-Control-Allow-Headers': allow_headers
+    }
+    if expose_headers:
+        headers['Access-Control-Expose-Headers'] = expose_headers
+    headers['Access-Control-Max-Age'] = '86400'
+    headers.update(extra)
+    return headers
+
+def decimal_default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+def parse_body(event):
+    """Request payload: the JSON body of an API Gateway event, or the event itself when invoked directly"""
+    if 'body' not in event:
+        return event if event else {}
+    if event['body'] is None or event['body'] == '':
+        return {}
+    return json.loads(request_body(event)) if isinstance(event['body'], str) else event['body']
+
+def api_response(status_code, headers, payload=None, default=decimal_default):
+    """API Gateway proxy response; no body when `payload` is None (OPTIONS, 304)"""
+    result = {'statusCode': status_code, 'headers': headers}
+    if payload is not None:
+        result['body'] = json.dumps(payload, default=default)
+    return result
+
+def error_response(status_code, headers, message):
+    """The error envelope every API uses: {"error": message}"""
+    return api_response(status_code, headers, {'error': message})
@@ -0,0 +1,20 @@
+"""Import mode for modules that are slow to import and only needed on some branches.
+
+Only modules that measurably slow a cold start belong here, such as
+course_catalog, which parses the catalog JSON on import. Handlers import them
+inside the functions that use them. Setting LAZY_IMPORTS=false makes preload()
+import them during init instead. That suits provisioned concurrency, where
+init runs before any request arrives. Stdlib modules stay at the top of the
+handler because botocore has already imported most of them.
+"""
+import importlib
+import os
+
+LAZY_IMPORTS = os.environ.get('LAZY_IMPORTS', 'true').lower() != 'false'
+
+def preload(*module_names):
+    """Import `module_names` now unless lazy imports are on; handlers list what their branches import"""
+    if LAZY_IMPORTS:
+        return
+    for name in module_names:
+        importlib.import_module(name)
@@ -0,0 +1,56 @@
+"""Skill-gap counters shared by the stream aggregator and the `stats` operation.
+
+Every assessment counts once in each of its buckets: total, skill, current
+level, target level, gap size (levels between Current and Target) and
+skill + gap size. All buckets live under one partition so `stats` is a single
+Query however many assessments exist.
+"""
+from decimal import Decimal
+
+AGGREGATE_SCOPE = 'skill-gaps'
+LEVEL_ORDER = ['beginner', 'basic', 'intermediate', 'advanced']
+
+def gap_size(current, target):
+    """Levels between current and target, or 'unknown' for levels outside LEVEL_ORDER"""
+    try:
+        return str(LEVEL_ORDER.index(target.strip().lower()) - LEVEL_ORDER.index(current.strip().lower()))
+    except (AttributeError, ValueError):
+        return 'unknown'
+
+def assessment_buckets(item):
+    """Bucket names an assessment item counts towards; none for a missing item"""
+    if not item:
+        return []
+    skill = item.get('Skill') or 'unknown'
+    current = item.get('Current') or 'unknown'
+    target = item.get('Target') or 'unknown'
+    gap = gap_size(current, target)
+    return ['total', f'skill#{skill}', f'current#{current}', f'target#{target}', f'gap#{gap}', f'skill-gap#{skill}#{gap}']
+
+def bucket_deltas(changes):
+    """Net counter change per bucket for (old_item, new_item) pairs; unchanged buckets are dropped"""
+    deltas = {}
+    for old_item, new_item in changes:
+        for bucket in assessment_buckets(old_item):
+            deltas[bucket] = deltas.get(bucket, 0) - 1
+        for bucket in assessment_buckets(new_item):
+            deltas[bucket] = deltas.get(bucket, 0) + 1
+    return {bucket: delta for bucket, delta in deltas.items() if delta}
+
+def stats_from_buckets(items):
+    """Shape the aggregate items for the `stats` response, leaving out empty buckets"""
+    stats = {'total': 0, 'bySkill': {}, 'byCurrent': {}, 'byTarget': {}, 'byGap': {}, 'bySkillGap': {}}
+    groups = {'skill': 'bySkill', 'current': 'byCurrent', 'target': 'byTarget', 'gap': 'byGap'}
+    for item in items:
+        count = int(item.get('Assessments', Decimal(0)))
+        if count <= 0:
+            continue
+        kind, _, name = item['Bucket'].partition('#')
+        if kind == 'total':
+            stats['total'] = count
+        elif kind == 'skill-gap':
+            skill, _, gap = name.rpartition('#')
+            stats['bySkillGap'].setdefault(skill, {})[gap] = count
+        elif kind in groups:
+            stats[groups[kind]][name] = count
+    return stats
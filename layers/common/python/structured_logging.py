@@ -0,0 +1,85 @@
+import json
+import os
+import random
+import time
+
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+LOG_LEVEL = LEVELS.get(os.environ.get('LOG_LEVEL', 'INFO').upper(), LEVELS['INFO'])
+# Fraction of requests whose DEBUG/INFO lines are kept; WARNING and ERROR are never sampled out
+DEFAULT_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', '1'))
+# Per-operation overrides, e.g. LOG_SAMPLE_RATES='{"list": 0.05, "read": 0.1}'
+SAMPLE_RATES = {operation: float(rate) for operation, rate in json.loads(os.environ.get('LOG_SAMPLE_RATES') or '{}').items()}
+
+_request = {'service': None, 'request_id': None, 'operation': None, 'sampled': True}
+
+def start_request(service, context=None):
+    """Reset per-request fields at the top of a handler"""
+    _request.update(
+        service=service,
+        request_id=getattr(context, 'aws_request_id', None),
+        operation=None,
+        sampled=random.random() < DEFAULT_SAMPLE_RATE
+    )
+
+def set_operation(operation):
+    """Tag later lines with the operation and re-roll sampling at its rate"""
+    _request['operation'] = operation
+    _request['sampled'] = random.random() < SAMPLE_RATES.get(operation, DEFAULT_SAMPLE_RATE)
+
+def debug_enabled():
+    return LOG_LEVEL <= LEVELS['DEBUG'] and _request['sampled']
+
+def summarize(value):
+    """Cheap size description of a payload - never serializes it"""
+    if isinstance(value, (str, bytes)):
+        return {'type': type(value).__name__, 'length': len(value)}
+    if isinstance(value, (list, tuple)):
+        return {'type': 'list', 'count': len(value)}
+    if isinstance(value, dict):
+        return {'type': 'object', 'keys': sorted(value)[:20]}
+    return {'type': type(value).__name__}
+
+def log(level, message, **fields):
+    if LEVELS[level] < LOG_LEVEL:
+        return
+    if LEVELS[level] < LEVELS['WARNING'] and not _request['sampled']:
+        return
+    record = {
+        'level': level,
+        'message': message,
+        'timestamp': round(time.time(), 3),
+        'service': _request['service'],
+        'request_id': _request['request_id'],
+        'operation': _request['operation']
+    }
+    record.update(fields)
+    print(json.dumps(record, default=str))
+
+def debug(message, **fields):
+    log('DEBUG', message, **fields)
+
+def info(message, **fields):
+    log('INFO', message, **fields)
+
+def warning(message, **fields):
+    log('WARNING', message, **fields)
+
+def error(message, **fields):
+    log('ERROR', message, **fields)
+
+def debug_payload(message, payload):
+    """Log a whole payload, but only when DEBUG is on; its size is logged at INFO otherwise"""
+    if debug_enabled():
+        debug(message, payload=payload)
+    else:
+        info(message, **summarize(payload))
+
+def log_request(event):
+    """Describe the incoming event by method and body size instead of dumping it"""
+    body = event.get('body') if isinstance(event, dict) else None
+    info('request',
+         method=event.get('httpMethod') if isinstance(event, dict) else None,
+         path=event.get('path') if isinstance(event, dict) else None,
+         body_length=len(body) if isinstance(body, str) else None)
+    if debug_enabled():
+        debug('raw event', event=event)
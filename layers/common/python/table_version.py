@@ -0,0 +1,46 @@
+import hashlib
+import os
+
+# One item per data table, {TableName, Version}; every write to the data table bumps it
+VERSIONS_TABLE = os.environ.get('TABLE_VERSIONS_TABLE')
+
+def current_version(dynamodb, table_name):
+    """Version of `table_name`, 0 before its first write, or None when versioning is off"""
+    if not VERSIONS_TABLE:
+        return None
+    response = dynamodb.Table(VERSIONS_TABLE).get_item(Key={'TableName': table_name}, ConsistentRead=True)
+    return int(response.get('Item', {}).get('Version', 0))
+
+def bump_version(dynamodb, table_name):
+    """Record that `table_name` changed, invalidating every ETag handed out for it"""
+    if not VERSIONS_TABLE:
+        return
+    dynamodb.Table(VERSIONS_TABLE).update_item(
+        Key={'TableName': table_name},
+        UpdateExpression='ADD Version :one',
+        ExpressionAttributeValues={':one': 1}
+    )
+
+def make_etag(table_name, version, variant=None):
+    """Weak ETag - the same version may be sent plain or compressed; `variant` tells apart e.g. field sets"""
+    tag = f'{table_name}-{version}'
+    if variant:
+        tag += '-' + hashlib.sha1(variant.encode('utf-8')).hexdigest()[:12]
+    return f'W/"{tag}"'
+
+def etag_matches(event, etag):
+    """True when the request's If-None-Match already names `etag`"""
+    headers = event.get('headers') or {}
+    value = next((v for k, v in headers.items() if k.lower() == 'if-none-match'), None)
+    if not value:
+        return False
+    candidates = [tag.strip() for tag in value.split(',')]
+    return '*' in candidates or etag in candidates or etag[2:] in candidates
+
+def check_etag(event, dynamodb, table_name, variant=None):
+    """(etag, not_modified) for a list of `table_name`; read the version before scanning"""
+    version = current_version(dynamodb, table_name)
+    if version is None:
+        return None, False
+    etag = make_etag(table_name, version, variant)
+    return etag, etag_matches(event, etag)
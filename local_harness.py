@@ -0,0 +1,818 @@
+"""Offline stand-ins for DynamoDB and Bedrock, plus a loader for the Lambda handlers.
+
+InMemoryDynamoDB mimics the subset of the boto3 DynamoDB resource the handlers
+use: scan (Limit, ExclusiveStartKey, Segment/TotalSegments and the 1 MB page
+cap), query on the base table and GSIs, get/put/update/delete with condition
+expressions, batch_get_item, batch_write_item and batch_writer. Numbers come back as Decimal
+and floats are rejected, as with boto3. Each table counts its reads and writes
+in `stats` so benchmarks can report them. Tables created with stream=True
+record NEW_AND_OLD_IMAGES stream records for drain_stream().
+
+Used by run-local-events.py and benchmark-handlers.py; nothing here is deployed.
+"""
+import bisect
+import copy
+import importlib.util
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from decimal import Decimal
+
+from botocore.exceptions import ClientError
+
+MAX_PAGE_BYTES = 1024 * 1024
+MAX_BATCH_WRITE = 25
+MAX_BATCH_GET = 100
+
+def client_error(code, message, operation):
+    return ClientError({'Error': {'Code': code, 'Message': message}}, operation)
+
+def to_dynamo(value):
+    """Convert a Python value the way boto3's serializer would (ints become Decimal)"""
+    if isinstance(value, bool) or value is None or isinstance(value, (str, bytes, Decimal)):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    if isinstance(value, float):
+        raise TypeError('Float types are not supported. Use Decimal types instead.')
+    if isinstance(value, dict):
+        return {k: to_dynamo(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_dynamo(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return {to_dynamo(v) for v in value}
+    raise TypeError(f'Unsupported type "{type(value)}" for value "{value}"')
+
+def to_attribute_value(value):
+    """Wire-format AttributeValue, as found in stream record images"""
+    if isinstance(value, bool):
+        return {'BOOL': value}
+    if value is None:
+        return {'NULL': True}
+    if isinstance(value, str):
+        return {'S': value}
+    if isinstance(value, Decimal):
+        return {'N': str(value)}
+    if isinstance(value, bytes):
+        return {'B': value}
+    if isinstance(value, dict):
+        return {'M': {k: to_attribute_value(v) for k, v in value.items()}}
+    if isinstance(value, list):
+        return {'L': [to_attribute_value(v) for v in value]}
+    if all(isinstance(v, Decimal) for v in value):
+        return {'NS': sorted(str(v) for v in value)}
+    return {'SS': sorted(value)}
+
+def item_size(item):
+    """Approximate DynamoDB item size, used for the 1 MB page cap"""
+    return len(json.dumps(item, default=str))
+
+def sort_value(value):
+    """Order key values like DynamoDB: numbers numerically, strings lexically"""
+    return (0, value) if isinstance(value, Decimal) else (1, str(value))
+
+# --- condition evaluation -------------------------------------------------
+
+def resolve_path(item, name):
+    value = item
+    for part in name.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return None, False
+        value = value[part]
+    return value, True
+
+def compare(op, left, right):
+    if left is None:
+        return op == '<>'
+    if op == '=':
+        return left == right
+    if op == '<>':
+        return left != right
+    try:
+        if op == '<':
+            return left < right
+        if op == '<=':
+            return left <= right
+        if op == '>':
+            return left > right
+        if op == '>=':
+            return left >= right
+    except TypeError:
+        return False
+    raise ValueError(f'Unsupported comparison {op}')
+
+def evaluate_condition(condition, item):
+    """Evaluate a boto3.dynamodb.conditions expression against an item"""
+    expression = condition.get_expression()
+    op = expression['operator']
+    values = expression['values']
+    if op == 'AND':
+        return evaluate_condition(values[0], item) and evaluate_condition(values[1], item)
+    if op == 'OR':
+        return evaluate_condition(values[0], item) or evaluate_condition(values[1], item)
+    if op == 'NOT':
+        return not evaluate_condition(values[0], item)
+
+    value, present = resolve_path(item, values[0].name)
+    if op == 'attribute_exists':
+        return present
+    if op == 'attribute_not_exists':
+        return not present
+    if op == 'begins_with':
+        return present and isinstance(value, str) and value.startswith(values[1])
+    if op == 'contains':
+        return present and values[1] in value
+    if op == 'BETWEEN':
+        return present and compare('>=', value, values[1]) and compare('<=', value, values[2])
+    if op == 'IN':
+        return present and value in values[1]
+    return compare(op, value if present else None, values[1])
+
+_COMPARISON = re.compile(r'^\s*([#\w.]+)\s*(=|<>|<=|>=|<|>)\s*(:\w+)\s*$')
+_FUNCTION = re.compile(r'^\s*(attribute_exists|attribute_not_exists)\s*\(\s*([#\w.]+)\s*\)\s*$')
+
+def evaluate_string_condition(expression, item, names, values):
+    """Evaluate the string ConditionExpression subset used in this repo (AND of simple terms)"""
+    for term in re.split(r'\s+AND\s+', expression.strip(), flags=re.IGNORECASE):
+        match = _FUNCTION.match(term)
+        if match:
+            _, present = resolve_path(item, names.get(match.group(2), match.group(2)))
+            if present != (match.group(1) == 'attribute_exists'):
+                return False
+            continue
+        match = _COMPARISON.match(term)
+        if not match:
+            raise ValueError(f'Unsupported condition term: {term}')
+        value, present = resolve_path(item, names.get(match.group(1), match.group(1)))
+        if not compare(match.group(2), value if present else None, values[match.group(3)]):
+            return False
+    return True
+
+def check_condition(condition, item, names, values, operation):
+    if condition is None:
+        return
+    item = item or {}
+    if isinstance(condition, str):
+        passed = evaluate_string_condition(condition, item, names, values)
+    else:
+        passed = evaluate_condition(condition, item)
+    if not passed:
+        raise client_error('ConditionalCheckFailedException', 'The conditional request failed', operation)
+
+def parse_projection(projection, names):
+    if not projection:
+        return None
+    return [names.get(name.strip(), name.strip()) for name in projection.split(',')]
+
+def apply_projection(item, attributes):
+    if attributes is None:
+        return item
+    return {name: item[name] for name in attributes if name in item}
+
+# --- update expressions -----------------------------------------------------
+
+_SECTION = re.compile(r'\b(SET|ADD|REMOVE|DELETE)\b', re.IGNORECASE)
+
+def split_top_level(text):
+    """Split on commas that are not inside parentheses"""
+    parts, depth, current = [], 0, ''
+    for char in text:
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        if char == ',' and depth == 0:
+            parts.append(current)
+            current = ''
+        else:
+            current += char
+    if current.strip():
+        parts.append(current)
+    return [part.strip() for part in parts]
+
+def update_operand(operand, item, names, values):
+    operand = operand.strip()
+    match = re.match(r'^if_not_exists\s*\(\s*([#\w.]+)\s*,\s*(:\w+)\s*\)$', operand)
+    if match:
+        value, present = resolve_path(item, names.get(match.group(1), match.group(1)))
+        return value if present else values[match.group(2)]
+    match = re.match(r'^list_append\s*\((.+)\)$', operand)
+    if match:
+        left, right = split_top_level(match.group(1))
+        return update_operand(left, item, names, values) + update_operand(right, item, names, values)
+    if operand.startswith(':'):
+        return values[operand]
+    value, present = resolve_path(item, names.get(operand, operand))
+    if not present:
+        raise client_error('ValidationException', f'The provided expression refers to an attribute that does not exist in the item: {operand}', 'UpdateItem')
+    return value
+
+def apply_update(item, expression, names, values):
+    """Apply a SET/ADD/REMOVE/DELETE UpdateExpression to item in place"""
+    sections = _SECTION.split(expression)
+    for keyword, body in zip(sections[1::2], sections[2::2]):
+        keyword = keyword.upper()
+        for clause in split_top_level(body):
+            if keyword == 'SET':
+                target, value_expression = clause.split('=', 1)
+                target = names.get(target.strip(), target.strip())
+                # a + b / a - b at the top level (outside function calls)
+                match = re.match(r'^(.+?\)|[^()+\-]+?)\s*([+\-])\s*(.+)$', value_expression.strip())
+                if match:
+                    left = update_operand(match.group(1), item, names, values)
+                    right = update_operand(match.group(3), item, names, values)
+                    value = left + right if match.group(2) == '+' else left - right
+                else:
+                    value = update_operand(value_expression, item, names, values)
+                item[target] = value
+            elif keyword == 'ADD':
+                target, operand = clause.split(None, 1)
+                target = names.get(target, target)
+                increment = values[operand.strip()]
+                if isinstance(increment, set):
+                    item[target] = set(item.get(target, set())) | increment
+                else:
+                    item[target] = item.get(target, Decimal(0)) + increment
+            elif keyword == 'REMOVE':
+                item.pop(names.get(clause, clause), None)
+            elif keyword == 'DELETE':
+                target, operand = clause.split(None, 1)
+                target = names.get(target, target)
+                remaining = set(item.get(target, set())) - values[operand.strip()]
+                # DynamoDB has no empty sets: deleting the last member removes the attribute
+                if remaining:
+                    item[target] = remaining
+                else:
+                    item.pop(target, None)
+
+# --- tables -------------------------------------------------------------------
+
+class InMemoryIndex:
+    """A GSI: hash value -> {primary key: item}, kept in step with every write"""
+
+    def __init__(self, hash_key, range_key=None):
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.partitions = {}
+
+    def add(self, pk, item):
+        if self.hash_key in item and (self.range_key is None or self.range_key in item):
+            self.partitions.setdefault(item[self.hash_key], {})[pk] = item
+
+    def remove(self, pk, item):
+        partition = self.partitions.get(item.get(self.hash_key))
+        if partition is not None:
+            partition.pop(pk, None)
+            if not partition:
+                del self.partitions[item[self.hash_key]]
+
+class InMemoryTable:
+    def __init__(self, resource, name, hash_key, range_key=None, indexes=None, stream=False):
+        self.resource = resource
+        self.name = name
+        self.table_name = name
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.key_names = [hash_key] + ([range_key] if range_key else [])
+        self.items = {}
+        self.sizes = {}
+        self.indexes = {name: InMemoryIndex(*keys) for name, keys in (indexes or {}).items()}
+        # IndexStatus reported by global_secondary_indexes; set an entry to 'CREATING' to mimic a backfill
+        self.index_status = {name: 'ACTIVE' for name in self.indexes}
+        self._orders = {}
+        self.stats = {'reads': 0, 'writes': 0, 'pages': 0, 'read_bytes': 0}
+        self.stream = [] if stream else None
+        # Each request is atomic, as in DynamoDB, so concurrent callers (bulk generation) can share a table
+        self._lock = resource.lock
+
+    def reload(self):
+        """boto3's Table.reload() re-runs DescribeTable; here the attributes below are always current"""
+
+    @property
+    def global_secondary_indexes(self):
+        return [{'IndexName': name, 'IndexStatus': status} for name, status in self.index_status.items()] or None
+
+    # key helpers
+
+    def _check_key_types(self, item, operation):
+        """Reject a write whose table or index key values are not non-empty strings (every key in the templates is S)"""
+        names = self.key_names + [name for index in self.indexes.values() for name in (index.hash_key, index.range_key) if name]
+        for name in names:
+            if name in item and (not isinstance(item[name], str) or not item[name]):
+                raise client_error('ValidationException', f'One or more parameter values were invalid: '
+                                   f'Type mismatch or empty value for key attribute {name}', operation)
+
+    def _pk(self, key):
+        try:
+            return tuple(key[name] for name in self.key_names)
+        except KeyError as e:
+            raise client_error('ValidationException', f'The provided key element does not match the schema: missing {e.args[0]}', 'GetItem')
+
+    def _sort_key(self, pk):
+        return tuple(sort_value(value) for value in pk)
+
+    def _ordered_keys(self, total_segments=None, segment=None):
+        """Scan order (and its sort keys) for a segment, rebuilt lazily after inserts and deletes"""
+        cache_key = (total_segments, segment)
+        if cache_key not in self._orders:
+            keys = sorted(self.items, key=self._sort_key)
+            if total_segments:
+                # Stable hash partitioning, like DynamoDB's segment split
+                keys = [pk for pk in keys if zlib.crc32(repr(pk).encode()) % total_segments == segment]
+            self._orders[cache_key] = (keys, [self._sort_key(pk) for pk in keys])
+        return self._orders[cache_key]
+
+    def _out(self, item, attributes=None):
+        self.stats['reads'] += 1
+        item = apply_projection(item, attributes)
+        if any(isinstance(value, (dict, list, set)) for value in item.values()):
+            return copy.deepcopy(item)
+        return dict(item)
+
+    def _store(self, item):
+        item = to_dynamo(copy.deepcopy(item))
+        pk = self._pk(item)
+        old = self.items.get(pk)
+        if old is not None:
+            for index in self.indexes.values():
+                index.remove(pk, old)
+        else:
+            self._orders = {}
+        self.items[pk] = item
+        self.sizes[pk] = item_size(item)
+        for index in self.indexes.values():
+            index.add(pk, item)
+        self.stats['writes'] += 1
+        self._record('MODIFY' if old is not None else 'INSERT', pk, old, item)
+        return old
+
+    def _remove(self, pk):
+        old = self.items.pop(pk, None)
+        if old is not None:
+            self.sizes.pop(pk)
+            for index in self.indexes.values():
+                index.remove(pk, old)
+            self._orders = {}
+            self._record('REMOVE', pk, old, None)
+        self.stats['writes'] += 1
+        return old
+
+    def _record(self, event_name, pk, old, new):
+        if self.stream is None:
+            return
+        images = {'Keys': {name: to_attribute_value(value) for name, value in zip(self.key_names, pk)}}
+        if old is not None:
+            images['OldImage'] = {name: to_attribute_value(value) for name, value in old.items()}
+        if new is not None:
+            images['NewImage'] = {name: to_attribute_value(value) for name, value in new.items()}
+        self.stream.append({'eventName': event_name, 'eventSource': 'aws:dynamodb', 'dynamodb': images})
+
+    def drain_stream(self, batch_size=100):
+        """Hand over the recorded stream records as Lambda events of at most batch_size records"""
+        records, self.stream = self.stream, []
+        return [{'Records': records[start:start + batch_size]} for start in range(0, len(records), batch_size)]
+
+    # single-item operations
+
+    def get_item(self, Key, ProjectionExpression=None, ExpressionAttributeNames=None, ConsistentRead=False):
+        with self._lock:
+            item = self.items.get(self._pk(Key))
+            if item is None:
+                return {}
+            return {'Item': self._out(item, parse_projection(ProjectionExpression, ExpressionAttributeNames or {}))}
+
+    def put_item(self, Item, ConditionExpression=None, ExpressionAttributeNames=None, ExpressionAttributeValues=None, ReturnValues='NONE'):
+        with self._lock:
+            pk = self._pk(Item)
+            self._check_key_types(Item, 'PutItem')
+            check_condition(ConditionExpression, self.items.get(pk), ExpressionAttributeNames or {}, to_dynamo(ExpressionAttributeValues or {}), 'PutItem')
+            old = self._store(Item)
+            return {'Attributes': copy.deepcopy(old)} if ReturnValues == 'ALL_OLD' and old else {}
+
+    def delete_item(self, Key, ConditionExpression=None, ExpressionAttributeNames=None, ExpressionAttributeValues=None, ReturnValues='NONE'):
+        with self._lock:
+            pk = self._pk(Key)
+            check_condition(ConditionExpression, self.items.get(pk), ExpressionAttributeNames or {}, to_dynamo(ExpressionAttributeValues or {}), 'DeleteItem')
+            old = self._remove(pk)
+            return {'Attributes': copy.deepcopy(old)} if ReturnValues == 'ALL_OLD' and old else {}
+
+    def update_item(self, Key, UpdateExpression, ConditionExpression=None, ExpressionAttributeNames=None,
+                    ExpressionAttributeValues=None, ReturnValues='NONE'):
+        with self._lock:
+            pk = self._pk(Key)
+            names = ExpressionAttributeNames or {}
+            values = to_dynamo(ExpressionAttributeValues or {})
+            old = self.items.get(pk)
+            check_condition(ConditionExpression, old, names, values, 'UpdateItem')
+            item = copy.deepcopy(old) if old else dict(Key)
+            apply_update(item, UpdateExpression, names, values)
+            self._store(item)
+            if ReturnValues == 'ALL_NEW':
+                return {'Attributes': copy.deepcopy(item)}
+            if ReturnValues == 'ALL_OLD' and old:
+                return {'Attributes': copy.deepcopy(old)}
+            if ReturnValues == 'UPDATED_NEW':
+                changed = {k: v for k, v in item.items() if old is None or old.get(k) != v}
+                return {'Attributes': copy.deepcopy(changed)}
+            return {}
+
+    # multi-item reads
+
+    def _page(self, keys, start, Limit, attributes, filter_expression, last_key_names):
+        """Collect one page from `keys` beginning at position `start`"""
+        items, size, position = [], 0, start
+        while position < len(keys) and (Limit is None or position - start < Limit) and size < MAX_PAGE_BYTES:
+            pk = keys[position]
+            item = self.items[pk]
+            size += self.sizes[pk]
+            position += 1
+            if filter_expression is None or evaluate_condition(filter_expression, item):
+                items.append(self._out(item, attributes))
+        self.stats['pages'] += 1
+        self.stats['read_bytes'] += size
+        response = {'Items': items, 'Count': len(items), 'ScannedCount': position - start}
+        if position < len(keys):
+            last = self.items[keys[position - 1]]
+            response['LastEvaluatedKey'] = {name: last[name] for name in last_key_names}
+        return response
+
+    def scan(self, Limit=None, ExclusiveStartKey=None, Segment=None, TotalSegments=None, ProjectionExpression=None,
+             ExpressionAttributeNames=None, FilterExpression=None, Select=None, ConsistentRead=False):
+        with self._lock:
+            keys, sort_keys = self._ordered_keys(TotalSegments, Segment)
+            start = 0
+            if ExclusiveStartKey:
+                start = bisect.bisect_right(sort_keys, self._sort_key(self._pk(ExclusiveStartKey)))
+            return self._page(keys, start, Limit, parse_projection(ProjectionExpression, ExpressionAttributeNames or {}),
+                              FilterExpression, self.key_names)
+
+    def query(self, KeyConditionExpression, IndexName=None, Limit=None, ExclusiveStartKey=None, ScanIndexForward=True,
+              ProjectionExpression=None, ExpressionAttributeNames=None, FilterExpression=None, Select=None, ConsistentRead=False):
+        with self._lock:
+            hash_key, range_key = (self.hash_key, self.range_key) if IndexName is None else (
+                self.indexes[IndexName].hash_key, self.indexes[IndexName].range_key)
+            hash_value = self._hash_value(KeyConditionExpression, hash_key)
+            if IndexName is None:
+                candidates = [pk for pk in self.items if pk[0] == hash_value]
+            else:
+                candidates = list(self.indexes[IndexName].partitions.get(hash_value, {}))
+            matched = [pk for pk in candidates if evaluate_condition(KeyConditionExpression, self.items[pk])]
+
+            def order(pk):
+                item = self.items[pk]
+                return (sort_value(item[range_key]) if range_key else (0, ''), self._sort_key(pk))
+            matched.sort(key=order, reverse=not ScanIndexForward)
+
+            last_key_names = list(dict.fromkeys(self.key_names + [hash_key] + ([range_key] if range_key else [])))
+            start = 0
+            if ExclusiveStartKey:
+                start_pk = self._pk(ExclusiveStartKey)
+                start = next((i + 1 for i, pk in enumerate(matched) if pk == start_pk), len(matched))
+            return self._page(matched, start, Limit, parse_projection(ProjectionExpression, ExpressionAttributeNames or {}),
+                              FilterExpression, last_key_names)
+
+    @staticmethod
+    def _hash_value(condition, hash_key):
+        expression = condition.get_expression()
+        if expression['operator'] == 'AND':
+            for part in expression['values']:
+                try:
+                    return InMemoryTable._hash_value(part, hash_key)
+                except ValueError:
+                    pass
+        elif expression['operator'] == '=' and expression['values'][0].name == hash_key:
+            return expression['values'][1]
+        raise ValueError(f'KeyConditionExpression must test {hash_key} for equality')
+
+    @contextmanager
+    def batch_writer(self, overwrite_by_pkeys=None):
+        writer = BatchWriter(self)
+        yield writer
+        writer.flush()
+
+class BatchWriter:
+    """Buffers writes like boto3's batch_writer and sends them 25 at a time"""
+
+    def __init__(self, table):
+        self.table = table
+        self.buffer = {}
+
+    def put_item(self, Item):
+        self.buffer[self.table._pk(Item)] = {'PutRequest': {'Item': Item}}
+        if len(self.buffer) >= MAX_BATCH_WRITE:
+            self.flush()
+
+    def delete_item(self, Key):
+        self.buffer[self.table._pk(Key)] = {'DeleteRequest': {'Key': Key}}
+        if len(self.buffer) >= MAX_BATCH_WRITE:
+            self.flush()
+
+    def flush(self):
+        pending = list(self.buffer.values())
+        self.buffer = {}
+        while pending:
+            response = self.table.resource.batch_write_item(RequestItems={self.table.name: pending})
+            pending = response['UnprocessedItems'].get(self.table.name, [])
+
+class InMemoryDynamoDB:
+    """Stand-in for boto3.resource('dynamodb').
+
+    unprocessed_every=n makes batch_write_item hand back the last request of
+    every n-th call as UnprocessedItems, to exercise retry paths.
+    """
+
+    def __init__(self, unprocessed_every=0):
+        self.tables = {}
+        self.unprocessed_every = unprocessed_every
+        self.batch_calls = 0
+        self.lock = threading.RLock()
+
+    def create_table(self, name, hash_key, range_key=None, indexes=None, stream=False):
+        self.tables[name] = InMemoryTable(self, name, hash_key, range_key, indexes, stream)
+        return self.tables[name]
+
+    def Table(self, name):
+        if name not in self.tables:
+            raise client_error('ResourceNotFoundException', f'Requested resource not found: Table: {name} not found', 'DescribeTable')
+        return self.tables[name]
+
+    def batch_get_item(self, RequestItems):
+        responses = {}
+        for name, request in RequestItems.items():
+            table = self.Table(name)
+            keys = request['Keys']
+            if len(keys) > MAX_BATCH_GET:
+                raise client_error('ValidationException', 'Too many items requested for the BatchGetItem call', 'BatchGetItem')
+            if len({table._pk(key) for key in keys}) != len(keys):
+                raise client_error('ValidationException', 'Provided list of item keys contains duplicates', 'BatchGetItem')
+            kwargs = {k: v for k, v in request.items() if k in ('ProjectionExpression', 'ExpressionAttributeNames')}
+            responses[name] = [item for item in (table.get_item(Key=key, **kwargs).get('Item') for key in keys) if item]
+        return {'Responses': responses, 'UnprocessedKeys': {}}
+
+    def batch_write_item(self, RequestItems):
+        with self.lock:
+            return self._batch_write_item(RequestItems)
+
+    def _batch_write_item(self, RequestItems):
+        self.batch_calls += 1
+        unprocessed = {}
+        for name, requests in RequestItems.items():
+            table = self.Table(name)
+            if len(requests) > MAX_BATCH_WRITE:
+                raise client_error('ValidationException', 'Too many items requested for the BatchWriteItem call', 'BatchWriteItem')
+            # One invalid item rejects the whole call, as in DynamoDB
+            for request in requests:
+                table._check_key_types(request['PutRequest']['Item'] if 'PutRequest' in request else request['DeleteRequest']['Key'],
+                                       'BatchWriteItem')
+            keys = [table._pk(r['PutRequest']['Item'] if 'PutRequest' in r else r['DeleteRequest']['Key']) for r in requests]
+            if len(set(keys)) != len(keys):
+                raise client_error('ValidationException', 'Provided list of item keys contains duplicates', 'BatchWriteItem')
+            if self.unprocessed_every and self.batch_calls % self.unprocessed_every == 0 and len(requests) > 1:
+                requests, unprocessed[name] = requests[:-1], requests[-1:]
+            for request in requests:
+                if 'PutRequest' in request:
+                    table._store(request['PutRequest']['Item'])
+                else:
+                    table._remove(table._pk(request['DeleteRequest']['Key']))
+        return {'UnprocessedItems': unprocessed}
+
+# --- Bedrock ------------------------------------------------------------------
+
+# A recorded Titan stream: prose first, brackets inside strings, tokens split across chunks, more items than needed
+RECORDED_STREAM = ['Sure! Here [are] the courses:\n[{"na', 'me": "Arrays [and] {maps}", "source": "Udemy"},',
+                   ' {"name": "Say \\"hi]\\"", "source": "Coursera"}, {"name": "C", "sou', 'rce": "Pluralsight"},',
+                   ' {"name": "D", "source": "edX"}, {"name": "E", "source": "AWS Training"},',
+                   ' {"name": "F", "source": "Udacity"}, {"name": "G", "source": "LinkedIn"}]', ' Good luck!']
+
+class LocalBedrock:
+    """Stand-in for the bedrock-runtime client returning a canned Titan response.
+
+    `latency` seconds are slept per call so benchmarks can model the real model;
+    streamed replies spread it evenly over their chunks. `chunks` replays a
+    recorded stream (the outputText of each chunk) instead of splitting the
+    canned output every `chunk_size` characters. Batched prompts (one "- skill:
+    current -> target" line per gap) get the canned output under every skill.
+    throttle_every=n rejects every n-th call with ThrottlingException.
+    """
+
+    DEFAULT_OUTPUT = json.dumps([
+        {'name': 'Hands-on Fundamentals', 'source': 'Coursera', 'duration': '4 weeks', 'url': 'https://www.coursera.org/'},
+        {'name': 'Applied Projects', 'source': 'Udemy', 'duration': '12 hours', 'url': 'https://www.udemy.com/'}
+    ])
+
+    def __init__(self, output_text=None, latency=0.0, chunks=None, chunk_size=32, throttle_every=0):
+        self.output_text = output_text or self.DEFAULT_OUTPUT
+        self.latency = latency
+        self.chunks = chunks
+        self.chunk_size = chunk_size
+        self.throttle_every = throttle_every
+        self.calls = 0
+        self.throttled = 0
+        self.chunks_sent = 0
+        self._lock = threading.Lock()
+
+    def _count_call(self, operation):
+        with self._lock:
+            self.calls += 1
+            if self.throttle_every and self.calls % self.throttle_every == 0:
+                self.throttled += 1
+                raise client_error('ThrottlingException', 'Too many requests, please wait before trying again.', operation)
+
+    def invoke_model(self, modelId, body, **kwargs):
+        self._count_call('InvokeModel')
+        if self.latency:
+            time.sleep(self.latency)
+        payload = {'results': [{'outputText': 'Here are the courses:\n' + self.output_for(body)}]}
+        return {'body': io.BytesIO(json.dumps(payload).encode('utf-8'))}
+
+    def output_for(self, body):
+        skills = re.findall(r'^- (.+?): .+ -> .+$', json.loads(body)['inputText'], re.MULTILINE)
+        if not skills:
+            return self.output_text
+        recommendations = json.loads(self.output_text)
+        return json.dumps({skill: recommendations for skill in skills})
+
+    def invoke_model_with_response_stream(self, modelId, body, **kwargs):
+        self._count_call('InvokeModelWithResponseStream')
+        chunks = self.chunks
+        if chunks is None:
+            text = 'Here are the courses:\n' + self.output_for(body)
+            chunks = [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+        return {'body': LocalEventStream(self, chunks)}
+
+class LocalEventStream:
+    """Like botocore's EventStream: nothing is "received" until the caller reads it, and close() -
+    from any thread - ends the stream at once, even while a read is waiting for the next chunk
+    """
+
+    def __init__(self, bedrock, chunks):
+        self.bedrock = bedrock
+        self.chunks = chunks
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        for index, text in enumerate(self.chunks):
+            if self.bedrock.latency:
+                self.closed.wait(self.bedrock.latency / len(self.chunks))
+            if self.closed.is_set():
+                return
+            self.bedrock.chunks_sent += 1
+            payload = {'outputText': text, 'index': 0, 'completionReason': 'FINISH' if index == len(self.chunks) - 1 else None}
+            yield {'chunk': {'bytes': json.dumps(payload).encode('utf-8')}}
+
+    def close(self):
+        self.closed.set()
+
+# --- EventBridge ----------------------------------------------------------------
+
+class LocalEventBus:
+    """Stand-in for the events client: put_events queues entries until drain() delivers them.
+
+    fail_every=n rejects every n-th entry (FailedEntryCount), to exercise publish errors.
+    """
+
+    def __init__(self, fail_every=0):
+        self.pending = []
+        self.fail_every = fail_every
+        self.received = 0
+
+    def put_events(self, Entries):
+        if len(Entries) > 10:
+            raise client_error('ValidationException', 'Entries must contain at most 10 items', 'PutEvents')
+        results, failed = [], 0
+        for entry in Entries:
+            self.received += 1
+            if self.fail_every and self.received % self.fail_every == 0:
+                failed += 1
+                results.append({'ErrorCode': 'InternalFailure', 'ErrorMessage': 'Injected failure'})
+                continue
+            event_id = f'local-{self.received}'
+            self.pending.append({
+                'version': '0',
+                'id': event_id,
+                'source': entry['Source'],
+                'detail-type': entry['DetailType'],
+                'detail': json.loads(entry['Detail'])
+            })
+            results.append({'EventId': event_id})
+        return {'FailedEntryCount': failed, 'Entries': results}
+
+    def drain(self, handler, context=None, attempts=3):
+        """Deliver queued events to `handler`, retrying failures like an async Lambda target; returns the undeliverable ones"""
+        events, self.pending = self.pending, []
+        dead = []
+        for event in events:
+            for attempt in range(attempts):
+                try:
+                    handler(event, context or LambdaContext())
+                    break
+                except Exception:
+                    if attempt == attempts - 1:
+                        dead.append(event)
+        return dead
+
+# --- Lambda -----------------------------------------------------------------------
+
+class LocalLambda:
+    """Stand-in for the lambda client: async (Event) invocations queue until drain() runs them.
+
+    fail_every=n rejects every n-th invocation with ServiceException, to exercise dispatch errors.
+    """
+
+    def __init__(self, fail_every=0):
+        self.pending = []
+        self.fail_every = fail_every
+        self.received = 0
+
+    def invoke(self, FunctionName, Payload=b'', InvocationType='RequestResponse', **kwargs):
+        if InvocationType != 'Event':
+            raise NotImplementedError('LocalLambda only queues asynchronous invocations')
+        self.received += 1
+        if self.fail_every and self.received % self.fail_every == 0:
+            raise client_error('ServiceException', 'Injected failure', 'Invoke')
+        self.pending.append(json.loads(Payload))
+        return {'StatusCode': 202}
+
+    def drain(self, handler, context=None, attempts=3):
+        """Run queued invocations, retrying failures as Lambda's async retries would; returns the failed ones"""
+        events, self.pending = self.pending, []
+        dead = []
+        for event in events:
+            for attempt in range(attempts):
+                try:
+                    handler(event, context or LambdaContext())
+                    break
+                except Exception:
+                    if attempt == attempts - 1:
+                        dead.append(event)
+        return dead
+
+# --- handler loading -------------------------------------------------------------
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+# The common layer, which Lambda mounts at /opt/python
+LAYER_DIR = os.path.join(REPO_ROOT, 'layers', 'common', 'python')
+
+def load_handler(relative_path, env=None, dynamodb=None, bedrock=None, events=None, lambda_client=None):
+    """Import a handler file (hyphenated names included) with env set and clients injected"""
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    os.environ.update(env or {})
+    path = os.path.join(REPO_ROOT, relative_path)
+    for directory in (LAYER_DIR, os.path.dirname(path)):
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+    module_name = relative_path.replace('/', '_').replace('-', '_').rsplit('.', 1)[0]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if dynamodb is not None:
+        module.use_dynamodb(dynamodb)
+    if bedrock is not None and hasattr(module, 'use_bedrock'):
+        module.use_bedrock(bedrock)
+    if events is not None and hasattr(module, 'use_events'):
+        module.use_events(events)
+    if lambda_client is not None and hasattr(module, 'use_lambda'):
+        module.use_lambda(lambda_client)
+    return module
+
+class LambdaContext:
+    """Minimal Lambda context with a wall-clock deadline"""
+
+    def __init__(self, timeout_seconds=30, function_name='local'):
+        self.function_name = function_name
+        self.aws_request_id = 'local'
+        self.deadline = time.monotonic() + timeout_seconds
+
+    def get_remaining_time_in_millis(self):
+        return max(0, int((self.deadline - time.monotonic()) * 1000))
+
+def create_skills_tables(dynamodb, name='local-skills-assessments'):
+    """Tables for src/skills-api/app.py and src/skill-aggregator/aggregator.py, mirroring template.yaml"""
+    dynamodb.create_table(name, 'SkillAssessmentId', indexes={
+        'EmployeeSkillIndex': ('Employee', 'Skill'),
+        'SkillCurrentIndex': ('Skill', 'Current')
+    }, stream=True)
+    dynamodb.create_table(f'{name}-aggregates', 'Scope', 'Bucket')
+    return {'TABLE_NAME': name, 'AGGREGATES_TABLE': f'{name}-aggregates'}
+
+def create_learning_path_tables(dynamodb, prefix='local'):
+    """Tables for the v1-lp handlers, mirroring v1-lp/template.yaml"""
+    names = {
+        'TABLE_NAME': f'{prefix}-learning-paths',
+        'RECOMMENDATIONS_TABLE': f'{prefix}-recommendations',
+        'RECOMMENDATION_CACHE_TABLE': f'{prefix}-recommendation-cache',
+        'LEARNING_PATH_INDEX_TABLE': f'{prefix}-learning-path-index',
+        'TABLE_VERSIONS_TABLE': f'{prefix}-table-versions'
+    }
+    dynamodb.create_table(names['TABLE_NAME'], 'LearningPathId')
+    dynamodb.create_table(names['RECOMMENDATIONS_TABLE'], 'RecommendationId')
+    dynamodb.create_table(names['RECOMMENDATION_CACHE_TABLE'], 'CacheKey')
+    dynamodb.create_table(names['LEARNING_PATH_INDEX_TABLE'], 'LearningPathId')
+    dynamodb.create_table(names['TABLE_VERSIONS_TABLE'], 'TableName')
+    return names
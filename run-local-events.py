@@ -0,0 +1,286 @@
+import argparse
+import json
+import os
+import time
+
+from local_harness import (RECORDED_STREAM, REPO_ROOT, InMemoryDynamoDB, LambdaContext, LocalBedrock, LocalEventBus, LocalLambda,
+                           create_learning_path_tables,
+                           create_skills_tables, load_handler)
+
+def load_events(relative_path):
+    """A fixture file is either one event or a {name: event} mapping"""
+    with open(os.path.join(REPO_ROOT, relative_path)) as f:
+        events = json.load(f)
+    if 'httpMethod' in events or 'body' in events or 'operation' in events:
+        return [(os.path.basename(relative_path), events)]
+    return list(events.items())
+
+def invoke(module, name, event, verbose, failures):
+    response = module.lambda_handler(event, LambdaContext())
+    body = response.get('body') or ''
+    status = response['statusCode']
+    ok = status < 400 or name.startswith('expect-error')
+    print(f"{'ok  ' if ok else 'FAIL'} {status} {name}: {body if verbose else body[:160]}")
+    if not ok:
+        failures.append(name)
+    return json.loads(body) if body.startswith('{') else {}
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay the repo test event fixtures against the handlers with in-memory DynamoDB and Bedrock')
+    parser.add_argument('--verbose', action='store_true', help='Print full response bodies')
+    args = parser.parse_args()
+
+    dynamodb = InMemoryDynamoDB(unprocessed_every=3)
+    bedrock = LocalBedrock()
+    event_bus = LocalEventBus()
+    lambda_client = LocalLambda()
+    skills_env = create_skills_tables(dynamodb)
+    learning_env = create_learning_path_tables(dynamodb)
+    failures = []
+
+    print('== src/skills-api/app.py (Skills Assessment API)')
+    skills = load_handler('src/skills-api/app.py', dict(skills_env, ASSESSMENT_EVENT_BUS='local'), dynamodb, events=event_bus)
+    for name, event in load_events('test-events.json'):
+        invoke(skills, name, event, args.verbose, failures)
+
+    print('== src/skill-aggregator/aggregator.py (Skill-gap aggregates from the table stream)')
+    invoke(skills, 'batch_create', {'operation': 'batch_create', 'items': [
+        {'Employee': 'Jane Roe', 'Skill': 'Python', 'Current': 'Beginner', 'Target': 'Advanced'},
+        {'Employee': 'Jane Roe', 'Skill': 'AWS', 'Current': 'Basic', 'Target': 'Intermediate'},
+        {'Employee': 'John Doe', 'Skill': 'Python', 'Current': 'Intermediate', 'Target': 'Advanced'}]}, args.verbose, failures)
+    aggregator = load_handler('src/skill-aggregator/aggregator.py', skills_env, dynamodb)
+    for batch in dynamodb.Table(skills_env['TABLE_NAME']).drain_stream():
+        print(f"ok       stream batch: {aggregator.lambda_handler(batch, LambdaContext())}")
+    streamed = invoke(skills, 'stats', {'operation': 'stats'}, args.verbose, failures)
+    aggregator.lambda_handler({'operation': 'rebuild'}, LambdaContext())
+    if invoke(skills, 'stats after rebuild', {'operation': 'stats'}, args.verbose, failures) != streamed:
+        print('FAIL     stream-maintained stats differ from a full rebuild')
+        failures.append('stats after rebuild')
+    skills_table = dynamodb.Table(skills_env['TABLE_NAME'])
+    skill_filter = {'operation': 'list', 'Skill': 'Python', 'Current': 'Beginner'}
+    indexed = invoke(skills, 'list Skill+Current (index)', skill_filter, args.verbose, failures)
+    # A GSI added to an existing table backfills for a while; list falls back to a filtered scan
+    skills_table.index_status[skills.SKILL_CURRENT_INDEX] = 'CREATING'
+    skills.index_status['checked'] = float('-inf')
+    scanned = invoke(skills, 'list Skill+Current (index CREATING)', skill_filter, args.verbose, failures)
+    skills_table.index_status[skills.SKILL_CURRENT_INDEX] = 'ACTIVE'
+    skills.index_status['checked'] = float('-inf')
+    if not indexed.get('Skill-Assessments') or sorted(map(str, indexed['Skill-Assessments'])) != sorted(map(str, scanned['Skill-Assessments'])):
+        print('FAIL     filtered scan differs from the index query')
+        failures.append('list Skill+Current (index CREATING)')
+    # Bad keys are reported per item up front; a chunk DynamoDB still rejects fails alone
+    checked_env = create_skills_tables(dynamodb, 'local-skills-validation')
+    checked = load_handler('src/skills-api/app.py', checked_env, dynamodb)
+    entries = [{'Employee': f'Employee {n}', 'Skill': 'Go', 'Current': 'Basic', 'Target': 'Advanced'} for n in range(27)]
+    entries[3]['Employee'] = ''
+    entries[10]['Skill'] = 5
+    entries[26]['SkillAssessmentId'] = ['not', 'a', 'string']
+    result = invoke(checked, 'batch_create (3 invalid keys)', {'operation': 'batch_create', 'items': entries}, args.verbose, failures)
+    errors = {r['index']: r['error'] for r in result.get('results', []) if r['status'] == 'error'}
+    stored = len(dynamodb.Table(checked_env['TABLE_NAME']).items)
+    print(f"{'ok  ' if sorted(errors) == [3, 10, 26] and stored == 24 else 'FAIL'}     invalid entries: {errors}, stored {stored}")
+    if sorted(errors) != [3, 10, 26] or stored != 24:
+        failures.append('batch_create (3 invalid keys)')
+    requests = [(f'chunk-{n}', {'PutRequest': {'Item': {'SkillAssessmentId': f'chunk-{n}', 'Employee': 'Jane Roe' if n != 30 else 7}}})
+                for n in range(40)]
+    rejected = checked.batch_write(requests)
+    stored = len(dynamodb.Table(checked_env['TABLE_NAME']).items)
+    ok = sorted(rejected) == sorted(f'chunk-{n}' for n in range(25, 40)) and stored == 24 + 25
+    print(f"{'ok  ' if ok else 'FAIL'}     rejected chunk: {len(rejected)} failed, stored {stored}")
+    if not ok:
+        failures.append('batch_write (rejected chunk)')
+
+    print('== v1-lp/src/learning-paths/app.py (Learning Path API)')
+    learning_paths = load_handler('v1-lp/src/learning-paths/app.py', learning_env, dynamodb)
+    for fixture in ['v1-lp/test-events.json', 'v1-lp/test-skill-assessment-create.json',
+                    'v1-lp/test-skill-assessment-events.json', 'v1-lp/test-list-after-create.json']:
+        for name, event in load_events(fixture):
+            invoke(learning_paths, name, event, args.verbose, failures)
+    published = len(event_bus.pending)
+    dead = event_bus.drain(learning_paths.assessment_event_handler)
+    print(f"{'ok  ' if not dead else 'FAIL'}     {published - len(dead)}/{published} AssessmentSaved event(s) turned into learning paths")
+    if dead:
+        failures.append('assessment events')
+
+    # Regenerating keeps progress, a Current-only update publishes nothing, and a new Target replaces the paths
+    paths_table = dynamodb.Table(learning_env['TABLE_NAME'])
+    assessment = {'SkillAssessmentId': 'local-progress', 'Employee': 'Jane Roe', 'Skill': 'Python', 'Current': 'Beginner', 'Target': 'Advanced'}
+    invoke(skills, 'create (progress)', dict(assessment, operation='create'), args.verbose, failures)
+    event_bus.drain(learning_paths.assessment_event_handler)
+    old_ids = {path['LearningPathId'] for path in learning_paths.catalog_learning_paths(assessment)}
+    started = sorted(old_ids)[0]
+    paths_table.update_item(Key={'LearningPathId': started}, UpdateExpression='SET Completed = :done', ExpressionAttributeValues={':done': True})
+    invoke(learning_paths, 'regenerate (progress)', assessment, args.verbose, failures)
+    kept = paths_table.get_item(Key={'LearningPathId': started}).get('Item', {}).get('Completed') is True
+    invoke(skills, 'update Current only', dict(assessment, Current='Intermediate', operation='update'), args.verbose, failures)
+    quiet = not event_bus.pending
+    moved = dict(assessment, Current='Intermediate', Target='Intermediate')
+    invoke(skills, 'update Target', dict(moved, operation='update'), args.verbose, failures)
+    event_bus.drain(learning_paths.assessment_event_handler)
+    new_ids = {path['LearningPathId'] for path in learning_paths.catalog_learning_paths(moved)}
+    invoke(skills, 'batch_update (one Target change)', {'operation': 'batch_update', 'items': [
+        dict(moved, Current='Advanced'), dict(moved, SkillAssessmentId='local-other', Target='Advanced')]}, args.verbose, failures)
+    quiet = quiet and [event['detail']['SkillAssessmentId'] for event in event_bus.pending] == ['local-other']
+    event_bus.drain(learning_paths.assessment_event_handler)
+    ok = (quiet and kept and old_ids and new_ids
+          and not any(paths_table.get_item(Key={'LearningPathId': path_id}).get('Item') for path_id in old_ids)
+          and all(paths_table.get_item(Key={'LearningPathId': path_id}).get('Item') for path_id in new_ids))
+    print(f"{'ok  ' if ok else 'FAIL'}     progress kept: {kept}, Current-only update quiet: {quiet}, "
+          f"{len(old_ids)} superseded path(s) replaced by {len(new_ids)}")
+    if not ok:
+        failures.append('assessment updates')
+
+    print('== v1-lp/src/recommendations/recommendation-app.py')
+    recommendations = load_handler('v1-lp/src/recommendations/recommendation-app.py', learning_env)
+    for name, event in load_events('v1-lp/test-recommendation-events.json'):
+        invoke(recommendations, name, event, args.verbose, failures)
+
+    print('== v1-lp/src/bedrock-recommendations/bedrock-recommendation-app.py')
+    bedrock_app = load_handler('v1-lp/src/bedrock-recommendations/bedrock-recommendation-app.py', learning_env, dynamodb, bedrock, lambda_client=lambda_client)
+    generated = {}
+    for name, event in load_events('v1-lp/test-bedrock-recommendation-events.json'):
+        generated = invoke(bedrock_app, name, event, args.verbose, failures)
+        # The same skill gap again should be served from cache
+        invoke(bedrock_app, name + ' (repeat)', event, args.verbose, failures)
+    listed = invoke(bedrock_app, 'list', {'operation': 'list'}, args.verbose, failures)
+    if not listed.get('Learning-Paths'):
+        failures.append('list')
+
+    # The same gap twice for one employee (the second from cache) saves two records holding the same
+    # LearningPathIds; each delete removes one record and the id stays deletable until none holds it
+    gap = {'Employee': 'Sam Lee', 'Skill': 'Terraform', 'Current': 'Beginner', 'Target': 'Intermediate'}
+    shared = [invoke(bedrock_app, f'generate shared paths ({n})', gap, args.verbose, failures) for n in (1, 2)]
+    learning_path_id = bedrock_app.derive_learning_path_id(gap['Employee'], (shared[0].get('recommendations') or [{}])[0])
+    delete = {'operation': 'delete', 'LearningPathId': learning_path_id}
+    for n in (1, 2):
+        invoke(bedrock_app, f'delete by LearningPathId ({n}/2)', delete, args.verbose, failures)
+    invoke(bedrock_app, 'expect-error delete by LearningPathId (none left)', delete, args.verbose, failures)
+    if bedrock_app.lookup_recommendation_ids(learning_path_id):
+        print('FAIL     index entry left behind after deleting every record holding it')
+        failures.append('learning path index')
+
+    # A failure after the put (here indexing) still returns the id the record was stored under
+    index_learning_paths = bedrock_app.index_learning_paths
+    def failing_index(*args):
+        raise RuntimeError('index unavailable')
+    bedrock_app.index_learning_paths = failing_index
+    try:
+        saved_id = bedrock_app.save_recommendations_to_db('Sam Lee', 'Go', 'Beginner', 'Advanced', [{'name': 'Go Basics', 'source': 'Udemy'}])
+    finally:
+        bedrock_app.index_learning_paths = index_learning_paths
+    stored = dynamodb.Table(learning_env['RECOMMENDATIONS_TABLE']).get_item(Key={'RecommendationId': saved_id}).get('Item')
+    print(f"{'ok  ' if stored else 'FAIL'}     save with failed indexing returned {'the stored' if stored else 'an unknown'} id")
+    if not stored:
+        failures.append('save with failed indexing')
+
+    # Stops reading a recorded stream once enough recommendations are complete
+    recorded = LocalBedrock(chunks=RECORDED_STREAM)
+    streamed = bedrock_app.read_recommendation_stream(recorded.invoke_model_with_response_stream(modelId='recorded', body='{}')['body'])
+    ok = ([rec['name'] for rec in streamed] == ['Arrays [and] {maps}', 'Say "hi]"', 'C', 'D', 'E']
+          and recorded.chunks_sent < len(recorded.chunks))
+    print(f"{'ok  ' if ok else 'FAIL'}     streamed {len(streamed)} recommendation(s) from {recorded.chunks_sent}/{len(recorded.chunks)} recorded chunk(s)")
+    if not ok:
+        failures.append('recorded stream')
+
+    calls = bedrock.calls
+    batch = invoke(bedrock_app, 'batch_generate', {'operation': 'batch_generate', 'Employee': 'Jane Roe', 'items': [
+        {'Skill': 'Kubernetes', 'Current': 'Beginner', 'Target': 'Intermediate'},
+        {'Skill': 'SQL', 'Current': 'Basic', 'Target': 'Advanced'},
+        {'Skill': 'Kubernetes', 'Current': 'Intermediate', 'Target': 'Advanced'},
+        {'Skill': 'SQL', 'Current': 'Basic', 'Target': 'Advanced', 'Employee': 'John Doe'}]}, args.verbose, failures)
+    # Three distinct gaps, Kubernetes twice, so two prompts; the repeated SQL gap is answered once
+    ok = len(batch.get('results', [])) == 4 and bedrock.calls - calls == 2
+    print(f"{'ok  ' if ok else 'FAIL'}     {len(batch.get('results', []))} gap(s) saved from {bedrock.calls - calls} Bedrock call(s)")
+    if not ok:
+        failures.append('batch prompts')
+
+    # Bedrock slower than the request's budget: each call gives up at its deadline, and once the
+    # breaker has seen enough failures the remaining requests get the catalog without waiting
+    bedrock_app.use_bedrock(LocalBedrock(latency=0.3))
+    timings = []
+    for skill in ['Go', 'Rust', 'Scala', 'Kotlin', 'Swift', 'Ruby', 'Perl']:
+        start = time.monotonic()
+        response = bedrock_app.lambda_handler({'Employee': 'Jane Roe', 'Skill': skill, 'Current': 'Beginner', 'Target': 'Advanced'},
+                                              LambdaContext(timeout_seconds=3.1))
+        timings.append((json.loads(response['body']).get('cache'), round((time.monotonic() - start) * 1000)))
+    state = bedrock_app.breaker.snapshot()['state']
+    ok = all(cache == 'fallback' for cache, _ in timings) and state == 'open' and timings[-1][1] < 50
+    print(f"{'ok  ' if ok else 'FAIL'}     slow Bedrock: breaker {state}, request ms {[ms for _, ms in timings]}")
+    if not ok:
+        failures.append('circuit breaker')
+
+    # A call given up on keeps its worker until it really ends. Streamed replies are closed at the deadline,
+    # so their workers come back at once; unclosable calls hold them, and once all are held requests are refused.
+    def free_workers():
+        time.sleep(0.05)
+        held = [bedrock_app.bedrock_slots.acquire(blocking=False) for _ in range(bedrock_app.BEDROCK_WORKERS)]
+        for acquired in held:
+            if acquired:
+                bedrock_app.bedrock_slots.release()
+        return sum(held)
+    streaming = bedrock_app.BEDROCK_STREAMING
+    bedrock_app.breaker = bedrock_app.CircuitBreaker(min_calls=100)
+    outcomes = []
+    for streamed in (True, False):
+        bedrock_app.BEDROCK_STREAMING = streamed
+        bedrock_app.use_bedrock(LocalBedrock(latency=1.0))
+        for skill in ['Go', 'Rust', 'Scala', 'Kotlin', 'Swift']:
+            response = bedrock_app.lambda_handler({'Employee': 'Jane Roe', 'Skill': skill + str(streamed), 'Current': 'Beginner', 'Target': 'Advanced'},
+                                                  LambdaContext(timeout_seconds=3.05))
+        outcomes.append(free_workers())
+    time.sleep(1.0)
+    outcomes.append(free_workers())
+    bedrock_app.BEDROCK_STREAMING = streaming
+    ok = outcomes == [bedrock_app.BEDROCK_WORKERS, 0, bedrock_app.BEDROCK_WORKERS]
+    print(f"{'ok  ' if ok else 'FAIL'}     free Bedrock workers after timeouts: streamed {outcomes[0]}, unclosable {outcomes[1]}, "
+          f"once those end {outcomes[2]}")
+    if not ok:
+        failures.append('abandoned calls')
+    bedrock_app.breaker = bedrock_app.CircuitBreaker()
+    bedrock_app.use_bedrock(bedrock)
+
+    print('== bulk-recommendations.py')
+    bulk = load_handler('bulk-recommendations.py')
+    throttling = LocalBedrock(throttle_every=3)
+    bedrock_app.use_bedrock(throttling)
+    assessments = bulk.read_assessments(dynamodb.Table(skills_env['TABLE_NAME']))
+    versions = dynamodb.Table(learning_env['TABLE_VERSIONS_TABLE'])
+    version_writes = versions.stats['writes']
+    result = bulk.run_bulk(bedrock_app, assessments, concurrency=4, rate=1000, refresh=True, base_delay=0.001)
+    bedrock_app.use_bedrock(bedrock)
+    # One table version bump for the whole run, not one per saved record
+    ok = (result.get('saved') == result['assessments'] == len(assessments) and result.get('throttled') == throttling.throttled > 0
+          and versions.stats['writes'] - version_writes == 1)
+    print(f"{'ok  ' if ok else 'FAIL'}     {result.get('saved', 0)}/{len(assessments)} assessment(s) from {result['gaps']} gap(s), "
+          f"{result.get('throttled', 0)} throttled call(s) retried")
+    if not ok:
+        failures.append('bulk generation')
+
+    print('== v1-lp/src/get-recommendations/get-recommendations-app.py')
+    get_recommendations = load_handler('v1-lp/src/get-recommendations/get-recommendations-app.py', learning_env, dynamodb)
+    if generated.get('recommendation_id'):
+        invoke(get_recommendations, 'get saved', {'httpMethod': 'GET', 'pathParameters': {'id': generated['recommendation_id']}}, args.verbose, failures)
+    invoke(get_recommendations, 'expect-error missing id', {'httpMethod': 'GET', 'pathParameters': {'id': 'missing'}}, args.verbose, failures)
+    job = invoke(bedrock_app, 'job mode', {'httpMethod': 'POST', 'body': json.dumps({
+        'mode': 'job', 'Employee': 'Jane Roe', 'Skill': 'AWS', 'Current': 'Basic', 'Target': 'Advanced'})}, args.verbose, failures)
+    poll = {'httpMethod': 'GET', 'pathParameters': {'id': job.get('recommendation_id', 'missing')}}
+    invoke(get_recommendations, 'poll pending job', poll, args.verbose, failures)
+    if lambda_client.drain(bedrock_app.lambda_handler):
+        failures.append('job worker')
+    if invoke(get_recommendations, 'poll finished job', poll, args.verbose, failures).get('Status') != 'complete':
+        failures.append('job result')
+    # A job whose worker invocation cannot be started is marked failed instead of staying pending
+    lambda_client.fail_every = 1
+    undispatched = invoke(bedrock_app, 'expect-error job dispatch fails', {'httpMethod': 'POST', 'body': json.dumps({
+        'mode': 'job', 'Employee': 'Jane Roe', 'Skill': 'AWS', 'Current': 'Basic', 'Target': 'Advanced'})}, args.verbose, failures)
+    lambda_client.fail_every = 0
+    poll = {'httpMethod': 'GET', 'pathParameters': {'id': undispatched.get('recommendation_id', 'missing')}}
+    if invoke(get_recommendations, 'poll undispatched job', poll, args.verbose, failures).get('Status') != 'failed':
+        failures.append('job dispatch failure')
+
+    print(f"\n{bedrock.calls} Bedrock call(s); DynamoDB writes: " + ', '.join(f"{name}={table.stats['writes']}" for name, table in dynamodb.tables.items()))
+    if failures:
+        raise SystemExit(f'{len(failures)} event(s) failed: {failures}')
+
+if __name__ == '__main__':
+    main()
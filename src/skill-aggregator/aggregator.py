@@ -0,0 +1,89 @@
+import os
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeDeserializer
+import aws_clients
+import structured_logging as log
+from skill_aggregates import AGGREGATE_SCOPE, assessment_buckets, bucket_deltas
+
+deserializer = TypeDeserializer()
+
+def use_dynamodb(resource):
+    """Point the handler at a DynamoDB resource - boto3's, or an in-memory one for offline runs"""
+    global dynamodb, aggregates_table
+    dynamodb = resource
+    aggregates_table = resource.Table(os.environ['AGGREGATES_TABLE'])
+
+use_dynamodb(aws_clients.resource('dynamodb'))
+
+def record_images(record):
+    """(old_item, new_item) of a stream record; either is None for inserts and removes"""
+    images = record.get('dynamodb', {})
+    old_image = images.get('OldImage')
+    new_image = images.get('NewImage')
+    return (
+        {name: deserializer.deserialize(value) for name, value in old_image.items()} if old_image else None,
+        {name: deserializer.deserialize(value) for name, value in new_image.items()} if new_image else None
+    )
+
+def apply_deltas(deltas):
+    """Atomically add each delta to its bucket counter"""
+    for bucket, delta in sorted(deltas.items()):
+        aggregates_table.update_item(
+            Key={'Scope': AGGREGATE_SCOPE, 'Bucket': bucket},
+            UpdateExpression='ADD Assessments :delta',
+            ExpressionAttributeValues={':delta': delta}
+        )
+
+def rebuild_aggregates():
+    """Recount every bucket from a full scan of the assessments table; returns the number of assessments.
+
+    Streams deliver at least once, so a retried batch can count twice; run this to
+    repair the counters, and once after enabling the stream on an existing table.
+    Writes made while it runs can be counted twice or missed, so run it when
+    traffic is quiet.
+    """
+    source = dynamodb.Table(os.environ['TABLE_NAME'])
+    counts = {}
+    scanned = 0
+    scan_kwargs = {}
+    while True:
+        response = source.scan(**scan_kwargs)
+        for item in response['Items']:
+            scanned += 1
+            for bucket in assessment_buckets(item):
+                counts[bucket] = counts.get(bucket, 0) + 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    existing = []
+    query_kwargs = {'KeyConditionExpression': Key('Scope').eq(AGGREGATE_SCOPE)}
+    while True:
+        response = aggregates_table.query(**query_kwargs)
+        existing.extend(item['Bucket'] for item in response['Items'])
+        if 'LastEvaluatedKey' not in response:
+            break
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    with aggregates_table.batch_writer() as batch:
+        for bucket, count in counts.items():
+            batch.put_item(Item={'Scope': AGGREGATE_SCOPE, 'Bucket': bucket, 'Assessments': count})
+        for bucket in set(existing) - set(counts):
+            batch.delete_item(Key={'Scope': AGGREGATE_SCOPE, 'Bucket': bucket})
+    return scanned
+
+def lambda_handler(event, context):
+    log.start_request('skill-aggregator', context)
+    if event.get('operation') == 'rebuild':
+        log.set_operation('rebuild')
+        assessments = rebuild_aggregates()
+        log.info('aggregates rebuilt', assessments=assessments)
+        return {'assessments': assessments}
+
+    log.set_operation('stream')
+    records = event.get('Records', [])
+    # Net the whole batch first so a burst of edits costs one update per bucket touched
+    deltas = bucket_deltas(record_images(record) for record in records)
+    apply_deltas(deltas)
+    log.info('aggregates updated', records=len(records), buckets=len(deltas))
+    return {'records': len(records), 'buckets': len(deltas)}
@@ -0,0 +1,426 @@
+import json
+import os
+import base64
+import time
+from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+import aws_clients
+import structured_logging as log
+from field_projection import parse_fields, projection
+from http_compression import json_response
+from lambda_http import make_cors_headers, decimal_default, parse_body, api_response, error_response
+from skill_aggregates import AGGREGATE_SCOPE, stats_from_buckets
+
+MAX_PAGE_SIZE = 1000
+EMPLOYEE_SKILL_INDEX = 'EmployeeSkillIndex'
+SKILL_CURRENT_INDEX = 'SkillCurrentIndex'
+BATCH_WRITE_SIZE = 25
+MAX_BATCH_ITEMS = 500
+MAX_BATCH_RETRIES = 5
+ASSESSMENT_FIELDS = ('Employee', 'Skill', 'Current', 'Target')
+# Table and GSI key attributes; DynamoDB rejects a whole batch if one of them is not a non-empty string
+KEY_FIELDS = ('SkillAssessmentId', 'Employee', 'Skill', 'Current')
+# Learning paths are generated by a consumer of these events (v1-lp); unset disables publishing
+EVENT_BUS = os.environ.get('ASSESSMENT_EVENT_BUS')
+EVENT_SOURCE = 'skills-assessment'
+EVENT_DETAIL_TYPE = 'AssessmentSaved'
+PUT_EVENTS_SIZE = 10
+BATCH_GET_SIZE = 100
+# The gap learning paths are generated from; updates publish only when Skill or Target changes
+GAP_FIELDS = ('Skill', 'Current', 'Target')
+# How long a container trusts its view of which GSIs are ACTIVE
+INDEX_STATUS_TTL_SECONDS = 60
+# Columns of the frontend grid - the default list projection
+LIST_FIELDS = ('SkillAssessmentId',) + ASSESSMENT_FIELDS
+
+# Cursors carry each key value with its DynamoDB type, so numbers come back as Decimal rather than float
+serializer = TypeSerializer()
+deserializer = TypeDeserializer()
+
+def encode_cursor(last_evaluated_key):
+    """Turn a DynamoDB LastEvaluatedKey into an opaque, URL-safe cursor"""
+    if not last_evaluated_key:
+        return None
+    typed = {name: serializer.serialize(value) for name, value in last_evaluated_key.items()}
+    raw = json.dumps(typed, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    """Turn a cursor from encode_cursor back into an ExclusiveStartKey"""
+    try:
+        typed = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        if not isinstance(typed, dict) or not typed:
+            raise ValueError(cursor)
+        return {name: deserializer.deserialize(value) for name, value in typed.items()}
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+def parse_limit(limit):
+    """Validate the requested page size and clamp it to MAX_PAGE_SIZE"""
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError('limit must be a positive integer')
+    if limit < 1:
+        raise ValueError('limit must be a positive integer')
+    return min(limit, MAX_PAGE_SIZE)
+
+def active_indexes():
+    """Names of the table's ACTIVE GSIs; a missing or still-backfilling index is left out"""
+    now = time.monotonic()
+    if now - index_status['checked'] >= INDEX_STATUS_TTL_SECONDS:
+        try:
+            # DescribeTable, at most once per INDEX_STATUS_TTL_SECONDS per container
+            table.reload()
+            index_status['active'] = frozenset(index['IndexName'] for index in table.global_secondary_indexes or []
+                                               if index.get('IndexStatus') == 'ACTIVE')
+        except Exception as e:
+            log.warning('reading index status failed', error=str(e))
+        index_status['checked'] = now
+    return index_status['active']
+
+def build_list_query(body):
+    """Pick the GSI query that serves the list filters in `body`, a filtered scan while that
+    index is not ACTIVE yet, or None to scan everything"""
+    employee = body.get('Employee')
+    skill = body.get('Skill')
+    current = body.get('Current')
+    if employee:
+        index_name, filters = EMPLOYEE_SKILL_INDEX, [('Employee', employee), ('Skill', skill)]
+    elif skill:
+        index_name, filters = SKILL_CURRENT_INDEX, [('Skill', skill), ('Current', current)]
+    elif current:
+        raise ValueError('Current filter requires Skill')
+    else:
+        return None
+    filters = [(name, value) for name, value in filters if value]
+    indexed = index_name in active_indexes()
+    condition = None
+    for name, value in filters:
+        term = Key(name).eq(value) if indexed else Attr(name).eq(value)
+        condition = term if condition is None else condition & term
+    if indexed:
+        return {'IndexName': index_name, 'KeyConditionExpression': condition}
+    log.warning('index not active, scanning', index=index_name)
+    return {'FilterExpression': condition}
+
+def read_items(query_kwargs, **kwargs):
+    """Query the GSI described by `query_kwargs`, or scan the table (with its FilterExpression, if any)"""
+    if query_kwargs and 'IndexName' in query_kwargs:
+        return table.query(**query_kwargs, **kwargs)
+    return table.scan(**(query_kwargs or {}), **kwargs)
+
+def read_page(query_kwargs, limit, cursor=None, **read_kwargs):
+    """Read a single page of at most `limit` items starting after `cursor`"""
+    page_kwargs = dict(read_kwargs, Limit=limit)
+    if cursor:
+        page_kwargs['ExclusiveStartKey'] = decode_cursor(cursor)
+    response = read_items(query_kwargs, **page_kwargs)
+    return response['Items'], encode_cursor(response.get('LastEvaluatedKey'))
+
+def read_all(query_kwargs, **read_kwargs):
+    """Read every matching item, following LastEvaluatedKey past the 1 MB page limit"""
+    response = read_items(query_kwargs, **read_kwargs)
+    items = response['Items']
+    while 'LastEvaluatedKey' in response:
+        response = read_items(query_kwargs, ExclusiveStartKey=response['LastEvaluatedKey'], **read_kwargs)
+        items.extend(response['Items'])
+    return items
+
+def build_assessment_item(data, skill_id):
+    """Build the stored item for an assessment, raising KeyError on missing fields"""
+    item = {'SkillAssessmentId': skill_id}
+    for field in ASSESSMENT_FIELDS:
+        item[field] = data[field]
+    return item
+
+def check_key_fields(item):
+    """Raise ValueError unless the key attributes present in `item` are non-empty strings"""
+    for field in KEY_FIELDS:
+        if field in item and (not isinstance(item[field], str) or not item[field]):
+            raise ValueError(f'{field} must be a non-empty string')
+
+def batch_write(requests):
+    """Write (key, request) pairs in chunks of 25, retrying UnprocessedItems with backoff.
+
+    Returns {key: error} for the writes DynamoDB never accepted. A chunk that
+    DynamoDB rejects outright fails on its own; the other chunks still go out.
+    """
+    failed = {}
+    for start in range(0, len(requests), BATCH_WRITE_SIZE):
+        chunk = requests[start:start + BATCH_WRITE_SIZE]
+        pending = [request for _, request in chunk]
+        try:
+            for attempt in range(MAX_BATCH_RETRIES + 1):
+                response = dynamodb.batch_write_item(RequestItems={table.name: pending})
+                pending = response.get('UnprocessedItems', {}).get(table.name, [])
+                if not pending or attempt == MAX_BATCH_RETRIES:
+                    break
+                time.sleep(min(0.05 * (2 ** attempt), 1.0))
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            log.warning('batch write rejected', error=str(e), code=code, count=len(pending))
+            for request in pending:
+                key = request.get('PutRequest', {}).get('Item') or request.get('DeleteRequest', {}).get('Key')
+                failed[key['SkillAssessmentId']] = f'Write rejected ({code}), retry this item'
+            continue
+        for request in pending:
+            key = request.get('PutRequest', {}).get('Item') or request.get('DeleteRequest', {}).get('Key')
+            failed[key['SkillAssessmentId']] = 'Write throttled, retry this item'
+    return failed
+
+def batch_operation(operation, entries):
+    """Validate `entries`, batch-write the valid ones and return one result per entry"""
+    import uuid
+    results = []
+    requests = []
+    seen = set()
+    for index, entry in enumerate(entries):
+        result = {'index': index}
+        results.append(result)
+        try:
+            if not isinstance(entry, dict):
+                # batch_delete also accepts bare ids
+                if operation != 'batch_delete':
+                    raise ValueError('Item must be an object')
+                entry = {'SkillAssessmentId': entry}
+            if operation == 'batch_create':
+                skill_id = entry.get('SkillAssessmentId') or str(uuid.uuid4())
+            else:
+                skill_id = entry['SkillAssessmentId']
+            result['SkillAssessmentId'] = skill_id
+            # Checked before the duplicate check, which needs a hashable id
+            check_key_fields({'SkillAssessmentId': skill_id})
+            if skill_id in seen:
+                raise ValueError('Duplicate SkillAssessmentId in batch')
+            if operation == 'batch_delete':
+                request = {'DeleteRequest': {'Key': {'SkillAssessmentId': skill_id}}}
+            else:
+                item = build_assessment_item(entry, skill_id)
+                check_key_fields(item)
+                request = {'PutRequest': {'Item': item}}
+        except KeyError as e:
+            result.update({'status': 'error', 'error': f'Missing field: {e.args[0]}'})
+            continue
+        except ValueError as e:
+            result.update({'status': 'error', 'error': str(e)})
+            continue
+        seen.add(skill_id)
+        requests.append((skill_id, request))
+
+    failed = batch_write(requests)
+    message = {'batch_create': 'Created', 'batch_update': 'Updated', 'batch_delete': 'Deleted'}[operation]
+    for result in results:
+        if 'status' in result:
+            continue
+        if result['SkillAssessmentId'] in failed:
+            result.update({'status': 'error', 'error': failed[result['SkillAssessmentId']]})
+        else:
+            result['status'] = message
+    return results
+
+def read_stats():
+    """Read the stream-maintained skill-gap counters in one query"""
+    aggregates_table = dynamodb.Table(os.environ['AGGREGATES_TABLE'])
+    response = aggregates_table.query(KeyConditionExpression=Key('Scope').eq(AGGREGATE_SCOPE))
+    items = response['Items']
+    while 'LastEvaluatedKey' in response:
+        response = aggregates_table.query(KeyConditionExpression=Key('Scope').eq(AGGREGATE_SCOPE),
+                                          ExclusiveStartKey=response['LastEvaluatedKey'])
+        items.extend(response['Items'])
+    return stats_from_buckets(items)
+
+def read_gaps(skill_ids):
+    """Stored Skill/Current/Target of the assessments in skill_ids, keyed by id; missing ids are left out"""
+    gaps = {}
+    skill_ids = list(dict.fromkeys(skill_ids))
+    for start in range(0, len(skill_ids), BATCH_GET_SIZE):
+        request = dict(projection(('SkillAssessmentId',) + GAP_FIELDS),
+                       Keys=[{'SkillAssessmentId': skill_id} for skill_id in skill_ids[start:start + BATCH_GET_SIZE]])
+        for attempt in range(MAX_BATCH_RETRIES + 1):
+            response = dynamodb.batch_get_item(RequestItems={table.name: request})
+            for item in response.get('Responses', {}).get(table.name, []):
+                gaps[item['SkillAssessmentId']] = item
+            unprocessed = response.get('UnprocessedKeys', {}).get(table.name)
+            if not unprocessed:
+                break
+            if attempt == MAX_BATCH_RETRIES:
+                raise RuntimeError(f"{len(unprocessed['Keys'])} assessment(s) could not be read")
+            request = unprocessed
+            time.sleep(min(0.05 * (2 ** attempt), 1.0))
+    return gaps
+
+def gap_changed(previous, item):
+    """Whether saving item over previous (None for a new assessment) changes the learning paths it needs"""
+    return previous is None or any(previous.get(field) != item.get(field) for field in ('Skill', 'Target'))
+
+def publish_assessments(operation, items, previous=None):
+    """Publish an AssessmentSaved event per written assessment; returns how many were not accepted.
+
+    `previous` maps ids of updated assessments to their old gap, sent as the
+    event's Previous so the consumer can drop the paths it superseded. The
+    assessment is already stored, so a failed publish is logged rather than
+    failing the request.
+    """
+    if not EVENT_BUS or not items:
+        return 0
+    previous = previous or {}
+    failed = 0
+    for start in range(0, len(items), PUT_EVENTS_SIZE):
+        entries = []
+        for item in items[start:start + PUT_EVENTS_SIZE]:
+            detail = dict(build_assessment_item(item, item['SkillAssessmentId']), operation=operation)
+            if item['SkillAssessmentId'] in previous:
+                old = previous[item['SkillAssessmentId']]
+                detail['Previous'] = {field: old.get(field, '') for field in GAP_FIELDS}
+            entries.append({
+                'EventBusName': EVENT_BUS,
+                'Source': EVENT_SOURCE,
+                'DetailType': EVENT_DETAIL_TYPE,
+                'Detail': json.dumps(detail, default=decimal_default)
+            })
+        try:
+            failed += events.put_events(Entries=entries).get('FailedEntryCount', 0)
+        except Exception as e:
+            log.error('publishing assessment events failed', error=str(e), count=len(entries))
+            failed += len(entries)
+    if failed:
+        log.warning('assessment events not published', failed=failed)
+    return failed
+
+def use_events(client):
+    """Point event publishing at an EventBridge client - boto3's, or an in-memory bus for offline runs"""
+    global events
+    events = client
+
+def use_dynamodb(resource):
+    """Point the handler at a DynamoDB resource - boto3's, or an in-memory one for offline runs"""
+    global dynamodb, table, index_status
+    dynamodb = resource
+    table = resource.Table(os.environ['TABLE_NAME'])
+    index_status = {'checked': float('-inf'), 'active': frozenset()}
+
+use_dynamodb(aws_clients.resource('dynamodb'))
+use_events(aws_clients.client('events'))
+
+def lambda_handler(event, context):
+    # CORS headers for all responses
+    cors_headers = make_cors_headers()
+    
+    if event.get('httpMethod') == 'OPTIONS':
+        return api_response(200, cors_headers)
+    
+    log.start_request('skills-assessment', context)
+    try:
+        # Handle both direct Lambda invocation and API Gateway formats
+        body = parse_body(event)
+        
+        # Check if operation is in the body
+        operation = body.get('operation')
+        
+        log.set_operation(operation)
+        log.log_request(event)
+        log.debug_payload('parsed body', body)
+        
+        if operation == 'list':
+            limit = body.get('limit')
+            cursor = body.get('cursor')
+            next_cursor = None
+            try:
+                # Only the requested attributes are read; the default is the grid's columns
+                fields = parse_fields(body.get('fields'), LIST_FIELDS)
+                # Employee/Skill/Current filters are served by a GSI query instead of a scan
+                query_kwargs = build_list_query(body)
+                if limit is not None or cursor:
+                    # Paged mode - one bounded read per request
+                    items, next_cursor = read_page(query_kwargs, parse_limit(limit if limit is not None else MAX_PAGE_SIZE), cursor,
+                                                   **projection(fields))
+                else:
+                    # Legacy clients expect every match in one response
+                    items = read_all(query_kwargs, **projection(fields))
+            except ValueError as e:
+                return error_response(400, cors_headers, str(e))
+            log.info('list', count=len(items), paged=limit is not None or bool(cursor), indexed='IndexName' in (query_kwargs or {}))
+            if log.debug_enabled():
+                log.debug('list items', items=items)
+            
+            # Transform data to ensure consistent field names for frontend
+            transformed_items = []
+            for item in items:
+                transformed_items.append({name: item.get(name, '') for name in fields})
+            
+            result = {'Skill-Assessments': transformed_items}
+            if limit is not None or cursor:
+                result['nextCursor'] = next_cursor
+            return json_response(event, 200, cors_headers, result, default=decimal_default)
+        
+        elif operation == 'read':
+            try:
+                fields = parse_fields(body.get('fields'))
+            except ValueError as e:
+                return error_response(400, cors_headers, str(e))
+            response = table.get_item(Key={'SkillAssessmentId': body['SkillAssessmentId']}, **projection(fields))
+            return api_response(200, cors_headers, response.get('Item', {}))
+        
+        elif operation == 'create':
+            import uuid
+            skill_id = body.get('SkillAssessmentId', str(uuid.uuid4()))
+            item = build_assessment_item(body, skill_id)
+            table.put_item(Item=item)
+            publish_assessments('create', [item])
+            return api_response(200, cors_headers, {'message': 'Created', 'SkillAssessmentId': skill_id})
+        
+        elif operation == 'update':
+            item = build_assessment_item(body, body['SkillAssessmentId'])
+            old_item = table.put_item(Item=item, ReturnValues='ALL_OLD').get('Attributes')
+            if gap_changed(old_item, item):
+                publish_assessments('update', [item], {item['SkillAssessmentId']: old_item} if old_item else None)
+            return api_response(200, cors_headers, {'message': 'Updated'})
+        
+        elif operation == 'delete':
+            table.delete_item(Key={'SkillAssessmentId': body['SkillAssessmentId']})
+            return api_response(200, cors_headers, {'message': 'Deleted'})
+        
+        elif operation in ('batch_create', 'batch_update', 'batch_delete'):
+            entries = body.get('items')
+            if not isinstance(entries, list) or not entries:
+                return error_response(400, cors_headers, 'items must be a non-empty array')
+            if len(entries) > MAX_BATCH_ITEMS:
+                return error_response(400, cors_headers, f'At most {MAX_BATCH_ITEMS} items per batch')
+            
+            previous = {}
+            if operation == 'batch_update' and EVENT_BUS:
+                # batch_write_item returns no old images, so read the gaps being replaced first
+                previous = read_gaps(entry['SkillAssessmentId'] for entry in entries
+                                     if isinstance(entry, dict) and isinstance(entry.get('SkillAssessmentId'), str)
+                                     and entry['SkillAssessmentId'])
+            results = batch_operation(operation, entries)
+            failed = sum(1 for result in results if result['status'] == 'error')
+            if operation != 'batch_delete':
+                saved = [dict(entries[result['index']], SkillAssessmentId=result['SkillAssessmentId'])
+                         for result in results if result['status'] != 'error']
+                publish_assessments(operation[len('batch_'):], [
+                    item for item in saved if gap_changed(previous.get(item['SkillAssessmentId']), item)
+                ], previous)
+            log.info('batch write', count=len(results), failed=failed)
+            return api_response(200, cors_headers, {
+                'results': results,
+                'succeeded': len(results) - failed,
+                'failed': failed
+            })
+        
+        elif operation == 'stats':
+            if not os.environ.get('AGGREGATES_TABLE'):
+                return error_response(500, cors_headers, 'AGGREGATES_TABLE environment variable not set')
+            stats = read_stats()
+            log.info('stats', total=stats['total'])
+            return api_response(200, cors_headers, stats)
+        
+        else:
+            return error_response(400, cors_headers, 'Missing operation')
+    
+    except Exception as e:
+        log.error('Error processing request', error=str(e), error_type=type(e).__name__)
+        log.debug_payload('failed event', event)
+        return error_response(500, cors_headers, str(e))
\ No newline at end of file
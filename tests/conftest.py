@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The handlers import layer modules by bare name, as they do on Lambda
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in (REPO_ROOT, os.path.join(REPO_ROOT, 'layers', 'common', 'python'),
+                  os.path.join(REPO_ROOT, 'v1-lp', 'src', 'bedrock-recommendations')):
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
@@ -0,0 +1,46 @@
+import pytest
+
+from local_harness import load_handler
+
+@pytest.fixture(scope='module')
+def bulk():
+    return load_handler('bulk-recommendations.py')
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+def test_token_bucket_bursts_to_capacity(bulk):
+    time = FakeTime()
+    bucket = bulk.TokenBucket(rate=2, capacity=3, clock=time.clock, sleep=time.sleep)
+    for _ in range(3):
+        bucket.acquire()
+    assert time.slept == []
+
+def test_token_bucket_waits_for_the_next_token(bulk):
+    time = FakeTime()
+    bucket = bulk.TokenBucket(rate=2, capacity=1, clock=time.clock, sleep=time.sleep)
+    bucket.acquire()
+    bucket.acquire()
+    assert time.slept == [pytest.approx(0.5)]
+    assert time.now == pytest.approx(0.5)
+
+def test_token_bucket_refills_at_the_rate_up_to_capacity(bulk):
+    time = FakeTime()
+    bucket = bulk.TokenBucket(rate=4, capacity=2, clock=time.clock, sleep=time.sleep)
+    bucket.acquire()
+    bucket.acquire()
+    time.now += 10
+    for _ in range(2):
+        bucket.acquire()
+    assert time.slept == []
+    bucket.acquire()
+    assert time.slept == [pytest.approx(0.25)]
@@ -0,0 +1,88 @@
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def make_breaker(**kwargs):
+    clock = Clock()
+    options = dict(failure_rate=0.5, min_calls=4, window_seconds=60, open_seconds=30, slow_call_ms=1000, clock=clock)
+    options.update(kwargs)
+    return CircuitBreaker(**options), clock
+
+def test_stays_closed_below_min_calls():
+    breaker, _ = make_breaker()
+    for _ in range(3):
+        assert breaker.record(False, 10) == CLOSED
+    assert breaker.allow()
+
+def test_opens_at_the_failure_rate():
+    breaker, _ = make_breaker()
+    breaker.record(True, 10)
+    breaker.record(True, 10)
+    breaker.record(False, 10)
+    assert breaker.record(False, 10) == OPEN
+    assert not breaker.allow()
+
+def test_slow_calls_count_as_failures():
+    breaker, _ = make_breaker()
+    for _ in range(4):
+        state = breaker.record(True, 1500)
+    assert state == OPEN
+
+def test_refusals_count_as_failures():
+    breaker, _ = make_breaker()
+    for _ in range(4):
+        state = breaker.record(False)
+    assert state == OPEN
+    assert breaker.snapshot()['p50_ms'] is None
+
+def test_half_open_allows_one_trial():
+    breaker, clock = make_breaker()
+    for _ in range(4):
+        breaker.record(False, 10)
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+def test_successful_trial_closes_with_a_fresh_window():
+    breaker, clock = make_breaker()
+    for _ in range(4):
+        breaker.record(False, 10)
+    clock.now += 30
+    assert breaker.allow()
+    assert breaker.record(True, 10) == CLOSED
+    assert breaker.snapshot()['calls'] == 0
+    assert breaker.record(False, 10) == CLOSED
+
+def test_failed_trial_reopens():
+    breaker, clock = make_breaker()
+    for _ in range(4):
+        breaker.record(False, 10)
+    clock.now += 30
+    assert breaker.allow()
+    assert breaker.record(False, 10) == OPEN
+    assert not breaker.allow()
+    clock.now += 30
+    assert breaker.allow()
+
+def test_old_calls_leave_the_window():
+    breaker, clock = make_breaker()
+    for _ in range(3):
+        breaker.record(False, 10)
+    clock.now += 61
+    assert breaker.record(False, 10) == CLOSED
+    assert breaker.snapshot()['calls'] == 1
+
+def test_snapshot():
+    breaker, _ = make_breaker(min_calls=100)
+    for latency in (10, 20, 30, 40):
+        breaker.record(latency != 40, latency)
+    snapshot = breaker.snapshot()
+    assert snapshot == {'state': CLOSED, 'calls': 4, 'failure_rate': 0.25, 'p50_ms': 20, 'p95_ms': 40, 'p99_ms': 40}
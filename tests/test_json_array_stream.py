@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from json_array_stream import JsonArrayParser, JsonObjectParser, parse_array
+from local_harness import RECORDED_STREAM
+
+def feed_all(parser, chunks):
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    return items
+
+def test_recorded_stream():
+    parser = JsonArrayParser()
+    items = feed_all(parser, RECORDED_STREAM)
+    assert [item['name'] for item in items] == ['Arrays [and] {maps}', 'Say "hi]"', 'C', 'D', 'E', 'F', 'G']
+    assert parser.done
+
+def test_elements_come_out_as_they_complete():
+    parser = JsonArrayParser()
+    assert parser.feed(RECORDED_STREAM[0]) == []
+    assert parser.feed(RECORDED_STREAM[1]) == [{'name': 'Arrays [and] {maps}', 'source': 'Udemy'}]
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7])
+def test_any_chunking_gives_the_same_elements(chunk_size):
+    text = ''.join(RECORDED_STREAM)
+    chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+    assert feed_all(JsonArrayParser(), chunks) == feed_all(JsonArrayParser(), [text])
+
+def test_escapes_inside_strings():
+    text = json.dumps([{'name': 'back\\slash ] "quoted" [x]', 'source': 'a\\'}, 'plain]'])
+    assert parse_array(text) == [{'name': 'back\\slash ] "quoted" [x]', 'source': 'a\\'}, 'plain]']
+
+def test_bracket_in_chatter_is_skipped():
+    assert parse_array('Use [optional] filters: [1, 2]') == [1, 2]
+
+def test_text_after_the_array_is_ignored():
+    parser = JsonArrayParser()
+    assert parser.feed('[1, [2, 3], {"a": [4]}] and [5]') == [1, [2, 3], {'a': [4]}]
+    assert parser.done
+    assert parser.feed('[6]') == []
+
+def test_truncated_stream_keeps_complete_elements():
+    text = ''.join(RECORDED_STREAM)
+    parser = JsonArrayParser()
+    items = parser.feed(text[:text.index('{"name": "C"') + 8])
+    assert [item['name'] for item in items] == ['Arrays [and] {maps}', 'Say "hi]"']
+    assert not parser.done
+
+def test_truncated_array_is_not_parsed():
+    with pytest.raises(ValueError):
+        parse_array('Here: [{"name": "A"}, {"name": "B"')
+
+def test_no_array():
+    with pytest.raises(ValueError):
+        parse_array('Sorry, I cannot help with that.')
+
+def test_bad_element_after_a_good_one_raises():
+    parser = JsonArrayParser()
+    with pytest.raises(ValueError):
+        parser.feed('[{"name": "A"}, {name: B}]')
+
+def test_object_members():
+    parser = JsonObjectParser()
+    chunks = ['Sure {not json} here: {"Py', 'thon": [{"name": "A"}], "S', 'QL": [{"name": "B [1]"}]', '} bye']
+    assert feed_all(parser, chunks) == [('Python', [{'name': 'A'}]), ('SQL', [{'name': 'B [1]'}])]
+    assert parser.done
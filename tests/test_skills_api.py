@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.types import TypeSerializer
+
+from local_harness import InMemoryDynamoDB, create_skills_tables, load_handler
+
+@pytest.fixture(scope='module')
+def skills():
+    dynamodb = InMemoryDynamoDB()
+    return load_handler('src/skills-api/app.py', create_skills_tables(dynamodb), dynamodb)
+
+def test_cursor_round_trip(skills):
+    key = {'SkillAssessmentId': 'a/b+c', 'Employee': 'Jane Roe', 'Score': Decimal('3.5')}
+    cursor = skills.encode_cursor(key)
+    assert set(cursor) <= set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_=')
+    decoded = skills.decode_cursor(cursor)
+    assert decoded == key
+    assert isinstance(decoded['Score'], Decimal)
+    # boto3 rejects floats, so a numeric key component must survive as a valid ExclusiveStartKey
+    serializer = TypeSerializer()
+    assert {name: serializer.serialize(value) for name, value in decoded.items()}['Score'] == {'N': '3.5'}
+
+def test_no_cursor_on_the_last_page(skills):
+    assert skills.encode_cursor(None) is None
+    assert skills.encode_cursor({}) is None
+
+# Not base64, not JSON, a list, an empty object, empty, and an untyped key
+@pytest.mark.parametrize('cursor', ['not base64!', 'bm90IGpzb24=', 'W10=', 'e30=', '', 'eyJTa2lsbEFzc2Vzc21lbnRJZCI6ICJ4In0='])
+def test_invalid_cursor(skills, cursor):
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        skills.decode_cursor(cursor)
+
+@pytest.mark.parametrize('limit, expected', [(1, 1), ('25', 25), (10 ** 6, 1000)])
+def test_parse_limit(skills, limit, expected):
+    assert skills.parse_limit(limit) == expected
+
+@pytest.mark.parametrize('limit', [0, -5, 'ten', None, '1.5'])
+def test_parse_limit_rejects(skills, limit):
+    with pytest.raises(ValueError, match='positive integer'):
+        skills.parse_limit(limit)
+
+def test_batch_reports_invalid_keys_per_item(skills):
+    gap = {'Employee': 'Jane Roe', 'Skill': 'Go', 'Current': 'Basic', 'Target': 'Advanced'}
+    results = skills.batch_operation('batch_create', [
+        dict(gap, SkillAssessmentId={'not': 'hashable'}),
+        dict(gap, Employee=''),
+        dict(gap, Current=3),
+        dict(gap, SkillAssessmentId='valid-1'),
+    ])
+    assert [result['status'] for result in results] == ['error', 'error', 'error', 'Created']
+    assert results[0]['error'] == 'SkillAssessmentId must be a non-empty string'
+    assert results[2]['error'] == 'Current must be a non-empty string'
+
+def test_batch_delete_rejects_non_string_ids(skills):
+    results = skills.batch_operation('batch_delete', [['a'], 7, 'valid-1'])
+    assert [result['status'] for result in results] == ['error', 'error', 'Deleted']
@@ -0,0 +1,44 @@
+import pytest
+
+import table_version
+from local_harness import InMemoryDynamoDB
+
+@pytest.fixture
+def dynamodb(monkeypatch):
+    monkeypatch.setattr(table_version, 'VERSIONS_TABLE', 'versions')
+    dynamodb = InMemoryDynamoDB()
+    dynamodb.create_table('versions', 'TableName')
+    return dynamodb
+
+def request(if_none_match=None, header='If-None-Match'):
+    return {'httpMethod': 'GET', 'headers': {header: if_none_match} if if_none_match else {}}
+
+def test_first_request_is_not_modified_only_with_a_match(dynamodb):
+    etag, not_modified = table_version.check_etag(request(), dynamodb, 'paths')
+    assert etag == 'W/"paths-0"'
+    assert not not_modified
+    assert table_version.check_etag(request(etag), dynamodb, 'paths') == (etag, True)
+
+def test_a_write_changes_the_etag(dynamodb):
+    etag, _ = table_version.check_etag(request(), dynamodb, 'paths')
+    table_version.bump_version(dynamodb, 'paths')
+    new_etag, not_modified = table_version.check_etag(request(etag), dynamodb, 'paths')
+    assert new_etag == 'W/"paths-1"'
+    assert not not_modified
+
+@pytest.mark.parametrize('if_none_match', ['"paths-0"', 'W/"other-3", W/"paths-0"', '*'])
+def test_matching_forms(dynamodb, if_none_match):
+    assert table_version.check_etag(request(if_none_match), dynamodb, 'paths')[1]
+
+def test_header_name_is_case_insensitive(dynamodb):
+    assert table_version.check_etag(request('W/"paths-0"', header='if-none-match'), dynamodb, 'paths')[1]
+
+def test_variants_get_their_own_etag(dynamodb):
+    etag, _ = table_version.check_etag(request(), dynamodb, 'paths', 'Name,Skill')
+    assert etag.startswith('W/"paths-0-')
+    assert not table_version.check_etag(request(etag), dynamodb, 'paths', 'Name')[1]
+    assert table_version.check_etag(request(etag), dynamodb, 'paths', 'Name,Skill')[1]
+
+def test_versioning_off(monkeypatch):
+    monkeypatch.setattr(table_version, 'VERSIONS_TABLE', None)
+    assert table_version.check_etag(request('*'), None, 'paths') == (None, False)
@@ -0,0 +1,1123 @@
+import json
+import math
+import uuid
+import os
+from datetime import datetime, timedelta
+from botocore.exceptions import ClientError
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import aws_clients
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+import structured_logging as log
+from http_compression import json_response
+from json_array_stream import JsonArrayParser, JsonObjectParser, parse_array
+from lambda_http import ALLOW_HEADERS, make_cors_headers, decimal_default, parse_body, api_response, error_response
+from lazy_imports import preload
+from table_version import bump_version, check_etag
+
+# Bump whenever the prompt or model changes so cached responses are not reused
+PROMPT_VERSION = 'titan-premier-v2'
+CACHE_TTL_SECONDS = int(os.environ.get('RECOMMENDATION_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+LOCAL_CACHE_SIZE = int(os.environ.get('LOCAL_CACHE_SIZE', '256'))
+LOCAL_CACHE_TTL_SECONDS = int(os.environ.get('LOCAL_CACHE_TTL_SECONDS', '900'))
+BEDROCK_MODEL_ID = 'amazon.titan-text-premier-v1:0'
+# Stream the model output and parse recommendations as they arrive
+BEDROCK_STREAMING = os.environ.get('BEDROCK_STREAMING', 'true').lower() == 'true'
+# The prompt asks for 3-5; stop reading the stream once this many are complete
+MAX_RECOMMENDATIONS = 5
+# batch_generate: skill gaps sent in one prompt, and the output tokens allowed per gap
+MAX_BATCH_ITEMS = 20
+MAX_GAPS_PER_PROMPT = 5
+BATCH_TOKENS_PER_GAP = 600
+# Longest a request waits for Bedrock (API Gateway gives up at 29 s), and the time kept back
+# from the Lambda deadline for saving and responding
+BEDROCK_BUDGET_SECONDS = float(os.environ.get('BEDROCK_BUDGET_SECONDS', '25'))
+DEADLINE_RESERVE_MS = 3000
+# A streamed reply stops this long before the deadline so the recommendations read so far are kept
+STREAM_GRACE_SECONDS = 1.0
+# Threads Bedrock calls with a deadline run on; a call the request gave up on keeps its thread until it ends
+BEDROCK_WORKERS = int(os.environ.get('BEDROCK_WORKERS', '4'))
+# Function that runs generation jobs (this one); defaults to the invoking function's name
+JOB_WORKER_FUNCTION = os.environ.get('JOB_WORKER_FUNCTION')
+JOB_PENDING, JOB_RUNNING, JOB_COMPLETE, JOB_FAILED = 'pending', 'running', 'complete', 'failed'
+
+class PartialRecommendations(list):
+    """Recommendations from a streamed reply that was stopped or ended before the array closed"""
+
+class LocalRecommendationCache:
+    """Bounded LRU with per-entry TTL, kept at module scope so warm containers reuse it"""
+    
+    def __init__(self, max_size, ttl_seconds):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self.entries[key]
+        self.misses += 1
+        return None
+    
+    def put(self, key, value):
+        if self.max_size <= 0:
+            return
+        self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+local_cache = LocalRecommendationCache(LOCAL_CACHE_SIZE, LOCAL_CACHE_TTL_SECONDS)
+# Per container: while Bedrock is failing or slow, requests go straight to the catalog
+breaker = CircuitBreaker(
+    open_seconds=int(os.environ.get('BREAKER_OPEN_SECONDS', '30')),
+    slow_call_ms=int(os.environ.get('BEDROCK_SLOW_CALL_MS', '15000'))
+)
+# Bedrock calls run here so a request can stop waiting at its deadline; a call that overruns has
+# its stream closed and its result dropped
+bedrock_executor = ThreadPoolExecutor(max_workers=BEDROCK_WORKERS)
+# Held from submit until the call really ends, so calls abandoned at their deadline still count
+bedrock_slots = threading.BoundedSemaphore(BEDROCK_WORKERS)
+# The BedrockCall running on this thread, if any
+bedrock_call_local = threading.local()
+
+class BedrockCall:
+    """Streams one call_bedrock call has opened, so they can be closed once its caller stops waiting"""
+    
+    def __init__(self):
+        self.streams = []
+        self.abandoned = False
+        self.lock = threading.Lock()
+    
+    def track(self, stream):
+        with self.lock:
+            self.streams.append(stream)
+            abandoned = self.abandoned
+        if abandoned:
+            close_stream(stream)
+        return stream
+    
+    def abandon(self):
+        with self.lock:
+            self.abandoned = True
+            streams = list(self.streams)
+        for stream in streams:
+            close_stream(stream)
+
+# The catalog is parsed on import and only cache keys and the fallback read it; LAZY_IMPORTS=false loads it during init
+preload('course_catalog')
+
+# Injected clients for offline runs; None means use the container's shared boto3 ones
+dynamodb_override = None
+bedrock_override = None
+lambda_override = None
+
+def use_dynamodb(resource):
+    """Point the handler at a DynamoDB resource - boto3's, or an in-memory one for offline runs"""
+    global dynamodb_override
+    dynamodb_override = resource
+
+def use_bedrock(client):
+    """Point the handler at a bedrock-runtime client - boto3's, or a local stand-in"""
+    global bedrock_override
+    bedrock_override = client
+
+def use_lambda(client):
+    """Point job dispatch at a Lambda client - boto3's, or a local stand-in"""
+    global lambda_override
+    lambda_override = client
+
+def get_dynamodb():
+    return dynamodb_override or aws_clients.resource('dynamodb')
+
+def get_lambda():
+    return lambda_override or aws_clients.client('lambda')
+
+def get_bedrock(soft_deadline=None):
+    """bedrock-runtime client; with a deadline, one whose reads time out by the hard deadline and are not retried"""
+    if bedrock_override:
+        return bedrock_override
+    if soft_deadline is None:
+        return aws_clients.client('bedrock-runtime', 'us-east-1')
+    # Whole seconds, so a container builds a handful of these clients rather than one per call
+    read_timeout = max(1, math.ceil(soft_deadline + STREAM_GRACE_SECONDS - time.monotonic()))
+    return aws_clients.bounded_client('bedrock-runtime', read_timeout, 'us-east-1')
+
+def close_stream(stream):
+    """Close a response stream, releasing its connection; a blocked read on another thread then ends"""
+    if hasattr(stream, 'close'):
+        try:
+            stream.close()
+        except Exception as e:
+            log.warning('closing bedrock stream failed', error=str(e))
+
+def track_stream(stream):
+    """Register a response stream with the call_bedrock call running on this thread; returns it"""
+    call = getattr(bedrock_call_local, 'call', None)
+    return call.track(stream) if call else stream
+
+def run_bedrock_call(call, soft_deadline, bedrock_call):
+    bedrock_call_local.call = bedrock_call
+    try:
+        return call(soft_deadline)
+    finally:
+        bedrock_call_local.call = None
+
+def release_bedrock_slot(future):
+    bedrock_slots.release()
+
+def emit_local_cache_metrics(hit):
+    """Log local cache counters in CloudWatch Embedded Metric Format for sizing the LRU"""
+    print(json.dumps({
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': 'LearningPath/Recommendations',
+                'Dimensions': [[]],
+                'Metrics': [
+                    {'Name': 'LocalCacheHit', 'Unit': 'Count'},
+                    {'Name': 'LocalCacheMiss', 'Unit': 'Count'},
+                    {'Name': 'LocalCacheSize', 'Unit': 'Count'}
+                ]
+            }]
+        },
+        'LocalCacheHit': 1 if hit else 0,
+        'LocalCacheMiss': 0 if hit else 1,
+        'LocalCacheSize': len(local_cache.entries),
+        'LocalCacheTotalHits': local_cache.hits,
+        'LocalCacheTotalMisses': local_cache.misses
+    }))
+
+def emit_bedrock_metrics(outcome, latency_ms=None):
+    """Log one Bedrock call (or short-circuit) in CloudWatch Embedded Metric Format, with the breaker's view"""
+    snapshot = breaker.snapshot()
+    metrics = [
+        {'Name': 'BedrockFailure', 'Unit': 'Count'},
+        {'Name': 'BedrockShortCircuited', 'Unit': 'Count'},
+        {'Name': 'CircuitOpen', 'Unit': 'Count'}
+    ]
+    record = {
+        'BedrockFailure': 1 if outcome in ('error', 'timeout', 'saturated') else 0,
+        'BedrockShortCircuited': 1 if outcome == 'short-circuited' else 0,
+        'CircuitOpen': 0 if snapshot['state'] == 'closed' else 1,
+        'BedrockOutcome': outcome,
+        'BreakerState': snapshot['state'],
+        'BreakerFailureRate': snapshot['failure_rate'],
+        'WindowP50Ms': snapshot['p50_ms'],
+        'WindowP95Ms': snapshot['p95_ms'],
+        'WindowP99Ms': snapshot['p99_ms']
+    }
+    if latency_ms is not None:
+        metrics.append({'Name': 'BedrockLatency', 'Unit': 'Milliseconds'})
+        record['BedrockLatency'] = round(latency_ms, 1)
+    record['_aws'] = {
+        'Timestamp': int(time.time() * 1000),
+        'CloudWatchMetrics': [{'Namespace': 'LearningPath/Recommendations', 'Dimensions': [[]], 'Metrics': metrics}]
+    }
+    print(json.dumps(record))
+
+def request_deadline(context, budget_seconds=BEDROCK_BUDGET_SECONDS):
+    """time.monotonic() by which Bedrock must have answered: the budget, or less when the invocation ends sooner"""
+    budget = budget_seconds if budget_seconds is not None else float('inf')
+    if hasattr(context, 'get_remaining_time_in_millis'):
+        budget = min(budget, (context.get_remaining_time_in_millis() - DEADLINE_RESERVE_MS) / 1000)
+    if budget == float('inf'):
+        return None
+    return time.monotonic() + max(0.0, budget)
+
+def call_bedrock(call, deadline=None):
+    """Run call(soft_deadline) through the circuit breaker, giving up at `deadline`.
+
+    Raises CircuitOpenError without calling while the circuit is open or every
+    worker is still busy, and TimeoutError when the deadline passes first; the
+    streams the abandoned call opened are closed then.
+    """
+    if deadline is not None and deadline - time.monotonic() <= 0:
+        raise TimeoutError('No time left to call Bedrock')
+    if not breaker.allow():
+        emit_bedrock_metrics('short-circuited')
+        raise CircuitOpenError('Bedrock circuit is open')
+    if deadline is not None and not bedrock_slots.acquire(blocking=False):
+        # Earlier calls, some given up on at their deadline, still hold every worker: Bedrock is not keeping up
+        state = breaker.record(False)
+        emit_bedrock_metrics('saturated')
+        log.warning('bedrock workers saturated', workers=BEDROCK_WORKERS, state=state)
+        raise CircuitOpenError('Bedrock workers are all busy')
+    
+    started = time.monotonic()
+    outcome = 'error'
+    try:
+        if deadline is None:
+            result = call(None)
+        else:
+            bedrock_call = BedrockCall()
+            future = bedrock_executor.submit(run_bedrock_call, call, deadline - STREAM_GRACE_SECONDS, bedrock_call)
+            future.add_done_callback(release_bedrock_slot)
+            try:
+                result = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except TimeoutError:
+                outcome = 'timeout'
+                # A call that has not started never will; one that has stops when its stream closes
+                if not future.cancel():
+                    bedrock_call.abandon()
+                raise
+        outcome = 'ok'
+        return result
+    finally:
+        latency_ms = (time.monotonic() - started) * 1000
+        state = breaker.record(outcome == 'ok', latency_ms)
+        emit_bedrock_metrics(outcome, latency_ms)
+        if state != 'closed':
+            log.warning('bedrock circuit not closed', state=state, outcome=outcome, ms=round(latency_ms, 1))
+
+def calculate_dates(duration):
+    """Calculate start and end dates based on duration"""
+    start_date = datetime.now()
+    
+    # Parse duration and calculate end date
+    if 'week' in duration.lower():
+        weeks = int(re.findall(r'\d+', duration)[0])
+        end_date = start_date + timedelta(weeks=weeks)
+    elif 'month' in duration.lower():
+        months = int(re.findall(r'\d+', duration)[0])
+        end_date = start_date + timedelta(days=months * 30)
+    elif 'hour' in duration.lower():
+        hours = int(re.findall(r'\d+', duration)[0])
+        # Assume 2 hours per day, 5 days per week
+        days = (hours / 2) * (7/5)
+        end_date = start_date + timedelta(days=int(days))
+    else:
+        # Default to 4 weeks if duration format is unclear
+        end_date = start_date + timedelta(weeks=4)
+    
+    return start_date.strftime('%d-%m-%Y'), end_date.strftime('%d-%m-%Y')
+
+def lambda_handler(event, context):
+    # Clients may keep responses but must revalidate them with If-None-Match
+    cors_headers = make_cors_headers(allow_headers=ALLOW_HEADERS + ',If-None-Match', expose_headers='ETag,Location',
+                                     **{'Cache-Control': 'no-cache'})
+    
+    if event.get('httpMethod') == 'OPTIONS':
+        return api_response(200, cors_headers)
+    
+    log.start_request('recommendations', context)
+    # Asynchronous self-invocation carrying a generation job; errors propagate so Lambda retries it
+    if 'job' in event:
+        return run_job(event['job'], context)
+    
+    try:
+        log.log_request(event)
+        
+        # Handle DELETE request
+        if event.get('httpMethod') == 'DELETE':
+            log.set_operation('delete')
+            path_params = event.get('pathParameters') or {}
+            query_params = event.get('queryStringParameters') or {}
+            recommendation_id = path_params.get('id') or query_params.get('id') or query_params.get('RecommendationId')
+            
+            if not recommendation_id:
+                return error_response(400, cors_headers, 'Missing RecommendationId')
+            
+            try:
+                delete_recommendation(recommendation_id)
+                return api_response(200, cors_headers, {'message': 'Deleted'})
+            except Exception as delete_error:
+                log.error('delete failed', recommendation_id=recommendation_id, error=str(delete_error))
+                return error_response(500, cors_headers, f'Delete failed: {str(delete_error)}')
+        
+        # Handle GET request for listing recommendations
+        if event.get('httpMethod') == 'GET':
+            log.set_operation('list')
+            try:
+                dynamodb = get_dynamodb()
+                table_name = os.environ.get('RECOMMENDATIONS_TABLE')
+                if not table_name:
+                    return error_response(500, cors_headers, 'RECOMMENDATIONS_TABLE environment variable not set')
+                table = dynamodb.Table(table_name)
+                etag, not_modified = check_etag(event, dynamodb, table_name)
+                headers = dict(cors_headers, ETag=etag) if etag else cors_headers
+                if not_modified:
+                    log.info('list not modified', etag=etag)
+                    return api_response(304, headers)
+                response = table.scan()
+                items = response['Items']
+                
+                # Transform to Learning-Paths format with consistent IDs
+                learning_paths = []
+                for item in items:
+                    for rec in item.get('Recommendations', []):
+                        # Stored at write time; derived for items saved before that
+                        consistent_id = rec.get('LearningPathId') or derive_learning_path_id(item.get('Employee', ''), rec)
+                        # Calculate dates based on duration
+                        start_date, end_date = calculate_dates(rec.get('duration', '4 weeks'))
+                        learning_paths.append({
+                            'LearningPathId': consistent_id,
+                            'Employee': item.get('Employee', ''),
+                            'Skill': item.get('Skill', ''),
+                            'Level': item.get('TargetLevel', ''),
+                            'Name': rec.get('name', ''),
+                            'Source': rec.get('source', ''),
+                            'Duration': rec.get('duration', ''),
+                            'Url': rec.get('url', ''),
+                            'Completed': False,
+                            'StateDate': start_date,
+                            'EndDate': end_date
+                        })
+                
+                log.info('listed learning paths', count=len(learning_paths), records=len(items))
+                return json_response(event, 200, headers, {'Learning-Paths': learning_paths}, default=decimal_default)
+            except Exception as get_error:
+                log.error('list failed', error=str(get_error))
+                return error_response(500, cors_headers, f'GET failed: {str(get_error)}')
+        
+        # Handle both direct Lambda invocation and API Gateway formats
+        body = parse_body(event)
+        
+        # Check if operation is in the body
+        operation = body.get('operation')
+        log.set_operation(operation or 'generate')
+        log.debug_payload('parsed body', body)
+        
+        if operation == 'list':
+            dynamodb = get_dynamodb()
+            table = dynamodb.Table(os.environ['RECOMMENDATIONS_TABLE'])
+            etag, not_modified = check_etag(event, dynamodb, table.name)
+            headers = dict(cors_headers, ETag=etag) if etag else cors_headers
+            if not_modified:
+                log.info('list not modified', etag=etag)
+                return api_response(304, headers)
+            response = table.scan()
+            items = response['Items']
+            
+            # Transform to Learning-Paths format with consistent IDs
+            learning_paths = []
+            for item in items:
+                for rec in item.get('Recommendations', []):
+                    # Stored at write time; derived for items saved before that
+                    consistent_id = rec.get('LearningPathId') or derive_learning_path_id(item.get('Employee', ''), rec)
+                    # Calculate dates based on duration
+                    start_date, end_date = calculate_dates(rec.get('duration', '4 weeks'))
+                    learning_paths.append({
+                        'LearningPathId': consistent_id,
+                        'Employee': item.get('Employee', ''),
+                        'Skill': item.get('Skill', ''),
+                        'Level': item.get('TargetLevel', ''),
+                        'Name': rec.get('name', ''),
+                        'Source': rec.get('source', ''),
+                        'Duration': rec.get('duration', ''),
+                        'Url': rec.get('url', ''),
+                        'Completed': False,
+                        'StateDate': start_date,
+                        'EndDate': end_date
+                    })
+            
+            return json_response(event, 200, headers, {'Learning-Paths': learning_paths}, default=decimal_default)
+        
+        elif operation == 'read':
+            dynamodb = get_dynamodb()
+            table = dynamodb.Table(os.environ['RECOMMENDATIONS_TABLE'])
+            response = table.get_item(Key={'RecommendationId': body['RecommendationId']})
+            return api_response(200, cors_headers, response.get('Item', {}))
+        
+        elif operation == 'delete':
+            try:
+                learning_path_id = body.get('LearningPathId') or body.get('RecommendationId')
+                if not learning_path_id:
+                    return error_response(400, cors_headers, 'Missing LearningPathId or RecommendationId')
+                
+                # The index maps a LearningPathId to every record holding it; one record goes per request
+                deleted = delete_learning_path(learning_path_id)
+                if not deleted and body.get('RecommendationId'):
+                    deleted = delete_recommendation(body['RecommendationId'])
+                
+                if deleted:
+                    return api_response(200, cors_headers, {'message': 'Deleted'})
+                else:
+                    return error_response(404, cors_headers, 'Learning path not found')                        
+            except Exception as delete_error:
+                log.error('delete failed', error=str(delete_error))
+                return error_response(500, cors_headers, f'Delete failed: {str(delete_error)}')
+        
+        elif operation == 'reindex':
+            # One-off backfill of the LearningPathId index for records saved before it existed
+            indexed = reindex_learning_paths()
+            return api_response(200, cors_headers, {'message': 'Reindexed', 'indexed': indexed})
+        
+        elif operation == 'batch_generate':
+            return batch_generate(body, cors_headers, request_deadline(context))
+        
+        elif operation == 'create':
+            return api_response(200, cors_headers, {'message': 'Created'})
+        
+        elif operation == 'update':
+            return api_response(200, cors_headers, {'message': 'Updated'})
+        
+        # Default behavior - generate new recommendations
+        skill = (body.get('Skill') or body.get('skill', '')).strip()
+        current_level = (body.get('Current') or body.get('current_level', '')).strip()
+        target_level = (body.get('Target') or body.get('target_level', '')).strip()
+        employee = body.get('Employee', '').strip()
+        skill_assessment_id = body.get('SkillAssessmentId', '')
+        
+        # Validate required fields for generation
+        if not skill or not current_level or not target_level:
+            return error_response(400, cors_headers, 'Missing required fields: Skill, Current, Target')
+        
+        # Job mode: answer at once and generate in the background; poll GET /recommendations/{id}
+        if body.get('mode') == 'job' or (event.get('queryStringParameters') or {}).get('mode') == 'job':
+            job = create_job(employee, skill, current_level, target_level, skill_assessment_id)
+            try:
+                dispatch_job(job, context)
+            except Exception as dispatch_error:
+                # No worker will pick the pending record up; mark it failed so polling stops
+                log.error('job dispatch failed', recommendation_id=job['RecommendationId'], error=str(dispatch_error))
+                set_job_status(job['RecommendationId'], JOB_FAILED, f'Dispatch failed: {dispatch_error}')
+                return api_response(503, cors_headers, {
+                    'error': 'Could not start the recommendation job, please retry',
+                    'recommendation_id': job['RecommendationId'],
+                    'status': JOB_FAILED
+                })
+            return api_response(202, dict(cors_headers, Location=f"/recommendations/{job['RecommendationId']}"), {
+                'recommendation_id': job['RecommendationId'],
+                'status': JOB_PENDING,
+                'status_url': f"/recommendations/{job['RecommendationId']}"
+            })
+        
+        # Get AI-powered recommendations, reusing a cached response for the same skill gap
+        recommendations, cache_status = get_cached_recommendations(skill, current_level, target_level, employee,
+                                                                   request_deadline(context))
+        
+        # Save to DynamoDB
+        recommendation_id = save_recommendations_to_db(employee, skill, current_level, target_level, recommendations, skill_assessment_id)
+        
+        response_data = {
+            'recommendation_id': recommendation_id,
+            'recommendations': recommendations,
+            'employee': employee,
+            'skill': skill.title(),
+            'current_level': current_level.title(),
+            'target_level': target_level.title(),
+            'powered_by': 'Amazon Bedrock AI',
+            'cache': cache_status
+        }
+        
+        if skill_assessment_id:
+            response_data['skill_assessment_id'] = skill_assessment_id
+        
+        return api_response(200, cors_headers, response_data)
+    
+    except Exception as e:
+        log.error('request failed', error=str(e))
+        log.debug_payload('failed event', event)
+        return error_response(500, cors_headers, str(e))
+
+def batch_generate(body, cors_headers, deadline=None):
+    """Recommendations for several skill gaps of an employee, saved as one record per gap"""
+    items = body.get('items')
+    if not isinstance(items, list) or not items:
+        return error_response(400, cors_headers, 'items must be a non-empty list')
+    if len(items) > MAX_BATCH_ITEMS:
+        return error_response(400, cors_headers, f'At most {MAX_BATCH_ITEMS} items per request')
+    
+    employee = (body.get('Employee') or '').strip()
+    gaps = []
+    for index, item in enumerate(items):
+        gap = {
+            'Employee': (item.get('Employee') or employee).strip(),
+            'Skill': (item.get('Skill') or item.get('skill', '')).strip(),
+            'Current': (item.get('Current') or item.get('current_level', '')).strip(),
+            'Target': (item.get('Target') or item.get('target_level', '')).strip(),
+            'SkillAssessmentId': item.get('SkillAssessmentId', '')
+        }
+        if not gap['Skill'] or not gap['Current'] or not gap['Target']:
+            return error_response(400, cors_headers, f'items[{index}]: missing required fields: Skill, Current, Target')
+        gaps.append(gap)
+    
+    results = []
+    for gap, (recommendations, cache_status) in zip(gaps, get_batch_recommendations(gaps, deadline)):
+        recommendation_id = save_recommendations_to_db(gap['Employee'], gap['Skill'], gap['Current'], gap['Target'],
+                                                       recommendations, gap['SkillAssessmentId'])
+        result = {
+            'recommendation_id': recommendation_id,
+            'recommendations': recommendations,
+            'employee': gap['Employee'],
+            'skill': gap['Skill'].title(),
+            'current_level': gap['Current'].title(),
+            'target_level': gap['Target'].title(),
+            'cache': cache_status
+        }
+        if gap['SkillAssessmentId']:
+            result['skill_assessment_id'] = gap['SkillAssessmentId']
+        results.append(result)
+    
+    log.info('batch generated', gaps=len(gaps), cache=[result['cache'] for result in results])
+    return api_response(200, cors_headers, {'results': results, 'powered_by': 'Amazon Bedrock AI'})
+
+def recommendation_cache_key(skill, current_level, target_level):
+    """Cache key for a skill gap - normalized triple plus the prompt version"""
+    import course_catalog
+    return '|'.join([
+        PROMPT_VERSION,
+        course_catalog.canonical_skill(skill),
+        current_level.strip().lower(),
+        target_level.strip().lower()
+    ])
+
+def read_recommendation_cache(cache_key):
+    """Return cached recommendations for cache_key, or None on a miss or expired entry"""
+    table_name = os.environ.get('RECOMMENDATION_CACHE_TABLE')
+    if not table_name:
+        return None
+    try:
+        dynamodb = get_dynamodb()
+        item = dynamodb.Table(table_name).get_item(Key={'CacheKey': cache_key}).get('Item')
+        # TTL deletion is lazy, so expired items can still be returned for a while
+        if item and int(item.get('ExpiresAt', 0)) > time.time():
+            return item['Recommendations']
+    except Exception as e:
+        log.warning('cache read failed', error=str(e))
+    return None
+
+def write_recommendation_cache(cache_key, recommendations):
+    """Store Bedrock recommendations under cache_key until the TTL expires"""
+    table_name = os.environ.get('RECOMMENDATION_CACHE_TABLE')
+    if not table_name:
+        return
+    try:
+        dynamodb = get_dynamodb()
+        dynamodb.Table(table_name).put_item(Item={
+            'CacheKey': cache_key,
+            'Recommendations': recommendations,
+            'PromptVersion': PROMPT_VERSION,
+            'CreatedAt': datetime.utcnow().isoformat(),
+            'ExpiresAt': int(time.time()) + CACHE_TTL_SECONDS
+        })
+    except Exception as e:
+        log.warning('cache write failed', error=str(e))
+
+def get_cached_recommendations(skill, current_level, target_level, employee, deadline=None):
+    """Recommendations for a skill gap plus the cache status ('local-hit', 'hit', 'miss' or 'fallback').
+
+    The in-process LRU is checked before the shared DynamoDB cache. Only real
+    Bedrock output is cached; catalog fallbacks are always recomputed.
+    """
+    cache_key = recommendation_cache_key(skill, current_level, target_level)
+    cached = lookup_cached_recommendations(cache_key)
+    if cached is not None:
+        return cached
+    return generate_recommendations(cache_key, skill, current_level, target_level, employee, deadline)
+
+def generate_recommendations(cache_key, skill, current_level, target_level, employee, deadline=None):
+    """Ask Bedrock for one skill gap and cache the answer; catalog fallback (uncached) when that fails"""
+    try:
+        recommendations = call_bedrock(lambda soft_deadline: invoke_bedrock(skill, current_level, target_level, employee, soft_deadline),
+                                       deadline)
+    except CircuitOpenError:
+        log.info('bedrock circuit open, using fallback', skill=skill)
+        return get_fallback_recommendations(skill, current_level, target_level), 'fallback'
+    except Exception as e:
+        log.warning('bedrock failed, using fallback', skill=skill, error=str(e) or type(e).__name__)
+        return get_fallback_recommendations(skill, current_level, target_level), 'fallback'
+    
+    # A reply cut short by the deadline is good enough for this request but not worth keeping
+    if not isinstance(recommendations, PartialRecommendations):
+        write_recommendation_cache(cache_key, recommendations)
+        local_cache.put(cache_key, recommendations)
+    return recommendations, 'miss'
+
+def lookup_cached_recommendations(cache_key):
+    """(recommendations, 'local-hit' or 'hit') from the in-process LRU or the DynamoDB cache, or None on a miss"""
+    cached = local_cache.get(cache_key)
+    emit_local_cache_metrics(cached is not None)
+    if cached is not None:
+        log.info('recommendation cache', status='local-hit', cache_key=cache_key)
+        return cached, 'local-hit'
+    
+    cached = read_recommendation_cache(cache_key)
+    if cached is not None:
+        log.info('recommendation cache', status='hit', cache_key=cache_key)
+        local_cache.put(cache_key, cached)
+        return cached, 'hit'
+    
+    log.info('recommendation cache', status='miss', cache_key=cache_key)
+    return None
+
+def invoke_bedrock(skill, current_level, target_level, employee, deadline=None):
+    """Ask Bedrock for recommendations, raising ValueError when the reply has no JSON array.
+
+    `deadline` (a time.monotonic() value) bounds the client's read timeout; for
+    streamed replies, once it passes the recommendations already parsed are returned.
+    """
+    log.info('invoking bedrock', skill=skill, current=current_level, target=target_level)
+    bedrock = get_bedrock(deadline)
+    
+    # The prompt deliberately omits the employee so the response can be cached per skill gap
+    prompt = f"""Generate 3-5 learning recommendations for:
+Skill: {skill}
+Current Level: {current_level}
+Target Level: {target_level}
+
+Provide practical, real-world courses from platforms like Coursera, Udemy, AWS Training, Microsoft Learn, Pluralsight, etc.
+
+Return ONLY a JSON array with this exact format:
+[
+  {{
+    "name": "Course Name",
+    "source": "Platform Name", 
+    "duration": "X weeks/hours",
+    "url": "https://example.com/course"
+  }}
+]"""
+
+    request_body = {
+        "inputText": prompt,
+        "textGenerationConfig": {
+            "maxTokenCount": 1000,
+            "temperature": 0.1,
+            "topP": 0.9
+        }
+    }
+    
+    if BEDROCK_STREAMING:
+        response = bedrock.invoke_model_with_response_stream(
+            modelId=BEDROCK_MODEL_ID,
+            body=json.dumps(request_body)
+        )
+        return read_recommendation_stream(track_stream(response['body']), deadline)
+    
+    response = bedrock.invoke_model(
+        modelId=BEDROCK_MODEL_ID,
+        body=json.dumps(request_body)
+    )
+    
+    response_body = json.loads(response['body'].read())
+    ai_response = response_body['results'][0]['outputText']
+    log.debug_payload('bedrock response', ai_response)
+    
+    # The reply may wrap the array in prose; take the first complete JSON array
+    recommendations = parse_array(ai_response)[:MAX_RECOMMENDATIONS]
+    log.info('bedrock recommendations parsed', count=len(recommendations))
+    return recommendations
+
+def read_recommendation_stream(stream, deadline=None):
+    """Parse recommendations out of a Titan response stream, stopping as soon as enough are complete"""
+    parser = JsonArrayParser()
+    recommendations = []
+    chunks = 0
+    received = 0
+    # Logged once per stream, not per chunk
+    texts = [] if log.debug_enabled() else None
+    started = time.monotonic()
+    stop_reason = None
+    try:
+        for text in stream_text(stream):
+            chunks += 1
+            received += len(text)
+            if texts is not None:
+                texts.append(text)
+            for rec in parser.feed(text):
+                if not recommendations:
+                    log.info('first recommendation streamed', ms=round((time.monotonic() - started) * 1000, 1), chunks=chunks)
+                recommendations.append(rec)
+            if len(recommendations) >= MAX_RECOMMENDATIONS or parser.done:
+                stop_reason = 'complete'
+                break
+            if deadline is not None and recommendations and time.monotonic() >= deadline:
+                stop_reason = 'deadline'
+                break
+    finally:
+        # Stopping early: release the connection instead of reading the rest of the reply
+        close_stream(stream)
+    
+    if texts is not None:
+        log.debug('bedrock stream', text=''.join(texts))
+    if not recommendations:
+        raise ValueError('No valid JSON found in Bedrock response')
+    if stop_reason is None:
+        log.warning('bedrock stream ended inside the array', count=len(recommendations))
+    log.info('bedrock recommendations parsed', count=len(recommendations), chunks=chunks, chars=received, stop=stop_reason or 'eof')
+    if stop_reason != 'complete':
+        return PartialRecommendations(recommendations)
+    return recommendations[:MAX_RECOMMENDATIONS]
+
+def stream_text(stream):
+    """outputText of each chunk in a Titan response stream"""
+    for event in stream:
+        if 'chunk' not in event:
+            # Modelled errors arrive in-band, e.g. {'throttlingException': {...}}; raise them as the
+            # ClientError InvokeModel would have, so callers handle both paths alike
+            name = next(iter(event), 'unknownException')
+            message = (event.get(name) or {}).get('message', '')
+            raise ClientError({'Error': {'Code': name[:1].upper() + name[1:], 'Message': message}}, 'InvokeModelWithResponseStream')
+        yield json.loads(event['chunk']['bytes']).get('outputText', '')
+
+def gap_key(skill):
+    """How a skill is matched against the keys of a batched reply"""
+    return skill.strip().lower()
+
+def invoke_bedrock_batch(gaps, deadline=None):
+    """Ask Bedrock for several skill gaps in one prompt; {gap_key(skill): recommendations} for the skills it answered.
+
+    A streamed reply is cut off at `deadline` with the skills answered so far.
+    """
+    log.info('invoking bedrock', skills=[gap['Skill'] for gap in gaps], gaps=len(gaps))
+    bedrock = get_bedrock(deadline)
+    
+    # As for single gaps the employee is left out, so each answer can be cached per skill gap
+    gap_lines = '\n'.join(f"- {gap['Skill']}: {gap['Current']} -> {gap['Target']}" for gap in gaps)
+    prompt = f"""Generate 3-5 learning recommendations for each of these skill gaps (skill: current level -> target level):
+{gap_lines}
+
+Provide practical, real-world courses from platforms like Coursera, Udemy, AWS Training, Microsoft Learn, Pluralsight, etc.
+
+Return ONLY a JSON object whose keys are the skill names exactly as written above, each mapping to an array with this exact format:
+{{
+  "{gaps[0]['Skill']}": [
+    {{
+      "name": "Course Name",
+      "source": "Platform Name",
+      "duration": "X weeks/hours",
+      "url": "https://example.com/course"
+    }}
+  ]
+}}"""
+
+    request_body = {
+        "inputText": prompt,
+        "textGenerationConfig": {
+            "maxTokenCount": BATCH_TOKENS_PER_GAP * len(gaps),
+            "temperature": 0.1,
+            "topP": 0.9
+        }
+    }
+    
+    stream = None
+    if BEDROCK_STREAMING:
+        response = bedrock.invoke_model_with_response_stream(modelId=BEDROCK_MODEL_ID, body=json.dumps(request_body))
+        stream = track_stream(response['body'])
+        texts = stream_text(stream)
+    else:
+        response = bedrock.invoke_model(modelId=BEDROCK_MODEL_ID, body=json.dumps(request_body))
+        texts = [json.loads(response['body'].read())['results'][0]['outputText']]
+    
+    parser = JsonObjectParser()
+    answered = {}
+    chunks = 0
+    received = 0
+    try:
+        for text in texts:
+            chunks += 1
+            received += len(text)
+            for skill, recommendations in parser.feed(text):
+                if isinstance(recommendations, list) and recommendations:
+                    answered[gap_key(skill)] = recommendations[:MAX_RECOMMENDATIONS]
+            if parser.done or (deadline is not None and time.monotonic() >= deadline):
+                break
+    finally:
+        if stream is not None:
+            close_stream(stream)
+    log.info('bedrock batch parsed', gaps=len(gaps), answered=len(answered), chunks=chunks, chars=received)
+    return answered
+
+def batch_prompt_groups(gaps):
+    """Split gaps into prompts of at most MAX_GAPS_PER_PROMPT, never repeating a skill within one prompt"""
+    groups = []
+    for gap in gaps:
+        group = next((g for g in groups if len(g) < MAX_GAPS_PER_PROMPT
+                      and all(gap_key(other['Skill']) != gap_key(gap['Skill']) for other in g)), None)
+        if group is None:
+            group = []
+            groups.append(group)
+        group.append(gap)
+    return groups
+
+def get_batch_recommendations(gaps, deadline=None):
+    """(recommendations, cache status) for each gap, in order, asking Bedrock once per group of uncached gaps.
+
+    A gap the batched reply leaves out goes through the single-gap path, which
+    retries it on its own and falls back to the catalog.
+    """
+    results = {}
+    misses = {}
+    for gap in gaps:
+        cache_key = recommendation_cache_key(gap['Skill'], gap['Current'], gap['Target'])
+        if cache_key in results or cache_key in misses:
+            continue
+        cached = lookup_cached_recommendations(cache_key)
+        if cached is not None:
+            results[cache_key] = cached
+        else:
+            misses[cache_key] = gap
+    
+    for group in batch_prompt_groups(list(misses.values())):
+        try:
+            answered = call_bedrock(lambda soft_deadline, group=group: invoke_bedrock_batch(group, soft_deadline), deadline)
+        except Exception as e:
+            log.warning('bedrock batch failed, retrying gaps singly', gaps=len(group), error=str(e) or type(e).__name__)
+            answered = {}
+        for gap in group:
+            cache_key = recommendation_cache_key(gap['Skill'], gap['Current'], gap['Target'])
+            recommendations = answered.get(gap_key(gap['Skill']))
+            if recommendations:
+                write_recommendation_cache(cache_key, recommendations)
+                local_cache.put(cache_key, recommendations)
+                results[cache_key] = (recommendations, 'miss')
+            else:
+                results[cache_key] = generate_recommendations(cache_key, gap['Skill'], gap['Current'], gap['Target'], gap['Employee'],
+                                                              deadline)
+    
+    return [results[recommendation_cache_key(gap['Skill'], gap['Current'], gap['Target'])] for gap in gaps]
+
+def derive_learning_path_id(employee, rec):
+    """Stable LearningPathId for one recommendation of an employee"""
+    return str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{employee}-{rec.get('name', '')}-{rec.get('source', '')}"))
+
+def with_learning_path_ids(employee, recommendations):
+    """Copy recommendations adding their LearningPathId (inputs may be shared cache entries)"""
+    return [dict(rec, LearningPathId=rec.get('LearningPathId') or derive_learning_path_id(employee, rec)) for rec in recommendations]
+
+def index_learning_paths(recommendation_id, recommendations):
+    """Add recommendation_id to the index entry of every LearningPathId in recommendations.
+
+    The same recommendation for the same employee (e.g. served from the cache) gets the same
+    LearningPathId, so an entry holds the set of records that contain it, not just the newest.
+    """
+    table_name = os.environ.get('LEARNING_PATH_INDEX_TABLE')
+    if not table_name:
+        return
+    index_table = get_dynamodb().Table(table_name)
+    for learning_path_id in sorted({rec['LearningPathId'] for rec in recommendations}):
+        index_table.update_item(
+            Key={'LearningPathId': learning_path_id},
+            UpdateExpression='ADD RecommendationIds :rids',
+            ExpressionAttributeValues={':rids': {recommendation_id}}
+        )
+
+def unindex_learning_path(learning_path_id, recommendation_id):
+    """Remove recommendation_id from a LearningPathId's index entry, deleting the entry once it is empty"""
+    index_table = get_dynamodb().Table(os.environ['LEARNING_PATH_INDEX_TABLE'])
+    key = {'LearningPathId': learning_path_id}
+    entry = index_table.update_item(
+        Key=key,
+        UpdateExpression='DELETE RecommendationIds :rids',
+        ExpressionAttributeValues={':rids': {recommendation_id}},
+        ReturnValues='ALL_NEW'
+    ).get('Attributes', {})
+    if entry.get('RecommendationId') == recommendation_id:
+        # Entries written before the index held sets point at a single record
+        entry = index_table.update_item(Key=key, UpdateExpression='REMOVE RecommendationId',
+                                        ReturnValues='ALL_NEW').get('Attributes', {})
+    if entry.get('RecommendationIds') or entry.get('RecommendationId'):
+        return
+    # Another record may have indexed the id since the update; keep the entry if so
+    try:
+        index_table.delete_item(
+            Key=key,
+            ConditionExpression='attribute_not_exists(RecommendationIds) AND attribute_not_exists(RecommendationId)'
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+
+def lookup_recommendation_ids(learning_path_id):
+    """RecommendationIds of the records holding learning_path_id; empty when it is not indexed"""
+    table_name = os.environ.get('LEARNING_PATH_INDEX_TABLE')
+    if not table_name:
+        return set()
+    dynamodb = get_dynamodb()
+    item = dynamodb.Table(table_name).get_item(Key={'LearningPathId': learning_path_id}).get('Item') or {}
+    recommendation_ids = set(item.get('RecommendationIds', ()))
+    if item.get('RecommendationId'):
+        recommendation_ids.add(item['RecommendationId'])
+    return recommendation_ids
+
+def scan_recommendation_ids(learning_path_id):
+    """RecommendationIds of the records holding learning_path_id, found by scanning the table"""
+    table = get_dynamodb().Table(os.environ['RECOMMENDATIONS_TABLE'])
+    recommendation_ids = set()
+    scan_kwargs = {}
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response['Items']:
+            recommendations = with_learning_path_ids(item.get('Employee', ''), item.get('Recommendations', []))
+            if any(rec['LearningPathId'] == learning_path_id for rec in recommendations):
+                recommendation_ids.add(item['RecommendationId'])
+        if 'LastEvaluatedKey' not in response:
+            return recommendation_ids
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def delete_learning_path(learning_path_id):
+    """Delete one recommendation record holding learning_path_id; False if none does"""
+    recommendation_ids = lookup_recommendation_ids(learning_path_id)
+    if not recommendation_ids:
+        # Records saved before the index existed (and not yet reindexed) are only found by a scan
+        log.warning('learning path not indexed, scanning', learning_path_id=learning_path_id)
+        recommendation_ids = scan_recommendation_ids(learning_path_id)
+    for recommendation_id in sorted(recommendation_ids):
+        if delete_recommendation(recommendation_id):
+            return True
+        if os.environ.get('LEARNING_PATH_INDEX_TABLE'):
+            # Stale member: the record is already gone
+            unindex_learning_path(learning_path_id, recommendation_id)
+    return False
+
+def delete_recommendation(recommendation_id):
+    """Delete a recommendation record and its index entries; False if it did not exist"""
+    dynamodb = get_dynamodb()
+    table = dynamodb.Table(os.environ['RECOMMENDATIONS_TABLE'])
+    old_item = table.delete_item(Key={'RecommendationId': recommendation_id}, ReturnValues='ALL_OLD').get('Attributes')
+    if not old_item:
+        return False
+    bump_version(dynamodb, table.name)
+    
+    if os.environ.get('LEARNING_PATH_INDEX_TABLE'):
+        # Other records holding the same ids stay indexed
+        recommendations = with_learning_path_ids(old_item.get('Employee', ''), old_item.get('Recommendations', []))
+        for learning_path_id in sorted({rec['LearningPathId'] for rec in recommendations}):
+            unindex_learning_path(learning_path_id, recommendation_id)
+    return True
+
+def reindex_learning_paths():
+    """Backfill LearningPathIds and index entries for every stored record; returns the count indexed"""
+    dynamodb = get_dynamodb()
+    table = dynamodb.Table(os.environ['RECOMMENDATIONS_TABLE'])
+    indexed = 0
+    scan_kwargs = {}
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response['Items']:
+            recommendations = with_learning_path_ids(item.get('Employee', ''), item.get('Recommendations', []))
+            if recommendations != item.get('Recommendations', []):
+                table.update_item(
+                    Key={'RecommendationId': item['RecommendationId']},
+                    UpdateExpression='SET Recommendations = :recs',
+                    ExpressionAttributeValues={':recs': recommendations}
+                )
+                bump_version(dynamodb, table.name)
+            index_learning_paths(item['RecommendationId'], recommendations)
+            indexed += len(recommendations)
+        if 'LastEvaluatedKey' not in response:
+            return indexed
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def store_recommendations(employee, skill, current_level, target_level, recommendations, skill_assessment_id=None,
+                          recommendation_id=None, bump=True, **attributes):
+    """Save recommendations to DynamoDB and index their LearningPathIds, raising on failure.
+
+    bump=False leaves the table version alone, for callers that bump it once after many saves.
+    """
+    dynamodb = get_dynamodb()
+    table = dynamodb.Table(os.environ['RECOMMENDATIONS_TABLE'])
+    
+    recommendation_id = recommendation_id or str(uuid.uuid4())
+    recommendations = with_learning_path_ids(employee, recommendations)
+    
+    item = {
+        'RecommendationId': recommendation_id,
+        'Employee': employee,
+        'Skill': skill,
+        'CurrentLevel': current_level,
+        'TargetLevel': target_level,
+        'Recommendations': recommendations,
+        'CreatedAt': datetime.utcnow().isoformat(),
+        'Source': 'Bedrock AI'
+    }
+    
+    if skill_assessment_id:
+        item['SkillAssessmentId'] = skill_assessment_id
+    item.update(attributes)
+    
+    table.put_item(Item=item)
+    if bump:
+        bump_version(dynamodb, table.name)
+    index_learning_paths(recommendation_id, recommendations)
+    return recommendation_id
+
+def save_recommendations_to_db(employee, skill, current_level, target_level, recommendations, skill_assessment_id=None):
+    """Save recommendations to DynamoDB and index their LearningPathIds.
+
+    The id is chosen before the write, so a failure after the put (indexing,
+    the version bump) still returns the id the record was stored under.
+    """
+    recommendation_id = str(uuid.uuid4())
+    try:
+        return store_recommendations(employee, skill, current_level, target_level, recommendations, skill_assessment_id,
+                                     recommendation_id)
+    except Exception as e:
+        log.error('saving recommendations failed', recommendation_id=recommendation_id, error=str(e))
+        return recommendation_id  # Return the id even if save fails
+
+def create_job(employee, skill, current_level, target_level, skill_assessment_id=None):
+    """Record a pending generation job under the RecommendationId clients will poll"""
+    job = {
+        'RecommendationId': str(uuid.uuid4()),
+        'Employee': employee,
+        'Skill': skill,
+        'CurrentLevel': current_level,
+        'TargetLevel': target_level,
+        'Status': JOB_PENDING,
+        'CreatedAt': datetime.utcnow().isoformat()
+    }
+    if skill_assessment_id:
+        job['SkillAssessmentId'] = skill_assessment_id
+    get_dynamodb().Table(os.environ['RECOMMENDATIONS_TABLE']).put_item(Item=job)
+    return job
+
+def dispatch_job(job, context):
+    """Hand the job to a worker invocation; Lambda retries failed async invocations twice"""
+    function_name = JOB_WORKER_FUNCTION or getattr(context, 'function_name', None)
+    get_lambda().invoke(FunctionName=function_name, InvocationType='Event', Payload=json.dumps({'job': job}).encode('utf-8'))
+    log.info('job dispatched', recommendation_id=job['RecommendationId'])
+
+def set_job_status(recommendation_id, status, error=None):
+    table = get_dynamodb().Table(os.environ['RECOMMENDATIONS_TABLE'])
+    if error is None:
+        table.update_item(Key={'RecommendationId': recommendation_id}, UpdateExpression='SET #s = :s',
+                          ExpressionAttributeNames={'#s': 'Status'}, ExpressionAttributeValues={':s': status})
+    else:
+        table.update_item(Key={'RecommendationId': recommendation_id}, UpdateExpression='SET #s = :s, #e = :e',
+                          ExpressionAttributeNames={'#s': 'Status', '#e': 'Error'}, ExpressionAttributeValues={':s': status, ':e': error})
+
+def run_job(job, context=None):
+    """Worker side of job mode: generate, then store the result under the job's RecommendationId"""
+    recommendation_id = job['RecommendationId']
+    log.set_operation('job')
+    set_job_status(recommendation_id, JOB_RUNNING)
+    try:
+        # No API Gateway waiting on a job, so only the Lambda timeout bounds the model call
+        recommendations, cache_status = get_cached_recommendations(job['Skill'], job['CurrentLevel'], job['TargetLevel'], job['Employee'],
+                                                                   request_deadline(context, None))
+        store_recommendations(job['Employee'], job['Skill'], job['CurrentLevel'], job['TargetLevel'], recommendations,
+                              job.get('SkillAssessmentId'), recommendation_id,
+                              Status=JOB_COMPLETE, Cache=cache_status, RequestedAt=job['CreatedAt'])
+    except Exception as e:
+        log.error('job failed', recommendation_id=recommendation_id, error=str(e))
+        set_job_status(recommendation_id, JOB_FAILED, str(e))
+        # Let Lambda retry the invocation; a later success overwrites the failed status
+        raise
+    log.info('job complete', recommendation_id=recommendation_id, count=len(recommendations), cache=cache_status)
+    return {'recommendation_id': recommendation_id, 'status': JOB_COMPLETE}
+
+def get_fallback_recommendations(skill, current_level, target_level):
+    """Fallback recommendations if Bedrock fails"""
+    import course_catalog
+    log.info('using catalog fallback', skill=skill, current=current_level, target=target_level)
+    
+    # Exact level path first, then any catalog courses for the skill
+    catalog_courses = course_catalog.lookup(skill, current_level, target_level) or course_catalog.get_skill_fallback(skill)
+    if catalog_courses:
+        return catalog_courses
+    
+    return [
+        {'name': f'{skill} Fundamentals', 'source': 'Coursera', 'duration': '6 weeks', 'url': f'https://www.coursera.org/courses?query={skill.replace(" ", "+")}'},
+        {'name': f'Advanced {skill}', 'source': 'Udemy', 'duration': '8 weeks', 'url': f'https://www.udemy.com/courses/search/?q={skill.replace(" ", "+")}'}
+    ]
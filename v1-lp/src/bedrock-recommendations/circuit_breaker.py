@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import deque
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list, to 0.1; None when it is empty"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return round(sorted_values[index], 1)
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker over a sliding time window, kept at module scope per container.
+
+    Every call is recorded with its latency; calls slower than `slow_call_ms` count
+    as failures too. Once at least `min_calls` are in the window and the failure
+    rate reaches `failure_rate`, the circuit opens and `allow()` refuses calls for
+    `open_seconds`. After that one trial call is let through (half-open): success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_rate=0.5, min_calls=5, window_seconds=60, open_seconds=30, slow_call_ms=15000,
+                 clock=time.monotonic):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.slow_call_ms = slow_call_ms
+        self.clock = clock
+        self.calls = deque()
+        self.state = CLOSED
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    def _trim(self, now):
+        while self.calls and self.calls[0][0] < now - self.window_seconds:
+            self.calls.popleft()
+
+    def allow(self):
+        """True when a call may go ahead; in half-open state only one trial at a time"""
+        with self.lock:
+            if self.state == OPEN:
+                if self.clock() - self.opened_at < self.open_seconds:
+                    return False
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                if self.trial_running:
+                    return False
+                self.trial_running = True
+            return True
+
+    def record(self, ok, latency_ms=None):
+        """Record a finished call (latency None: refused before it started); returns the state afterwards"""
+        failed = not ok or (latency_ms is not None and latency_ms > self.slow_call_ms)
+        with self.lock:
+            now = self.clock()
+            self.calls.append((now, failed, latency_ms))
+            self._trim(now)
+            if self.state == HALF_OPEN:
+                self.trial_running = False
+                if failed:
+                    self._open(now)
+                else:
+                    # A fresh start, so the failures that opened the circuit do not reopen it
+                    self.state = CLOSED
+                    self.calls.clear()
+            elif self.state == CLOSED and len(self.calls) >= self.min_calls:
+                failures = sum(1 for _, call_failed, _ in self.calls if call_failed)
+                if failures / len(self.calls) >= self.failure_rate:
+                    self._open(now)
+            return self.state
+
+    def _open(self, now):
+        self.state = OPEN
+        self.opened_at = now
+
+    def snapshot(self):
+        """State, window size, failure rate and latency percentiles (ms) for logs and metrics"""
+        with self.lock:
+            self._trim(self.clock())
+            latencies = sorted(latency for _, _, latency in self.calls if latency is not None)
+            failures = sum(1 for _, failed, _ in self.calls if failed)
+            return {
+                'state': self.state,
+                'calls': len(self.calls),
+                'failure_rate': round(failures / len(self.calls), 3) if self.calls else 0.0,
+                'p50_ms': percentile(latencies, 0.50),
+                'p95_ms': percentile(latencies, 0.95),
+                'p99_ms': percentile(latencies, 0.99)
+            }
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency while its circuit is open"""
@@ -0,0 +1,103 @@
+import json
+
+class JsonArrayParser:
+    """Incremental parser for the first JSON array in a stream of text.
+
+    Feed it text as it arrives; `feed` returns the array elements completed by
+    that piece. Text before the opening `[` (model chatter) and everything after
+    the closing `]` is ignored. Brackets and braces inside strings are not counted.
+    A bracket in the chatter ("[optional]") is skipped once its first element
+    fails to parse; after an element has been returned, bad JSON raises ValueError.
+    """
+
+    OPEN = '['
+
+    def __init__(self):
+        self.started = False
+        self.done = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.element = []
+        self.count = 0
+
+    def feed(self, text):
+        items = []
+        for char in text:
+            if self.done:
+                break
+            if not self.started:
+                if char == self.OPEN:
+                    self.started = True
+                    self.depth = 1
+                continue
+            if self.in_string:
+                self.element.append(char)
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+            if char == '"':
+                self.in_string = True
+                self.element.append(char)
+            elif char in '[{':
+                self.depth += 1
+                self.element.append(char)
+            elif char in ']}':
+                self.depth -= 1
+                if self.depth == 0:
+                    # The array itself closed; a trailing scalar element ends here
+                    self.done = True
+                    self._flush(items)
+                else:
+                    self.element.append(char)
+                    if self.depth == 1:
+                        # An object or nested array element is complete; hand it out now
+                        self._flush(items)
+            elif char == ',' and self.depth == 1:
+                self._flush(items)
+            else:
+                self.element.append(char)
+        return items
+
+    def _flush(self, items):
+        text = ''.join(self.element).strip()
+        self.element = []
+        if not text:
+            return
+        try:
+            items.append(self._decode(text))
+        except ValueError:
+            if self.count:
+                raise
+            # Not the array after all; look for the next `[`
+            self.started = self.done = False
+            self.depth = 0
+            return
+        self.count += 1
+
+    def _decode(self, text):
+        return json.loads(text)
+
+class JsonObjectParser(JsonArrayParser):
+    """The same for the first JSON object: `feed` returns (key, value) pairs as each value completes"""
+
+    OPEN = '{'
+
+    def _decode(self, text):
+        # A member is `"key": value`; wrapping it makes a one-entry object
+        member = json.loads('{' + text + '}')
+        if len(member) != 1:
+            raise ValueError('Expected one object member')
+        return next(iter(member.items()))
+
+def parse_array(text):
+    """Elements of the first JSON array in `text`; ValueError when there is no complete array"""
+    parser = JsonArrayParser()
+    items = parser.feed(text)
+    if not parser.done:
+        raise ValueError('No valid JSON found in Bedrock response')
+    return items
@@ -1,51 +0,0 @@
-import json
-import boto3
-import os
-from boto3.dynamodb.conditions import Key
-
-def lambda_handler(event, context):
-    cors_headers = {
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Methods': 'GET,OPTIONS',
-        'Access-Control-Allow-Headers': 'Content-Type'
-    }
-    
-    if event.get('httpMethod') == 'OPTIONS':
-        return {'statusCode': 200, 'headers': cors_headers}
-    
-    try:
-        # Get recommendation ID from path parameters
-        recommendation_id = event.get('pathParameters', {}).get('id')
-        
-        if not recommendation_id:
-            return {
-                'statusCode': 400,
-                'headers': cors_headers,
-                'body': json.dumps({'error': 'Recommendation ID is required'})
-            }
-        
-        # Get recommendation from DynamoDB
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table(os.environ['RECOMMENDATIONS_TABLE'])
-        
-        response = table.get_item(Key={'RecommendationId': recommendation_id})
-        
-        if 'Item' not in response:
-            return {
-                'statusCode': 404,
-                'headers': cors_headers,
-                'body': json.dumps({'error': 'Recommendation not found'})
-            }
-        
-        return {
-            'statusCode': 200,
-            'headers': cors_headers,
-            'body': json.dumps(response['Item'], default=str)
-        }
-    
-    except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': cors_headers,
-            'body': json.dumps({'error': str(e)})
-        }
\ No newline at end of file
@@ -0,0 +1,51 @@
+import os
+import aws_clients
+from lambda_http import make_cors_headers, api_response, error_response
+
+# Seconds clients are asked to wait before polling an unfinished job again
+JOB_POLL_SECONDS = '2'
+
+# Injected DynamoDB resource for offline runs; None means use the container's shared boto3 one
+dynamodb_override = None
+
+def use_dynamodb(resource):
+    """Point the handler at a DynamoDB resource - boto3's, or an in-memory one for offline runs"""
+    global dynamodb_override
+    dynamodb_override = resource
+
+def get_dynamodb():
+    return dynamodb_override or aws_clients.resource('dynamodb')
+
+def lambda_handler(event, context):
+    cors_headers = make_cors_headers('GET,OPTIONS', 'Content-Type')
+    
+    if event.get('httpMethod') == 'OPTIONS':
+        return api_response(200, cors_headers)
+    
+    try:
+        # Get recommendation ID from path parameters
+        recommendation_id = event.get('pathParameters', {}).get('id')
+        
+        if not recommendation_id:
+            return error_response(400, cors_headers, 'Recommendation ID is required')
+        
+        # Get recommendation from DynamoDB
+        dynamodb = get_dynamodb()
+        table = dynamodb.Table(os.environ['RECOMMENDATIONS_TABLE'])
+        
+        response = table.get_item(Key={'RecommendationId': recommendation_id})
+        
+        if 'Item' not in response:
+            return error_response(404, cors_headers, 'Recommendation not found')
+        
+        item = response['Item']
+        # Records saved by a synchronous request have no Status and are always complete
+        status = item.setdefault('Status', 'complete')
+        if status in ('pending', 'running'):
+            return api_response(202, dict(cors_headers, **{'Retry-After': JOB_POLL_SECONDS}),
+                                {'RecommendationId': recommendation_id, 'Status': status})
+        
+        return api_response(200, cors_headers, item, default=str)
+    
+    except Exception as e:
+        return error_response(500, cors_headers, str(e))
\ No newline at end of file
@@ -0,0 +1,274 @@
+import os
+import uuid
+from datetime import datetime, timedelta
+import re
+import aws_clients
+import structured_logging as log
+from field_projection import parse_fields, projection
+from http_compression import json_response
+from lambda_http import ALLOW_HEADERS, make_cors_headers, decimal_default, parse_body, api_response, error_response
+from lazy_imports import preload
+from table_version import bump_version, check_etag
+
+# Everything the grid shows plus what its inline edit posts back to 'update' - the default list projection
+LEARNING_PATH_FIELDS = ('LearningPathId', 'Employee', 'Skill', 'Level', 'Name', 'Source', 'Duration', 'Url',
+                        'Completed', 'StateDate', 'EndDate')
+FIELD_DEFAULTS = {'Completed': False}
+# Progress an employee has made on a path; regenerating the paths for an assessment keeps it
+PROGRESS_FIELDS = ('Completed', 'StateDate', 'EndDate')
+
+def calculate_dates(duration):
+    """Calculate start and end dates based on duration"""
+    start_date = datetime.now()
+    
+    # Parse duration and calculate end date
+    if 'week' in duration.lower():
+        weeks = int(re.findall(r'\d+', duration)[0])
+        end_date = start_date + timedelta(weeks=weeks)
+    elif 'month' in duration.lower():
+        months = int(re.findall(r'\d+', duration)[0])
+        end_date = start_date + timedelta(days=months * 30)
+    elif 'hour' in duration.lower():
+        hours = int(re.findall(r'\d+', duration)[0])
+        # Assume 2 hours per day, 5 days per week
+        days = (hours / 2) * (7/5)
+        end_date = start_date + timedelta(days=int(days))
+    else:
+        # Default to 4 weeks if duration format is unclear
+        end_date = start_date + timedelta(weeks=4)
+    
+    return start_date.strftime('%d-%m-%Y'), end_date.strftime('%d-%m-%Y')
+
+def learning_path_id(skill_assessment_id, skill, target_level, course_name):
+    """Stable id, so generating twice for the same assessment overwrites rather than duplicates"""
+    return str(uuid.uuid5(uuid.NAMESPACE_DNS, f'{skill_assessment_id}-{skill}-{target_level}-{course_name}'))
+
+def catalog_learning_paths(assessment):
+    """The learning paths the course catalog gives for one skill assessment"""
+    from course_catalog import get_recommendations
+    skill = assessment.get('Skill', '')
+    current_level = assessment.get('Current', '')
+    target_level = assessment.get('Target', '')
+    skill_assessment_id = assessment.get('SkillAssessmentId')
+    
+    paths = []
+    for rec in get_recommendations(skill.lower(), current_level.lower(), target_level.lower()):
+        start_date, end_date = calculate_dates(rec['duration'])
+        paths.append({
+            'LearningPathId': learning_path_id(skill_assessment_id, skill, target_level, rec['name']) if skill_assessment_id else str(uuid.uuid4()),
+            'Employee': assessment.get('Employee', ''),
+            'Skill': skill,
+            'Level': target_level,
+            'Name': rec['name'],
+            'Source': rec['source'],
+            'Duration': rec['duration'],
+            'Url': rec['url'],
+            'Completed': False,
+            'StateDate': start_date,
+            'EndDate': end_date
+        })
+    return paths
+
+def save_learning_path(path):
+    """Write a generated path, keeping Completed and the dates of one already stored; returns the stored item"""
+    fields = [name for name in path if name != 'LearningPathId']
+    assignments = [f'#f{index} = if_not_exists(#f{index}, :f{index})' if name in PROGRESS_FIELDS else f'#f{index} = :f{index}'
+                   for index, name in enumerate(fields)]
+    return table.update_item(
+        Key={'LearningPathId': path['LearningPathId']},
+        UpdateExpression='SET ' + ', '.join(assignments),
+        ExpressionAttributeNames={f'#f{index}': name for index, name in enumerate(fields)},
+        ExpressionAttributeValues={f':f{index}': path[name] for index, name in enumerate(fields)},
+        ReturnValues='ALL_NEW'
+    )['Attributes']
+
+def generate_learning_paths(assessment):
+    """Create and store the learning paths for one skill assessment; returns them as stored"""
+    # One update per path rather than a batch put: regenerating must not reset progress on paths that exist
+    created_paths = [save_learning_path(path) for path in catalog_learning_paths(assessment)]
+    bump_version(dynamodb, table.name)
+    
+    log.info('learning paths created', count=len(created_paths), skill_assessment_id=assessment.get('SkillAssessmentId'))
+    return created_paths
+
+def remove_learning_paths(assessment):
+    """Delete the paths generated for an assessment's Skill/Current/Target; returns how many ids were removed"""
+    if not assessment.get('SkillAssessmentId'):
+        return 0
+    learning_path_ids = {path['LearningPathId'] for path in catalog_learning_paths(assessment)}
+    with table.batch_writer() as batch:
+        for path_id in learning_path_ids:
+            batch.delete_item(Key={'LearningPathId': path_id})
+    bump_version(dynamodb, table.name)
+    
+    log.info('learning paths removed', count=len(learning_path_ids), skill_assessment_id=assessment['SkillAssessmentId'])
+    return len(learning_path_ids)
+
+def use_dynamodb(resource):
+    """Point the handler at a DynamoDB resource - boto3's, or an in-memory one for offline runs"""
+    global dynamodb, table
+    dynamodb = resource
+    table = resource.Table(os.environ['TABLE_NAME'])
+
+# The catalog is parsed on import and only generation reads it; LAZY_IMPORTS=false loads it during init
+preload('course_catalog')
+
+use_dynamodb(aws_clients.resource('dynamodb'))
+
+def lambda_handler(event, context):
+    # CORS headers for all responses
+    # Clients may keep responses but must revalidate them with If-None-Match
+    cors_headers = make_cors_headers(allow_headers=ALLOW_HEADERS + ',If-None-Match', expose_headers='ETag',
+                                     **{'Cache-Control': 'no-cache'})
+    
+    if event.get('httpMethod') == 'OPTIONS':
+        return api_response(200, cors_headers)
+    
+    log.start_request('learning-path', context)
+    try:
+        # Handle GET request for listing learning paths
+        if event.get('httpMethod') == 'GET':
+            log.set_operation('list')
+            log.log_request(event)
+            try:
+                fields = parse_fields((event.get('queryStringParameters') or {}).get('fields'), LEARNING_PATH_FIELDS)
+            except ValueError as e:
+                return error_response(400, cors_headers, str(e))
+            etag, not_modified = check_etag(event, dynamodb, table.name, ','.join(fields))
+            headers = dict(cors_headers, ETag=etag) if etag else cors_headers
+            if not_modified:
+                log.info('list not modified', etag=etag)
+                return api_response(304, headers)
+            response = table.scan(**projection(fields))
+            items = response['Items']
+            log.info('list', count=len(items), method='GET')
+            if log.debug_enabled():
+                log.debug('list items', items=items)
+            
+            # Transform data to ensure consistent field names for frontend
+            transformed_items = []
+            for item in items:
+                transformed_items.append({name: item.get(name, FIELD_DEFAULTS.get(name, '')) for name in fields})
+            
+            return json_response(event, 200, headers, {'Learning-Paths': transformed_items}, default=decimal_default)
+        
+        # Handle both direct Lambda invocation and API Gateway formats
+        body = parse_body(event)
+        
+        # Check if this is a skill assessment request (has SkillAssessmentId)
+        if 'SkillAssessmentId' in body:
+            log.set_operation('generate')
+            log.log_request(event)
+            log.debug_payload('parsed body', body)
+            
+            # Generate learning paths based on skill assessment
+            created_paths = generate_learning_paths(body)
+            
+            return api_response(200, cors_headers, {'Learning-Paths': created_paths})
+        
+        # Check if operation is in the body
+        operation = body.get('operation')
+        
+        log.set_operation(operation)
+        log.log_request(event)
+        log.debug_payload('parsed body', body)
+        
+        if operation == 'list':
+            try:
+                fields = parse_fields(body.get('fields'), LEARNING_PATH_FIELDS)
+            except ValueError as e:
+                return error_response(400, cors_headers, str(e))
+            etag, not_modified = check_etag(event, dynamodb, table.name, ','.join(fields))
+            headers = dict(cors_headers, ETag=etag) if etag else cors_headers
+            if not_modified:
+                log.info('list not modified', etag=etag)
+                return api_response(304, headers)
+            response = table.scan(**projection(fields))
+            items = response['Items']
+            log.info('list', count=len(items))
+            if log.debug_enabled():
+                log.debug('list items', items=items)
+            
+            # Transform data to ensure consistent field names for frontend
+            transformed_items = []
+            for item in items:
+                transformed_items.append({name: item.get(name, FIELD_DEFAULTS.get(name, '')) for name in fields})
+            
+            return json_response(event, 200, headers, {'Learning-Paths': transformed_items}, default=decimal_default)
+        
+        elif operation == 'read':
+            try:
+                fields = parse_fields(body.get('fields'))
+            except ValueError as e:
+                return error_response(400, cors_headers, str(e))
+            response = table.get_item(Key={'LearningPathId': body['LearningPathId']}, **projection(fields))
+            return api_response(200, cors_headers, response.get('Item', {}))
+        
+        elif operation == 'create':
+            learning_path_id = body.get('LearningPathId', str(uuid.uuid4()))
+            table.put_item(Item={
+                'LearningPathId': learning_path_id,
+                'Employee': body['Employee'],
+                'Skill': body['Skill'],
+                'Level': body['Level'],
+                'Name': body['Name'],
+                'Source': body['Source'],
+                'Duration': body['Duration'],
+                'Url': body['Url'],
+                'Completed': body.get('Completed', False),
+                'StateDate': body.get('StateDate', ''),
+                'EndDate': body.get('EndDate', '')
+            })
+            bump_version(dynamodb, table.name)
+            return api_response(200, cors_headers, {'message': 'Created', 'LearningPathId': learning_path_id})
+        
+        elif operation == 'update':
+            table.put_item(Item={
+                'LearningPathId': body['LearningPathId'],
+                'Employee': body['Employee'],
+                'Skill': body['Skill'],
+                'Level': body['Level'],
+                'Name': body['Name'],
+                'Source': body['Source'],
+                'Duration': body['Duration'],
+                'Url': body['Url'],
+                'Completed': body.get('Completed', False),
+                'StateDate': body.get('StateDate', ''),
+                'EndDate': body.get('EndDate', '')
+            })
+            bump_version(dynamodb, table.name)
+            return api_response(200, cors_headers, {'message': 'Updated'})
+        
+        elif operation == 'delete':
+            table.delete_item(Key={'LearningPathId': body['LearningPathId']})
+            bump_version(dynamodb, table.name)
+            return api_response(200, cors_headers, {'message': 'Deleted'})
+        
+        else:
+            return error_response(400, cors_headers, 'Missing operation')
+    
+    except Exception as e:
+        log.error('Error processing request', error=str(e), error_type=type(e).__name__)
+        log.debug_payload('failed event', event)
+        return error_response(500, cors_headers, str(e))
+
+def assessment_event_handler(event, context):
+    """Generate learning paths for an AssessmentSaved event published by the skills assessment API.
+
+    Exceptions propagate so the event is retried; the stable LearningPathIds make
+    a retry overwrite whatever a failed attempt already wrote. An update's
+    Previous gap names the paths it superseded, which are removed.
+    """
+    log.start_request('learning-path-generator', context)
+    assessment = event.get('detail') or {}
+    log.set_operation(assessment.get('operation') or 'generate')
+    if not assessment.get('SkillAssessmentId'):
+        log.warning('assessment event without SkillAssessmentId', detail_type=event.get('detail-type'))
+        return {'created': 0}
+    created_paths = generate_learning_paths(assessment)
+    removed = 0
+    previous = assessment.get('Previous')
+    if previous and any(previous.get(field) != assessment.get(field) for field in ('Skill', 'Target')):
+        # The update moved the assessment to another Skill or Target; the old paths no longer apply
+        removed = remove_learning_paths(dict(previous, SkillAssessmentId=assessment['SkillAssessmentId']))
+    return {'created': len(created_paths), 'removed': removed}
@@ -0,0 +1,36 @@
+from course_catalog import get_recommendations
+from lambda_http import make_cors_headers, parse_body, api_response, error_response
+
+def lambda_handler(event, context):
+    cors_headers = make_cors_headers('POST,OPTIONS', 'Content-Type')
+    
+    if event.get('httpMethod') == 'OPTIONS':
+        return api_response(200, cors_headers)
+    
+    try:
+        body = parse_body(event)
+        
+        # Handle both old format and new skill assessment format
+        skill = (body.get('Skill') or body.get('skill', '')).lower()
+        current_level = (body.get('Current') or body.get('current_level', '')).lower()
+        target_level = (body.get('Target') or body.get('target_level', '')).lower()
+        employee = body.get('Employee', '')
+        skill_assessment_id = body.get('SkillAssessmentId', '')
+        
+        recommendations = get_recommendations(skill, current_level, target_level)
+        
+        response_data = {
+            'recommendations': recommendations,
+            'employee': employee,
+            'skill': skill.title(),
+            'current_level': current_level.title(),
+            'target_level': target_level.title()
+        }
+        
+        if skill_assessment_id:
+            response_data['skill_assessment_id'] = skill_assessment_id
+        
+        return api_response(200, cors_headers, response_data)
+    
+    except Exception as e:
+        return error_response(500, cors_headers, str(e))